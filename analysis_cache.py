@@ -0,0 +1,147 @@
+"""
+SCOTUS Strategic Engine - Analysis Cache
+Content-addressed LRU cache for analysis results, with optional on-disk tier
+"""
+
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+import serialization
+
+
+def cache_key(engine_version: str, text: str, posture: str, docket: str) -> str:
+    """Content hash of everything that determines an analysis result"""
+    digest = hashlib.sha256()
+    for part in (engine_version, posture, docket, text):
+        encoded = part.encode('utf-8')
+        # Length-prefix each field so ('ab', 'c') and ('a', 'bc') differ
+        digest.update(len(encoded).to_bytes(8, 'big'))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+def make_etag(key: str, *extra: str) -> str:
+    """Entity tag (unquoted) for a cached analysis plus per-response fields like the title"""
+    digest = hashlib.sha256(key.encode('utf-8'))
+    for part in extra:
+        digest.update(b'\0' + part.encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+class AnalysisCache:
+    """
+    Thread-safe LRU keyed by content hash, bounded by entry count and by
+    total serialized size. When `directory` is set, entries are also written
+    to disk (bounded by `max_disk_entries`) and read back on memory misses,
+    so results survive restarts and are shared between worker processes.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024,
+                 directory: str = None, max_disk_entries: int = 4096):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str):
+        """Return the cached value or None, updating recency and counters"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._insert(key, value, len(serialization.encode(value)))
+        return value
+
+    def put(self, key: str, value: dict):
+        """Store a JSON-serializable value"""
+        payload = serialization.dumps(value)
+        with self._lock:
+            self._insert(key, value, len(payload))
+        self._write_disk(key, payload)
+
+    def _insert(self, key: str, value: dict, size: int):
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.json')
+
+    def _read_disk(self, key: str):
+        if not self.directory:
+            return None
+        try:
+            with open(self._disk_path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key: str, payload: str):
+        if not self.directory:
+            return
+        path = self._disk_path(key)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+            self._prune_disk()
+        except OSError:
+            pass
+
+    def _prune_disk(self):
+        """Drop the least recently written files beyond max_disk_entries"""
+        entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith('.json')]
+        if len(entries) <= self.max_disk_entries:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_disk_entries]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current occupancy"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'diskHits': self.disk_hits,
+                'evictions': self.evictions,
+                'hitRatio': self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,178 @@
+"""
+SCOTUS Strategic Engine - Brief Annotations
+Sentence-level spans where a brief triggers a Justice-specific concern
+
+The text is split into sections (blank lines) and sentences once, giving
+sorted start offsets that map any keyword hit to its sentence by bisection.
+Offsets of the trigger keywords present then yield every span:
+
+    concern   an issue the Justice presses hardest (ISSUE_AFFINITY >= 1.0)
+    caution   an issue the Justice tends to probe
+    strength  language from the Justice's own profile keywords
+"""
+
+import re
+from bisect import bisect_right
+
+from justices import ISSUE_AFFINITY, JUSTICES, PRESSURES
+
+SECTION_SEPARATOR = '\n\n'
+
+# Sentence ends at . ! or ? (optionally closed by a quote or bracket) before whitespace
+SENTENCE_END_RE = re.compile(r'[.!?]["\'”)\]]*(?=\s)')
+
+# Abbreviations common in briefs that end with a period but not a sentence
+ABBREVIATIONS = frozenset({
+    'v', 'vs', 'u.s', 'u.s.c', 'f', 'f.2d', 'f.3d', 'f.4th', 's.ct', 'l.ed', 'co', 'corp', 'inc',
+    'ltd', 'no', 'nos', 'art', 'cl', 'id', 'e.g', 'i.e', 'cf', 'al', 'mr', 'ms', 'dr',
+    'st', 'cir', 'app', 'supp', 'ed', 'stat', 'pp', 'p', 'ch', 'sec', 'n', 'j', 'c.j', 'jj'
+})
+
+ASTRAL_RE = re.compile('[\U00010000-\U0010FFFF]')
+
+# Severity order when several triggers hit one sentence for the same Justice
+SEVERITY = {'concern': 2, 'caution': 1, 'strength': 0}
+
+CONCERN_AFFINITY = 1.0
+
+
+def _previous_word(text: str, end: int) -> str:
+    start = end
+    while start > 0 and not text[start - 1].isspace():
+        start -= 1
+    return text[start:end].lstrip('("\'[').lower()
+
+
+def split_sentences(text: str) -> tuple:
+    """Return (section starts, sentence starts) as sorted absolute offsets"""
+    section_starts = []
+    sentence_starts = []
+    offset = 0
+    for section in text.split(SECTION_SEPARATOR):
+        section_starts.append(offset)
+        sentence_starts.append(offset)
+        for match in SENTENCE_END_RE.finditer(section):
+            word = _previous_word(section, match.start())
+            # Skip abbreviations and initials ("A.")
+            if word in ABBREVIATIONS or (len(word) == 1 and word.isalpha()):
+                continue
+            start = match.end()
+            while start < len(section) and section[start].isspace():
+                start += 1
+            if start < len(section):
+                sentence_starts.append(offset + start)
+        offset += len(section) + len(SECTION_SEPARATOR)
+    return section_starts, sentence_starts
+
+
+class BriefAnnotator:
+    """Keyword -> (justice, type, issue) triggers, built once from the scanner tables"""
+
+    def __init__(self, scanner):
+        self.scanner = scanner
+        triggers = {}
+        for issue, keywords in scanner.tables['issue'].items():
+            for justice_id, affinity in ISSUE_AFFINITY.items():
+                weight = affinity.get(issue)
+                if weight:
+                    kind = 'concern' if weight >= CONCERN_AFFINITY else 'caution'
+                    for keyword in keywords:
+                        triggers.setdefault(keyword, []).append((justice_id, kind, issue))
+        for justice_id, keywords in scanner.tables['justice'].items():
+            for keyword in keywords:
+                triggers.setdefault(keyword, []).append((justice_id, 'strength', None))
+        self.triggers = {keyword: tuple(entries) for keyword, entries in triggers.items()}
+
+    def annotate(self, text: str, utf16: bool = False) -> dict:
+        """
+        Sections and Justice spans (absolute offsets into `text`), in document
+        order. With utf16=True offsets count UTF-16 code units, as JavaScript
+        string indexes do.
+        """
+        section_starts, sentence_starts = split_sentences(text)
+        sentence_ends = sentence_starts[1:] + [len(text)]
+        offset_map = _lowercase_offset_map(text)
+        scan = self.scanner.scan(text)
+
+        spans = {}  # (sentence index, justice) -> span
+        for keyword, positions in scan.positions(self.triggers).items():
+            triggers = self.triggers[keyword]
+            for position in positions:
+                if offset_map is not None:
+                    position = offset_map[position]
+                sentence = bisect_right(sentence_starts, position) - 1
+                for justice_id, kind, issue in triggers:
+                    span = spans.get((sentence, justice_id))
+                    if span is None:
+                        span = spans[(sentence, justice_id)] = {
+                            'start': sentence_starts[sentence],
+                            'end': _trim_end(text, sentence_starts[sentence], sentence_ends[sentence]),
+                            'justice': justice_id,
+                            'type': kind,
+                            'section': bisect_right(section_starts, position) - 1,
+                            'keywords': [],
+                            'issues': []
+                        }
+                    elif SEVERITY[kind] > SEVERITY[span['type']]:
+                        span['type'] = kind
+                    if keyword not in span['keywords']:
+                        span['keywords'].append(keyword)
+                    if issue and issue not in span['issues']:
+                        span['issues'].append(issue)
+
+        ordered = sorted(spans.values(), key=lambda span: (span['start'], -SEVERITY[span['type']], span['justice']))
+        for span in ordered:
+            span['note'] = _note(span)
+
+        section_ends = [start - len(SECTION_SEPARATOR) for start in section_starts[1:]] + [len(text)]
+
+        units = _utf16_offset_map(text) if utf16 else None
+        if units is not None:
+            section_starts = [units[start] for start in section_starts]
+            section_ends = [units[end] for end in section_ends]
+            for span in ordered:
+                span['start'] = units[span['start']]
+                span['end'] = units[span['end']]
+
+        return {
+            'sections': [{'start': start, 'end': end} for start, end in zip(section_starts, section_ends)],
+            'sentences': len(sentence_starts),
+            'spans': ordered
+        }
+
+
+def _trim_end(text: str, start: int, end: int) -> int:
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return end
+
+
+def _lowercase_offset_map(text: str):
+    """Map offsets in text.lower() back to text when lowercasing changes length (rare)"""
+    if len(text.lower()) == len(text):
+        return None
+    mapping = []
+    for index, char in enumerate(text):
+        mapping.extend([index] * len(char.lower()))
+    mapping.append(len(text))
+    return mapping
+
+
+def _utf16_offset_map(text: str):
+    """Map code point offsets to UTF-16 code unit offsets, if the text has astral characters"""
+    if text.isascii() or not ASTRAL_RE.search(text):
+        return None
+    mapping = [0]
+    for char in text:
+        mapping.append(mapping[-1] + (2 if ord(char) > 0xFFFF else 1))
+    return mapping
+
+
+def _note(span: dict) -> str:
+    name = JUSTICES[span['justice']]['name']
+    if span['type'] == 'strength':
+        return f"Speaks {name}'s language ({', '.join(span['keywords'])}); lean into it."
+    issues = ', '.join(issue.replace('_', ' ') for issue in span['issues'])
+    verb = 'will press hard on' if span['type'] == 'concern' else 'is likely to probe'
+    pressure = PRESSURES.get(span['justice'])
+    return f"{name} {verb} {issues}. {pressure}." if pressure else f"{name} {verb} {issues}."
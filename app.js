@@ -16,9 +16,15 @@ const AppState = {
     posture: null,
     selectedJustice: null,
     chatHistory: [],
-    uploadedFiles: []
+    uploadedFiles: [],
+    documentId: null,
+    sessionId: null
 };
 
+// Server analyses by request content, revalidated with If-None-Match
+const ANALYSIS_CACHE = new Map();
+const ANALYSIS_CACHE_LIMIT = 20;
+
 // Justice profiles for simulation
 const JUSTICES = {
     roberts: {
@@ -390,6 +396,7 @@ function loadSampleCase(caseId) {
     if (!sampleCase) return;
 
     AppState.currentCaseId = caseId;
+    AppState.documentId = newDocumentId();
 
     // Populate form fields
     elements.caseTitle.value = sampleCase.title;
@@ -414,7 +421,8 @@ function loadSampleCase(caseId) {
                 title: sampleCase.title,
                 posture: sampleCase.posture,
                 tier: inputTier,
-                docket: sampleCase.docket
+                docket: sampleCase.docket,
+                documentId: AppState.documentId
             });
 
             AppState.currentAnalysis = analysis;
@@ -588,6 +596,99 @@ function renderBrief(text, caseId = null) {
     elements.briefTitle.textContent = elements.caseTitle.value || 'Case Brief';
 }
 
+// Server annotations: one scan returns every Justice span, so the client only places them
+const SEGMENT_CLASS = { concern: 'critical', caution: 'caution', strength: 'positive' };
+const SEVERITY = { concern: 2, caution: 1, strength: 0 };
+
+function escapeHtml(text) {
+    return text.replace(/[&<>"']/g, ch => ({ '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' }[ch]));
+}
+
+async function annotateBrief(text) {
+    if (!text) return;
+
+    try {
+        const response = await fetch(`${API_BASE}/annotate`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ text, units: 'utf16' })
+        });
+        // Skip stale results if the brief changed while the request was in flight
+        if (response.ok && text === (elements.caseText.value || text)) {
+            renderAnnotatedBrief(text, await response.json());
+        }
+    } catch (e) {
+        console.log('Backend annotations not available');
+    }
+}
+
+function renderAnnotatedBrief(text, annotations) {
+    BRIEF_STATE.segments = [];
+    const container = elements.briefContent;
+    container.innerHTML = '';
+
+    // Group spans by sentence; spans arrive sorted by start offset
+    const bySection = new Map();
+    annotations.spans.forEach(span => {
+        const spans = bySection.get(span.section) || [];
+        const last = spans[spans.length - 1];
+        if (last && last.start === span.start) {
+            last.annotations.push(span);
+        } else {
+            spans.push({ start: span.start, end: span.end, annotations: [span] });
+        }
+        bySection.set(span.section, spans);
+    });
+
+    annotations.sections.forEach((section, sIdx) => {
+        const sectionText = text.slice(section.start, section.end);
+        const sectionEl = document.createElement('div');
+
+        if (sectionText.toUpperCase() === sectionText && sectionText.length < 100) {
+            sectionEl.className = 'section-title';
+            sectionEl.textContent = sectionText;
+            container.appendChild(sectionEl);
+            return;
+        }
+
+        let html = '';
+        let cursor = section.start;
+        (bySection.get(sIdx) || []).forEach((group, gIdx) => {
+            const id = `ann-${sIdx}-${gIdx}`;
+            const worst = group.annotations.reduce((a, b) => SEVERITY[b.type] > SEVERITY[a.type] ? b : a);
+            const original = text.slice(group.start, group.end);
+            BRIEF_STATE.segments.push({ id, original, annotations: group.annotations });
+
+            html += escapeHtml(text.slice(cursor, group.start));
+            html += `<span class="brief-segment has-feedback ${SEGMENT_CLASS[worst.type]}" data-id="${id}">${escapeHtml(original)}</span>`;
+            cursor = group.end;
+        });
+        html += escapeHtml(text.slice(cursor, section.end));
+
+        sectionEl.innerHTML = html;
+        container.appendChild(sectionEl);
+    });
+
+    document.querySelectorAll('.brief-segment').forEach(seg => {
+        seg.addEventListener('click', (e) => onSegmentClick(e));
+    });
+}
+
+function showSegmentAnnotations(segment) {
+    elements.annotationList.innerHTML = segment.annotations.map(a => `
+        <div class="annotation-card ${a.type}">
+            <div class="annotation-justice">
+                <span class="annotation-justice-name">${JUSTICES[a.justice].name}</span>
+                <span class="annotation-type ${a.type}">${a.type}</span>
+            </div>
+            <p class="annotation-text">${escapeHtml(a.note)}</p>
+        </div>
+    `).join('');
+
+    const hint = document.querySelector('.annotation-hint');
+    if (hint) hint.style.display = 'none';
+}
+
 function onSegmentClick(e) {
     if (BRIEF_STATE.isEditing) return;
 
@@ -601,7 +702,11 @@ function onSegmentClick(e) {
     e.target.classList.add('highlighted');
 
     BRIEF_STATE.selectedSegmentId = segId;
-    showSegmentFeedback(segment);
+    if (segment.annotations) {
+        showSegmentAnnotations(segment);
+    } else {
+        showSegmentFeedback(segment);
+    }
 }
 
 function showSegmentFeedback(segment) {
@@ -642,8 +747,9 @@ window.applyRewrite = function (segmentId) {
     segEl.classList.remove('has-feedback', 'critical', 'caution', 'positive');
     segEl.classList.add('positive');
 
-    // Update underlying text in AppState if needed
-    // (In a real app, we'd update elements.caseText.value)
+    // Update the underlying text and re-analyze just the edited paragraph
+    elements.caseText.value = elements.caseText.value.replace(segment.original, segment.feedback.rewrite);
+    reanalyzeBrief();
 
     // Show success in chat
     addChatMessage('assistant', `Applied strategic rewrite for: "${segment.original.substring(0, 30)}..."\n\nNew phrasing focuses on: **${segment.feedback.rewrite.substring(0, 50)}...**`);
@@ -678,11 +784,38 @@ function toggleEditMode() {
             </svg>
             Edit
         `;
-        // Sync back to hidden input if needed
-        elements.caseText.value = content.innerText;
+        // Sync back to hidden input, keeping one blank line between paragraphs
+        const edited = Array.from(content.children).map(el => el.innerText.trim()).join('\n\n');
+        if (edited !== elements.caseText.value) {
+            elements.caseText.value = edited;
+            reanalyzeBrief();
+        }
     }
 }
 
+function newDocumentId() {
+    return window.crypto && crypto.randomUUID
+        ? crypto.randomUUID()
+        : Date.now().toString(36) + Math.random().toString(36).slice(2);
+}
+
+// Re-run analysis after an edit; the server rescans only changed paragraphs
+async function reanalyzeBrief() {
+    if (!AppState.currentAnalysis) return;
+
+    const analysis = await generateAnalysis({
+        text: elements.caseText.value,
+        title: elements.caseTitle.value || AppState.currentAnalysis.title,
+        posture: AppState.posture,
+        tier: AppState.inputTier,
+        docket: elements.docketNumber.value,
+        documentId: AppState.documentId
+    });
+
+    AppState.currentAnalysis = analysis;
+    renderAnalysisResults(analysis);
+}
+
 function toggleBriefCollapse() {
     BRIEF_STATE.isCollapsed = !BRIEF_STATE.isCollapsed;
     elements.briefContentWrapper.classList.toggle('collapsed');
@@ -796,6 +929,7 @@ async function startAnalysis() {
     showLoading('Classifying input tier...');
 
     AppState.currentCaseId = null; // New custom analysis
+    AppState.documentId = newDocumentId();
 
     try {
         // Determine input tier
@@ -818,7 +952,8 @@ async function startAnalysis() {
             title: caseTitle,
             posture: detectedPosture,
             tier: inputTier,
-            docket: docketNumber
+            docket: docketNumber,
+            documentId: AppState.documentId
         });
 
         AppState.currentAnalysis = analysis;
@@ -874,16 +1009,37 @@ function detectPosture(text) {
 }
 
 async function generateAnalysis(input) {
-    // Try to call backend API
+    // Try to call backend API, revalidating any analysis we already hold
+    const cacheKey = JSON.stringify([input.text, input.title, input.posture, input.docket]);
+    const cached = ANALYSIS_CACHE.get(cacheKey);
+
     try {
+        const headers = { 'Content-Type': 'application/json' };
+        if (cached) {
+            headers['If-None-Match'] = cached.etag;
+        }
+
+        // The server keeps the analysis in our session so chat can send just the message
         const response = await fetch(`${API_BASE}/analyze`, {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify(input)
+            headers,
+            body: JSON.stringify({ ...input, sessionId: AppState.sessionId })
         });
 
+        if (response.status === 304 && cached) {
+            return cached.analysis;
+        }
+
         if (response.ok) {
-            return await response.json();
+            const analysis = await response.json();
+            if (analysis.sessionId) {
+                AppState.sessionId = analysis.sessionId;
+            }
+            const etag = response.headers.get('ETag');
+            if (etag) {
+                rememberAnalysis(cacheKey, etag, analysis);
+            }
+            return analysis;
         }
     } catch (e) {
         console.log('Backend not available, using client-side analysis');
@@ -893,6 +1049,16 @@ async function generateAnalysis(input) {
     return generateClientSideAnalysis(input);
 }
 
+function rememberAnalysis(cacheKey, etag, analysis) {
+    ANALYSIS_CACHE.delete(cacheKey);
+    ANALYSIS_CACHE.set(cacheKey, { etag, analysis });
+
+    // Map iterates in insertion order, so the first key is least recently used
+    while (ANALYSIS_CACHE.size > ANALYSIS_CACHE_LIMIT) {
+        ANALYSIS_CACHE.delete(ANALYSIS_CACHE.keys().next().value);
+    }
+}
+
 function generateClientSideAnalysis(input) {
     const { text, title, posture, tier } = input;
 
@@ -1091,7 +1257,11 @@ function renderAnalysisResults(analysis) {
     elements.chatPanel.classList.remove('hidden');
 
     // Render interactive brief
-    renderBrief(elements.caseText.value || analysis.text, AppState.currentCaseId);
+    const briefText = elements.caseText.value || analysis.text;
+    renderBrief(briefText, AppState.currentCaseId);
+    if (!CASE_FEEDBACK[AppState.currentCaseId]) {
+        annotateBrief(briefText);
+    }
 
     // Update dashboard metrics
     elements.inputTier.textContent = analysis.tier;
@@ -1279,12 +1449,41 @@ function generateAdditionalQuestion(justiceId) {
     return genericQuestions[justiceId] || 'How do you respond to the strongest version of your opponent\'s argument?';
 }
 
-function simulateFullBench() {
+async function simulateFullBench() {
     if (!AppState.currentAnalysis) return;
 
     // Add all justice questions to chat
-    addChatMessage('assistant', '**Full Bench Simulation**\n\nSimulating pressure points from all nine Justices:');
+    addChatMessage('assistant', '**Full Bench Simulation**\n\nSimulating pressure points from all nine Justices, highest pressure first:');
 
+    // Try backend first: one request scores and ranks the whole bench
+    try {
+        const keywordHits = AppState.currentAnalysis.keywordHits;
+        const response = await fetch(`${API_BASE}/simulate/bench`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                context: {
+                    issues: AppState.currentAnalysis.issues || {},
+                    keywordHits: keywordHits || {},
+                    posture: AppState.posture
+                },
+                // Analyses computed client-side carry no keyword hits; let the server scan
+                text: keywordHits ? '' : elements.caseText.value
+            })
+        });
+
+        if (response.ok) {
+            const data = await response.json();
+            data.justices.forEach(q => {
+                addChatMessage('assistant', `**${q.rank}. ${q.name}** (${q.focus}) · pressure ${q.pressureScore}:\n\n"${q.question}"`);
+            });
+            return;
+        }
+    } catch (e) {
+        console.log('Backend bench simulation not available');
+    }
+
+    // Client-side fallback
     Object.keys(JUSTICES).forEach((justiceId, index) => {
         setTimeout(() => {
             const question = generateAdditionalQuestion(justiceId);
@@ -1308,22 +1507,29 @@ async function sendChatMessage() {
     // Add to history
     AppState.chatHistory.push({ role: 'user', content: message });
 
-    // Try backend first
+    // Try backend first; with a session only the new message is sent
     try {
-        const response = await fetch(`${API_BASE}/chat`, {
+        const postChat = body => fetch(`${API_BASE}/chat?stream=sse`, {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-                message,
-                history: AppState.chatHistory,
-                context: AppState.currentAnalysis
-            })
+            body: JSON.stringify(body)
         });
+        const fullPayload = {
+            sessionId: AppState.sessionId,
+            message,
+            history: AppState.chatHistory,
+            context: AppState.currentAnalysis
+        };
+
+        let response = await postChat(AppState.sessionId ? { sessionId: AppState.sessionId, message } : fullPayload);
+        if (response.status === 404) {
+            // Session expired server-side: resend everything once to reseed it
+            response = await postChat(fullPayload);
+        }
 
         if (response.ok) {
-            const data = await response.json();
-            addChatMessage('assistant', data.response);
-            AppState.chatHistory.push({ role: 'assistant', content: data.response });
+            const reply = await readChatStream(response);
+            AppState.chatHistory.push({ role: 'assistant', content: reply });
             return;
         }
     } catch (e) {
@@ -1360,20 +1566,70 @@ function generateChatResponse(message) {
     return 'That\'s a strategic consideration worth examining. Based on the current analysis:\n\n• **Input Tier ' + (AppState.inputTier || 'B') + '** limits definitive conclusions on some procedural aspects\n• The **' + (AppState.posture || 'cert') + ' posture** emphasizes certain institutional concerns\n\nTo provide more specific guidance, could you clarify:\n1. Which party\'s perspective you\'re analyzing from?\n2. What specific doctrinal or strategic concern you want to probe?';
 }
 
-function addChatMessage(role, content) {
-    const messageDiv = document.createElement('div');
-    messageDiv.className = `chat-message ${role}`;
+// Render a Server-Sent Events chat reply section by section; returns the full reply
+async function readChatStream(response) {
+    if (!response.body || !response.headers.get('Content-Type')?.includes('text/event-stream')) {
+        const data = await response.json();
+        addChatMessage('assistant', data.response);
+        return data.response;
+    }
+
+    const sections = [];
+    let messageDiv = null;
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const block = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            const event = (block.match(/^event: (.*)$/m) || [])[1];
+            const data = (block.match(/^data: (.*)$/m) || [])[1];
+            if (!data) continue;
+
+            const payload = JSON.parse(data);
+            if (event === 'section') {
+                sections.push(payload.text);
+                if (messageDiv) {
+                    updateChatMessage(messageDiv, sections.join('\n\n'));
+                } else {
+                    messageDiv = addChatMessage('assistant', payload.text);
+                }
+            } else if (event === 'error') {
+                throw new Error(payload.error);
+            }
+        }
+    }
 
+    return sections.join('\n\n');
+}
+
+function formatChatMessage(content) {
     // Simple markdown-like formatting
-    let formatted = content
+    return content
         .replace(/\*\*(.*?)\*\*/g, '<strong>$1</strong>')
         .replace(/\n/g, '<br>');
+}
 
-    messageDiv.innerHTML = formatted;
-    elements.chatMessages.appendChild(messageDiv);
+function updateChatMessage(messageDiv, content) {
+    messageDiv.innerHTML = formatChatMessage(content);
     elements.chatMessages.scrollTop = elements.chatMessages.scrollHeight;
 }
 
+function addChatMessage(role, content) {
+    const messageDiv = document.createElement('div');
+    messageDiv.className = `chat-message ${role}`;
+    elements.chatMessages.appendChild(messageDiv);
+    updateChatMessage(messageDiv, content);
+    return messageDiv;
+}
+
 function toggleChat() {
     const isHidden = elements.chatPanel.classList.toggle('hidden');
     // Show floating button when chat is hidden, hide it when chat is visible
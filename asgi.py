@@ -0,0 +1,205 @@
+"""
+SCOTUS Strategic Engine - ASGI Entry Point
+Serves the Flask app under an ASGI server without serializing requests
+
+    uvicorn asgi:application
+
+Each request runs the WSGI app in a thread pool. /api/chat and /api/simulate
+(except Monte Carlo outcomes) get their own pool so they never queue behind
+uploads and analyses, which in turn hand their CPU-bound work to process
+pools (see backend.get_analysis offload and pdf_extract). Job status reads
+and event streams, which mostly wait, get a third pool so open streams
+never hold threads the other routes need. Response chunks are forwarded as
+they are produced, so NDJSON and SSE endpoints stream. Request bodies
+stream the other way: the app pulls chunks from receive() as it reads
+wsgi.input, so an upload is buffered once, by backend.UploadRequest.
+"""
+
+import os
+import sys
+import io
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.exceptions import ClientDisconnected, RequestEntityTooLarge
+
+from backend import app, JOB_MAX_WATCHERS, MAX_UPLOAD_BYTES
+
+# ========================================
+# Configuration
+# ========================================
+
+HEAVY_THREADS = int(os.environ.get('ASGI_HEAVY_THREADS', '16'))
+FAST_THREADS = int(os.environ.get('ASGI_FAST_THREADS', '8'))
+# Job polls and streams; one thread per open stream, beyond which backend answers 429
+WATCH_THREADS = int(os.environ.get('ASGI_WATCH_THREADS', str(JOB_MAX_WATCHERS + 4)))
+FAST_PATHS = ('/api/chat', '/api/simulate')
+WATCH_PATHS = ('/api/jobs/',)
+# Fast-path prefixes that still do bulk CPU work
+HEAVY_PATHS = ('/api/simulate/outcomes',)
+
+
+class RequestBody(io.RawIOBase):
+    """
+    wsgi.input backed by ASGI receive(): reads on the worker thread wait for
+    the next body chunk from the event loop, so the body is never held here
+    beyond the chunk being read. The size cap is enforced as chunks arrive.
+    """
+
+    def __init__(self, receive, loop, max_body: int, first: dict):
+        self._receive = receive
+        self._loop = loop
+        self._max_body = max_body
+        self._chunk = memoryview(first.get('body', b''))
+        self._more = first.get('more_body', False)
+        self._received = len(self._chunk)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._chunk and self._more:
+            message = asyncio.run_coroutine_threadsafe(self._receive(), self._loop).result()
+            if message['type'] == 'http.disconnect':
+                raise ClientDisconnected()
+            self._chunk = memoryview(message.get('body', b''))
+            self._more = message.get('more_body', False)
+            self._received += len(self._chunk)
+            if self._received > self._max_body:
+                raise RequestEntityTooLarge()
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+        return size
+
+
+class ASGIAdapter:
+    """Minimal WSGI -> ASGI bridge with per-route-class executors"""
+
+    def __init__(self, wsgi_app, max_body: int = MAX_UPLOAD_BYTES):
+        self.wsgi_app = wsgi_app
+        self.max_body = max_body
+        self.heavy = ThreadPoolExecutor(max_workers=HEAVY_THREADS, thread_name_prefix='asgi-heavy')
+        self.fast = ThreadPoolExecutor(max_workers=FAST_THREADS, thread_name_prefix='asgi-fast')
+        self.watch = ThreadPoolExecutor(max_workers=WATCH_THREADS, thread_name_prefix='asgi-watch')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        headers = dict(scope.get('headers', []))
+        declared = headers.get(b'content-length')
+        if declared and declared.isdigit() and int(declared) > self.max_body:
+            await self._reject(send)
+            return
+
+        # Most requests fit one message; reject or drop them before taking a thread
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return
+        if len(message.get('body', b'')) > self.max_body:
+            await self._reject(send)
+            return
+        loop = asyncio.get_running_loop()
+        body = RequestBody(receive, loop, self.max_body, message)
+
+        path = scope['path']
+        fast = path.startswith(FAST_PATHS) and not path.startswith(HEAVY_PATHS)
+        if scope['method'] == 'GET' and path.startswith(WATCH_PATHS):
+            executor = self.watch
+        else:
+            executor = self.fast if fast else self.heavy
+        await loop.run_in_executor(executor, self._run_wsgi, scope, body, loop, send)
+
+    def _run_wsgi(self, scope, body, loop, send):
+        """Run the WSGI app in a worker thread, forwarding output to the event loop"""
+        state = {}
+
+        def start_response(status, response_headers, exc_info=None):
+            state['start'] = {
+                'type': 'http.response.start',
+                'status': int(status.split(' ', 1)[0]),
+                'headers': [(name.lower().encode('latin1'), value.encode('latin1'))
+                            for name, value in response_headers]
+            }
+
+        def forward(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        result = self.wsgi_app(self._environ(scope, body), start_response)
+        try:
+            started = False
+            for chunk in result:
+                if not chunk:
+                    continue
+                if not started:
+                    forward(state['start'])
+                    started = True
+                forward({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            if not started:
+                forward(state['start'])
+            forward({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+
+    def _environ(self, scope, body) -> dict:
+        """Translate an ASGI HTTP scope into a WSGI environ"""
+        server = scope.get('server') or ('localhost', 80)
+        client = scope.get('client') or ('', 0)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', '').encode('utf8').decode('latin1'),
+            'PATH_INFO': scope['path'].encode('utf8').decode('latin1'),
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin1'),
+            'SERVER_NAME': server[0],
+            'SERVER_PORT': str(server[1]),
+            'SERVER_PROTOCOL': 'HTTP/' + scope.get('http_version', '1.1'),
+            'REMOTE_ADDR': client[0],
+            'REMOTE_PORT': str(client[1]),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': body,
+            # RequestBody ends at the last chunk, so Werkzeug may read bodies without a Content-Length
+            'wsgi.input_terminated': True,
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False
+        }
+        for name, value in scope.get('headers', []):
+            name = name.decode('latin1')
+            value = value.decode('latin1')
+            if name == 'content-type':
+                key = 'CONTENT_TYPE'
+            elif name == 'content-length':
+                key = 'CONTENT_LENGTH'
+            else:
+                key = 'HTTP_' + name.upper().replace('-', '_')
+            environ[key] = f'{environ[key]},{value}' if key in environ else value
+        return environ
+
+    async def _reject(self, send):
+        await send({'type': 'http.response.start', 'status': 413,
+                    'headers': [(b'content-type', b'application/json')]})
+        limit_mb = self.max_body // (1024 * 1024)
+        await send({'type': 'http.response.body',
+                    'body': f'{{"error": "Upload exceeds {limit_mb} MB limit"}}'.encode()})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.heavy.shutdown(wait=False)
+                self.fast.shutdown(wait=False)
+                self.watch.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+application = ASGIAdapter(app)
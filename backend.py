@@ -3,168 +3,263 @@ SCOTUS Strategic Engine - Backend API Server
 Flask-based API for case analysis and justice simulation
 """
 
+import io
 import os
-import json
 import re
+import time
+import shutil
+import tempfile
+import threading
+import multiprocessing
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Request, Response, request, jsonify, send_from_directory
 from flask_cors import CORS
 
+import compression
+import metrics
+import ocr
+import outcomes
+import pdf_extract
+import serialization
+from analysis_cache import AnalysisCache, cache_key, make_etag
+from annotations import BriefAnnotator
+from incremental import DocumentSessions
+from intents import IntentRouter
+from jobs import PUBLISH_INTERVAL, JobQueue, QueueFull
+from schema import Analysis, AnalysisResponse
+from engine import (
+    ENGINE_VERSION, ISSUE_KEYWORDS, JUSTICE_REGISTRY, PRECEDENT_INDEX, PRECEDENTS, SCANNER, VOTE_MODEL,
+    extract_issues, find_precedents, generate_single_question, run_analysis
+)
+from justices import ISSUE_AFFINITY, JUSTICES
+from precedent_index import tokenize
+from sessions import REDIS_SUPPORT, MemorySessionBackend, RedisSessionBackend, SessionStore, SessionTooLarge
+
 # Optional PDF support
-try:
-    import PyPDF2
-    PDF_SUPPORT = True
-except ImportError:
-    PDF_SUPPORT = False
+PDF_SUPPORT = pdf_extract.PDF_SUPPORT
+if not PDF_SUPPORT:
     print("PyPDF2 not installed. PDF upload will be disabled.")
 
-app = Flask(__name__, static_folder='.', static_url_path='')
-CORS(app)
-
 # ========================================
 # Configuration
 # ========================================
 
+# Uploads are parsed in memory; only large ones spill here, under unique names
 UPLOAD_FOLDER = 'uploads'
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-# Justice profiles for simulation
-JUSTICES = {
-    'roberts': {
-        'name': 'Chief Justice Roberts',
-        'focus': 'Institutionalism & Narrow Rulings',
-        'style': 'Seeks incremental, consensus-building decisions',
-        'keywords': ['institutional', 'narrow', 'minimalist', 'precedent']
-    },
-    'thomas': {
-        'name': 'Justice Thomas',
-        'focus': 'Originalism & Constitutional Text',
-        'style': 'Questions structural precedents; emphasizes original meaning',
-        'keywords': ['original', 'text', 'constitution', 'stare decisis']
-    },
-    'alito': {
-        'name': 'Justice Alito',
-        'focus': 'Textual Analysis & Practical Consequences',
-        'style': 'Probes real-world impacts and statutory interpretation',
-        'keywords': ['practical', 'consequences', 'statutory', 'text']
-    },
-    'sotomayor': {
-        'name': 'Justice Sotomayor',
-        'focus': 'Civil Rights & Practical Impact',
-        'style': 'Focuses on effects on marginalized communities',
-        'keywords': ['rights', 'impact', 'fairness', 'equality']
-    },
-    'kagan': {
-        'name': 'Justice Kagan',
-        'focus': 'Pragmatic Interpretation & Workability',
-        'style': 'Tests practical implementation of legal rules',
-        'keywords': ['workable', 'practical', 'implementation', 'pragmatic']
+MAX_UPLOAD_BYTES = int(os.environ.get('MAX_UPLOAD_BYTES', str(100 * 1024 * 1024)))
+UPLOAD_SPOOL_BYTES = int(os.environ.get('UPLOAD_SPOOL_BYTES', str(8 * 1024 * 1024)))
+
+
+class SpooledUpload(tempfile.SpooledTemporaryFile):
+    """Spooled file that rolls over to a named temp file, so the PDF pools can open it by path"""
+    
+    def rollover(self):
+        if self._rolled:
+            return
+        memory = self._file
+        self._file = tempfile.NamedTemporaryFile(**self._TemporaryFileArgs)
+        del self._TemporaryFileArgs
+        self._file.write(memory.getbuffer())
+        self._file.seek(memory.tell())
+        self._rolled = True
+
+
+class UploadRequest(Request):
+    """Request that buffers file parts in memory, spilling to disk only when large"""
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return SpooledUpload(max_size=UPLOAD_SPOOL_BYTES, dir=UPLOAD_FOLDER, suffix='.pdf')
+
+
+app = Flask(__name__, static_folder='.', static_url_path='')
+app.request_class = UploadRequest
+# Enforced by Werkzeug while the body is read, not after buffering it all
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES
+# jsonify and request.json go through orjson/msgspec when installed
+app.json = serialization.FastJSONProvider(app)
+CORS(app, expose_headers=['ETag', 'X-Session-Id'])
+
+# Debug/CI flag: check every analysis response against schema.py before
+# sending it (needs msgspec); a mismatch fails the request instead of
+# reaching clients
+SCHEMA_STRICT = os.environ.get('SCHEMA_STRICT', '').lower() in ('1', 'true')
+if SCHEMA_STRICT and not serialization.MSGSPEC_SUPPORT:
+    print("SCHEMA_STRICT needs msgspec. Responses will not be validated.")
+
+# Analysis process pool (0 runs everything in the request thread); each
+# worker compiles the rule tables once at import
+ANALYSIS_WORKERS = int(os.environ.get('ANALYSIS_WORKERS', str(os.cpu_count() or 1)))
+MAX_BATCH_ITEMS = int(os.environ.get('MAX_BATCH_ITEMS', '1000'))
+
+# Briefs at least this long are analyzed in the pool so request threads
+# (and the GIL) stay free for chat and simulate calls
+ANALYSIS_OFFLOAD_CHARS = int(os.environ.get('ANALYSIS_OFFLOAD_CHARS', '200000'))
+
+# Analysis results keyed by content hash (set ANALYSIS_CACHE_DIR to persist to disk)
+ANALYSIS_CACHE = AnalysisCache(
+    max_entries=int(os.environ.get('ANALYSIS_CACHE_ENTRIES', '256')),
+    max_bytes=int(os.environ.get('ANALYSIS_CACHE_BYTES', str(64 * 1024 * 1024))),
+    directory=os.environ.get('ANALYSIS_CACHE_DIR') or None
+)
+
+def chat_case_names(case: str) -> list:
+    """Ways a chat message names a case: 'Shaw v. Reno', 'Shaw', 'Reno' (not 'United States')"""
+    name = case.split(',')[0]
+    parties = [re.sub(r' (?:LLC|Co\.|Inc\.)$', '', party) for party in name.split(' v. ')]
+    return [name, *(party for party in parties if party != 'United States')]
+
+
+# Chat intents in priority order (see intents.py): the four framework replies
+# in their original order, then questions about a specific Justice or
+# precedent, then issues
+CHAT_INTENTS = [
+    {
+        'intent': 'hypothetical',
+        'handler': 'text',
+        'phrases': ['what if', 'hypothetical', 'hypotheticals', 'hypothetically'],
+        'terms': ['alternative scenario', 'changed facts'],
+        'response': '''**Hypothetical Analysis Framework**
+
+To evaluate alternative scenarios, I assess:
+
+1. **Vehicle Impact** — How do changed facts affect jurisdictional posture?
+2. **Standard Shift** — Does the legal test apply differently?
+3. **Justice Alignment** — Which Justices become more/less sympathetic?
+
+Specify which aspect you'd like to modify for targeted analysis.'''
     },
-    'gorsuch': {
-        'name': 'Justice Gorsuch',
-        'focus': 'Textualism & Separation of Powers',
-        'style': 'Strict adherence to statutory text and constitutional structure',
-        'keywords': ['text', 'separation', 'powers', 'structure']
+    {
+        'intent': 'rewrite',
+        'handler': 'text',
+        'phrases': ['rewrite', 'rewrites', 'rewriting', 'question presented', 'questions presented'],
+        'terms': ['draft', 'reframe', 'framing', 'wording'],
+        'response': '''**Questions Presented: Strategic Drafting**
+
+Key principles:
+
+1. **Front-load winning facts** — Your best facts should appear in the question itself
+2. **Signal favorable review** — Frame to invoke your preferred precedent
+3. **Avoid over-breadth** — Narrow questions have higher grant rates
+4. **Create asymmetry** — Make "yes" easier than opponent's "no"
+
+Want me to draft alternative framings based on current case posture?'''
     },
-    'kavanaugh': {
-        'name': 'Justice Kavanaugh',
-        'focus': 'Precedent & Moderate Application',
-        'style': 'Weighs stare decisis carefully; seeks middle-ground',
-        'keywords': ['precedent', 'stare decisis', 'moderate', 'reliance']
+    {
+        'intent': 'circuit_split',
+        'handler': 'text',
+        'phrases': ['circuit split', 'circuit splits', 'conflict', 'conflicts', 'conflicting'],
+        'terms': ['circuits', 'split', 'percolation', 'disagreement'],
+        'response': '''**Circuit Split Analysis**
+
+The Court evaluates split quality on:
+
+1. **Directness** — Same legal question, opposite holdings
+2. **Maturity** — Sufficient percolation across circuits
+3. **Importance** — Substantial federal interests affected
+4. **Vehicle** — Can this case cleanly resolve the split?
+
+Shallow or manufactured splits dramatically increase DIG risk.'''
     },
-    'barrett': {
-        'name': 'Justice Barrett',
-        'focus': 'Originalism & Doctrinal Clarity',
-        'style': 'Precise doctrinal questions; historical analysis',
-        'keywords': ['doctrine', 'original', 'historical', 'clarity']
+    {
+        'intent': 'jurisdiction',
+        'handler': 'text',
+        'phrases': ['standing', 'jurisdiction', 'jurisdictional'],
+        'terms': ['article iii', 'mootness', 'finality', 'exhaustion'],
+        'response': '''**Jurisdictional Checklist**
+
+Standing/jurisdiction defects are **dispositive**:
+
+• **Article III Standing**: injury-in-fact, causation, redressability  
+• **Statutory Exhaustion**: all administrative steps completed?  
+• **Finality**: lower court judgment truly final?  
+• **Mootness**: can Court grant effective relief?
+
+Any weakness here must be addressed before cert, not at merits.'''
     },
-    'jackson': {
-        'name': 'Justice Jackson',
-        'focus': 'Historical Context & Equity',
-        'style': 'Emphasizes historical background and fairness',
-        'keywords': ['history', 'context', 'equity', 'purpose']
-    }
-}
+    *({
+        'intent': f'justice:{justice_id}',
+        'handler': 'justice',
+        'justice': justice_id,
+        'phrases': [justice['name'].split()[-1]],
+        'terms': [justice['focus'], *justice['keywords']]
+    } for justice_id, justice in JUSTICES.items()),
+    *({
+        'intent': f'precedent:{prec["case"]}',
+        'handler': 'precedent',
+        'precedent': prec,
+        'phrases': chat_case_names(prec['case']),
+        'terms': [prec['holding']]
+    } for precs in PRECEDENTS.values() for prec in precs),
+    *({
+        'intent': f'issue:{issue}',
+        'handler': 'issue',
+        'issue': issue,
+        'phrases': keywords,
+        'terms': [issue.replace('_', ' '), *keywords]
+    } for issue, keywords in ISSUE_KEYWORDS.items())
+]
 
-# Precedent database (subset for demonstration)
-PRECEDENTS = {
-    'voting_rights': [
-        {
-            'case': 'Thornburg v. Gingles, 478 U.S. 30 (1986)',
-            'url': 'https://supreme.justia.com/cases/federal/us/478/30/',
-            'holding': 'Established Section 2 VRA preconditions for vote dilution claims',
-            'keywords': ['vra', 'voting rights', 'section 2', 'dilution']
-        },
-        {
-            'case': 'Shaw v. Reno, 509 U.S. 630 (1993)',
-            'url': 'https://supreme.justia.com/cases/federal/us/509/630/',
-            'holding': 'Racial gerrymandering violates Equal Protection',
-            'keywords': ['gerrymandering', 'equal protection', 'race', 'redistricting']
-        },
-        {
-            'case': 'Allen v. Milligan, 599 U.S. 1 (2023)',
-            'url': 'https://supreme.justia.com/cases/federal/us/599/1/',
-            'holding': 'Reaffirmed Gingles framework for Section 2 claims',
-            'keywords': ['vra', 'gingles', 'section 2', 'alabama']
-        }
-    ],
-    'equal_protection': [
-        {
-            'case': 'Miller v. Johnson, 515 U.S. 900 (1995)',
-            'url': 'https://supreme.justia.com/cases/federal/us/515/900/',
-            'holding': 'Race cannot predominate in redistricting without compelling justification',
-            'keywords': ['race', 'predominate', 'strict scrutiny', 'redistricting']
-        },
-        {
-            'case': 'Cooper v. Harris, 581 U.S. 285 (2017)',
-            'url': 'https://supreme.justia.com/cases/federal/us/581/285/',
-            'holding': 'Good-faith VRA compliance cannot save unnecessary racial sorting',
-            'keywords': ['vra', 'racial sorting', 'narrow tailoring']
-        }
-    ],
-    'first_amendment': [
-        {
-            'case': 'Reed v. Town of Gilbert, 576 U.S. 155 (2015)',
-            'url': 'https://supreme.justia.com/cases/federal/us/576/155/',
-            'holding': 'Content-based speech restrictions subject to strict scrutiny',
-            'keywords': ['content', 'speech', 'strict scrutiny', 'signs']
-        },
-        {
-            'case': 'New York Times Co. v. Sullivan, 376 U.S. 254 (1964)',
-            'url': 'https://supreme.justia.com/cases/federal/us/376/254/',
-            'holding': 'Actual malice standard for defamation of public figures',
-            'keywords': ['defamation', 'malice', 'press', 'public figure']
-        }
-    ],
-    'separation_of_powers': [
-        {
-            'case': 'Humphrey\'s Executor v. United States, 295 U.S. 602 (1935)',
-            'url': 'https://supreme.justia.com/cases/federal/us/295/602/',
-            'holding': 'Congress may limit presidential removal of certain officers',
-            'keywords': ['removal', 'executive', 'independent agency']
-        },
-        {
-            'case': 'Seila Law LLC v. CFPB, 591 U.S. ___ (2020)',
-            'url': 'https://supreme.justia.com/cases/federal/us/591/19-7/',
-            'holding': 'Single-director removal restrictions unconstitutional',
-            'keywords': ['cfpb', 'removal', 'single director', 'unconstitutional']
-        }
-    ],
-    'standing': [
-        {
-            'case': 'Lujan v. Defenders of Wildlife, 504 U.S. 555 (1992)',
-            'url': 'https://supreme.justia.com/cases/federal/us/504/555/',
-            'holding': 'Article III standing requires injury, causation, redressability',
-            'keywords': ['standing', 'injury', 'causation', 'redressability']
-        },
-        {
-            'case': 'TransUnion LLC v. Ramirez, 594 U.S. ___ (2021)',
-            'url': 'https://supreme.justia.com/cases/federal/us/594/20-297/',
-            'holding': 'Statutory violations alone insufficient for Article III standing',
-            'keywords': ['standing', 'statutory', 'concrete harm']
-        }
-    ]
-}
+# Intent table compiled once: one pass over a message resolves its intent
+CHAT_ROUTER = IntentRouter(CHAT_INTENTS)
+
+# Latest analysis and chat history per client session; set SESSION_REDIS_URL
+# to share sessions across worker processes. In memory, sessions are bounded
+# by count and total size; each is capped at SESSION_MAX_BYTES serialized
+SESSION_REDIS_URL = os.environ.get('SESSION_REDIS_URL')
+SESSION_TTL = int(os.environ.get('SESSION_TTL', '3600'))
+if SESSION_REDIS_URL and not REDIS_SUPPORT:
+    print("redis not installed. Sessions will be kept in memory per process.")
+SESSIONS = SessionStore(
+    RedisSessionBackend(SESSION_REDIS_URL, ttl=SESSION_TTL) if SESSION_REDIS_URL and REDIS_SUPPORT
+    else MemorySessionBackend(max_sessions=int(os.environ.get('SESSION_MAX', '1000')), ttl=SESSION_TTL,
+                              max_bytes=int(os.environ.get('SESSION_BYTES', str(128 * 1024 * 1024)))),
+    max_history=int(os.environ.get('SESSION_HISTORY', '50')),
+    max_session_bytes=int(os.environ.get('SESSION_MAX_BYTES', str(1024 * 1024)))
+)
+
+# Background uploads and analyses (/api/jobs): a bounded queue per process.
+# Beyond JOB_QUEUE_DEPTH waiting jobs or JOB_QUEUE_BYTES of queued payload,
+# submissions get 429. Finished jobs keep at most JOB_RESULT_BYTES of
+# results between them (oldest evicted first). With JOB_REDIS_URL (default
+# SESSION_REDIS_URL) job status is published so any worker process can
+# report it.
+JOB_REDIS_URL = os.environ.get('JOB_REDIS_URL', SESSION_REDIS_URL)
+JOB_TTL = int(os.environ.get('JOB_TTL', '3600'))
+JOBS = JobQueue(
+    workers=int(os.environ.get('JOB_WORKERS', '2')),
+    max_queued=int(os.environ.get('JOB_QUEUE_DEPTH', '32')),
+    max_bytes=int(os.environ.get('JOB_QUEUE_BYTES', str(512 * 1024 * 1024))),
+    max_jobs=int(os.environ.get('JOB_RETENTION', '1000')),
+    max_result_bytes=int(os.environ.get('JOB_RESULT_BYTES', str(256 * 1024 * 1024))),
+    ttl=JOB_TTL,
+    shared=RedisSessionBackend(JOB_REDIS_URL, ttl=JOB_TTL, prefix='scotus:job:')
+    if JOB_REDIS_URL and REDIS_SUPPORT else None
+)
+# Seconds a job event stream may sit idle before a keepalive comment
+JOB_KEEPALIVE = float(os.environ.get('JOB_KEEPALIVE', '15'))
+# Concurrent job event streams per process; each holds a thread while open
+# (asgi.py runs them on their own pool, sized to match)
+JOB_MAX_WATCHERS = int(os.environ.get('JOB_MAX_WATCHERS', '32'))
+JOB_WATCHERS = threading.BoundedSemaphore(JOB_MAX_WATCHERS)
+
+# Chat replies: sections are joined with a blank line; notes cite at most this many
+CHAT_SECTION_SEPARATOR = '\n\n'
+CHAT_PRECEDENTS = 3
+CHAT_JUSTICES = 2
+
+# Justice-specific annotation triggers for the brief viewer
+ANNOTATOR = BriefAnnotator(SCANNER)
+
+# Per-paragraph scan state for briefs analyzed with a documentId (edit, re-analyze)
+DOCUMENT_SESSIONS = DocumentSessions(
+    SCANNER, tokenize, PRECEDENT_INDEX.select_terms,
+    max_documents=int(os.environ.get('INCREMENTAL_DOCUMENTS', '32')),
+    ttl=int(os.environ.get('INCREMENTAL_TTL', '1800'))
+)
 
 
 # ========================================
@@ -181,56 +276,179 @@ def serve_index():
 def analyze_case():
     """
     Main analysis endpoint
-    Accepts case text and returns full strategic analysis
+    Accepts case text and returns full strategic analysis. With a
+    documentId, only paragraphs changed since that document's last
+    analysis are rescanned. A sessionId key (null to start one) stores
+    the result for /api/chat and /api/simulate.
     """
     data = request.json
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
     
-    text = data.get('text', '')
-    title = data.get('title', 'Untitled Case')
-    posture = data.get('posture', 'auto')
-    tier = data.get('tier', 'B')
-    docket = data.get('docket', '')
-    
-    # Detect posture if auto
-    if posture == 'auto':
-        posture = detect_posture(text)
-    
-    # Classify input tier
-    tier = classify_tier(text, docket)
-    
-    # Extract legal issues
-    issues = extract_issues(text)
-    
-    # Find relevant precedents
-    precedents = find_precedents(issues)
-    
-    # Generate risk assessment
-    risk_assessment = assess_risk(text, issues, tier, posture)
+    try:
+        text, title, posture, docket = analysis_params(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    document_id = data.get('documentId')
+    session_id = None
+    if 'sessionId' in data:
+        session_id = data['sessionId'] if SessionStore.valid_id(data['sessionId']) else SessionStore.new_id()
     
-    # Generate strategic traps
-    traps = generate_traps(issues, posture)
+    # Identical text/posture/docket always yields the same analysis
+    key = cache_key(ENGINE_VERSION, text, posture, docket)
+    etag = make_etag(key, title)
+    if request.if_none_match.contains_weak(etag):
+        not_modified = Response(status=304)
+        not_modified.set_etag(etag, weak=True)
+        if session_id:
+            # The client already holds this analysis; the session must too.
+            # A 304 has no body, so a newly started session's id goes in a header
+            analysis = get_analysis(text, posture, docket, key)
+            SESSIONS.save_analysis(session_id, {'title': title, **analysis}, str(document_id or key))
+            not_modified.headers['X-Session-Id'] = session_id
+        return not_modified
     
-    # Generate justice questions
-    justice_questions = generate_justice_questions(issues, posture)
+    incremental = None
+    if document_id:
+        analysis, incremental = get_incremental_analysis(str(document_id), text, posture, docket, key)
+    else:
+        analysis = get_analysis(text, posture, docket, key)
     
-    # Build response
-    response = {
-        'title': title,
-        'tier': tier,
-        'posture': posture,
-        'riskLevel': risk_assessment['level'],
-        'digRisk': risk_assessment['dig_risk'],
-        'primaryObstacle': risk_assessment['primary_obstacle'],
-        'rewriteDirective': risk_assessment['rewrite_directive'],
-        'precedents': precedents,
-        'traps': traps,
-        'risks': risk_assessment['risks'],
-        'justiceQuestions': justice_questions,
-        'issues': issues,
-        'timestamp': datetime.utcnow().isoformat()
-    }
+    # Edits to one document (same documentId) keep the conversation going
+    if session_id:
+        SESSIONS.save_analysis(session_id, {'title': title, **analysis}, str(document_id or key))
     
-    return jsonify(response)
+    # Build response; title, timestamp, session and rescan stats stay out of the cached body
+    with metrics.timer('serialize'):
+        body = {
+            'title': title,
+            **analysis,
+            'timestamp': datetime.utcnow().isoformat()
+        }
+        if incremental:
+            body['incremental'] = incremental
+        if session_id:
+            body['sessionId'] = session_id
+        response = jsonify(schema_checked(body, AnalysisResponse))
+    # Weak: the timestamp differs between otherwise equivalent responses
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+@app.before_request
+def start_request_timing():
+    metrics.begin_request()
+
+
+@app.after_request
+def add_server_timing(response):
+    """Record request metrics and report stage timings in a Server-Timing header"""
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    timing = metrics.end_request(route, request.method, response.status_code)
+    if timing:
+        response.headers['Server-Timing'] = timing
+    return response
+
+
+@app.after_request
+def compress_response(response):
+    """gzip/brotli large JSON bodies and NDJSON streams for clients that accept it"""
+    if (response.status_code != 200 or 'Content-Encoding' in response.headers
+            or response.mimetype not in compression.COMPRESSIBLE_TYPES):
+        return response
+
+    encoding = compression.negotiate(request.accept_encodings)
+    response.vary.add('Accept-Encoding')
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        # Batch and upload streams: compress line by line as they are produced
+        response.response = compression.compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        body = response.get_data()
+        if len(body) < compression.COMPRESS_MIN_BYTES:
+            return response
+        response.set_data(compression.compress(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+@app.route('/api/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus text exposition of request, stage, upload and cache metrics"""
+    cache = ANALYSIS_CACHE.stats()
+    cache_lines = [
+        '# HELP scotus_analysis_cache_lookups_total Analysis cache lookups by result',
+        '# TYPE scotus_analysis_cache_lookups_total counter',
+        f'scotus_analysis_cache_lookups_total{{result="hit"}} {cache["hits"]}',
+        f'scotus_analysis_cache_lookups_total{{result="miss"}} {cache["misses"]}',
+        '# HELP scotus_analysis_cache_hit_ratio Fraction of analysis cache lookups that hit',
+        '# TYPE scotus_analysis_cache_hit_ratio gauge',
+        f'scotus_analysis_cache_hit_ratio {cache["hitRatio"]}',
+        '# HELP scotus_analysis_cache_entries Analyses currently held in memory',
+        '# TYPE scotus_analysis_cache_entries gauge',
+        f'scotus_analysis_cache_entries {cache["entries"]}'
+    ]
+    jobs = JOBS.stats()
+    cache_lines += [
+        '# HELP scotus_jobs_queued Background jobs waiting for a worker',
+        '# TYPE scotus_jobs_queued gauge',
+        f'scotus_jobs_queued {jobs["queued"]}',
+        '# HELP scotus_jobs_running Background jobs being processed',
+        '# TYPE scotus_jobs_running gauge',
+        f'scotus_jobs_running {jobs["running"]}',
+        '# HELP scotus_jobs_total Background jobs by outcome',
+        '# TYPE scotus_jobs_total counter',
+        f'scotus_jobs_total{{result="done"}} {jobs["completed"]}',
+        f'scotus_jobs_total{{result="error"}} {jobs["failed"]}',
+        f'scotus_jobs_total{{result="rejected"}} {jobs["rejected"]}'
+    ]
+    return Response(metrics.render(cache_lines), mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """Report analysis cache hit/miss counters, incremental documents, chat sessions, OCR pages and jobs"""
+    return jsonify({**ANALYSIS_CACHE.stats(), 'incremental': DOCUMENT_SESSIONS.stats(),
+                    'sessions': SESSIONS.stats(), 'ocr': ocr.OCR_CACHE.stats(), 'jobs': JOBS.stats()})
+
+
+@app.route('/api/annotate', methods=['POST'])
+def annotate_brief():
+    """
+    Sentence spans where the brief triggers Justice-specific concerns.
+    Offsets index into the submitted text (UTF-16 code units when
+    units='utf16', for browsers); sections split on blank lines.
+    """
+    data = request.json or {}
+    text = data.get('text', '')
+    if not isinstance(text, str):
+        return jsonify({'error': 'text must be a string'}), 400
+
+    with metrics.timer('annotate'):
+        annotations = ANNOTATOR.annotate(text, utf16=data.get('units') == 'utf16')
+    return jsonify(annotations)
+
+
+@app.route('/api/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """
+    Batch analysis endpoint
+    Accepts {items: [{text, title, posture, docket}, ...]} and streams one
+    NDJSON result per item in completion order, then a summary trailer
+    """
+    data = request.json
+    items = data.get('items') if isinstance(data, dict) else data
+
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'Provide a non-empty list of items'}), 400
+    if len(items) > MAX_BATCH_ITEMS:
+        return jsonify({'error': f'Batch exceeds {MAX_BATCH_ITEMS} items'}), 400
+
+    return Response(stream_batch_results(items), mimetype='application/x-ndjson')
 
 
 @app.route('/api/upload', methods=['POST'])
@@ -241,37 +459,469 @@ def upload_file():
     if not PDF_SUPPORT:
         return jsonify({'error': 'PDF support not available. Install PyPDF2.'}), 400
     
-    if 'file' not in request.files:
+    with metrics.timer('receive'):
+        files = request.files
+    
+    if 'file' not in files:
         return jsonify({'error': 'No file provided'}), 400
     
-    file = request.files['file']
+    file = files['file']
     if file.filename == '':
         return jsonify({'error': 'No file selected'}), 400
     
     if not file.filename.lower().endswith('.pdf'):
         return jsonify({'error': 'Only PDF files are supported'}), 400
     
+    stream = request.args.get('stream', '').lower() in ('1', 'true', 'ndjson')
+    
     try:
-        # Save file temporarily
-        filepath = os.path.join(UPLOAD_FOLDER, file.filename)
-        file.save(filepath)
+        # Parse straight from the spooled upload: its bytes if small, else the
+        # spool file's path. Nothing is saved under the client's filename
+        with metrics.timer('read'):
+            payload = pdf_extract.read_source(file.stream)
+        metrics.UPLOAD_BYTES.observe(file.stream.seek(0, os.SEEK_END))
         
-        # Extract text
-        text = extract_pdf_text(filepath)
+        if stream:
+            # The stream outlives the request, whose teardown would close (and
+            # delete) the spool file, so it takes the upload over and closes it
+            upload, file.stream = file.stream, io.BytesIO()
+            return Response(stream_pdf_pages(payload, file.filename, upload),
+                            mimetype='application/x-ndjson')
         
-        # Clean up
-        os.remove(filepath)
+        # Extract text
+        with metrics.timer('parse'):
+            text = extract_pdf_text(payload)
         
-        return jsonify({
-            'filename': file.filename,
-            'text': text,
-            'length': len(text)
-        })
+        with metrics.timer('serialize'):
+            return jsonify({
+                'filename': file.filename,
+                'text': text,
+                'length': len(text)
+            })
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@app.errorhandler(413)
+def upload_too_large(e):
+    """Reject bodies over MAX_UPLOAD_BYTES as soon as the limit is crossed"""
+    return jsonify({'error': f'Upload exceeds {MAX_UPLOAD_BYTES // (1024 * 1024)} MB limit'}), 413
+
+
+@app.errorhandler(SessionTooLarge)
+def session_too_large(e):
+    """Reject a title, context or chat message that cannot fit in a session"""
+    return jsonify({'error': str(e)}), 413
+
+
+def stream_pdf_pages(payload, filename: str, upload=None):
+    """
+    Yield NDJSON lines: one per page as it is parsed (or recognized, for
+    scanned pages), progress lines while OCR is running, then a summary line.
+    `upload`, the file payload was read from, is closed once streaming ends.
+    """
+    try:
+        total = pdf_extract.page_count(payload)
+        pages = min(total, pdf_extract.MAX_PAGES)
+        metrics.PDF_PAGES.observe(pages)
+        metrics.PAGES_PARSED.inc(pages)
+        yield serialization.encode({'filename': filename, 'pages': pages, 'totalPages': total}) + b'\n'
+        
+        length = 0
+        progress = pdf_extract.DocumentProgress(pages)
+        for event in pdf_extract.iter_pdf_events(payload, pages, spill_dir=UPLOAD_FOLDER, progress=progress):
+            if 'page' in event:
+                length += len(event['text']) + 1
+            yield serialization.encode(event) + b'\n'
+        
+        yield serialization.encode({
+            'done': True,
+            'filename': filename,
+            'length': max(length - 1, 0),
+            'truncated': total > pages,
+            'progress': progress.to_dict()
+        }) + b'\n'
+    except Exception as e:
+        yield serialization.encode({'error': str(e)}) + b'\n'
+    finally:
+        if upload is not None:
+            upload.close()
+
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """
+    Queue a PDF upload (multipart `file`; form fields analyze, title,
+    posture, docket) or an analysis (JSON like /api/analyze) and return
+    202 with its jobId at once. Follow it with GET /api/jobs/<jobId>.
+    A full queue answers 429 with Retry-After.
+    """
+    if request.files:
+        return submit_upload_job()
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('text'), str):
+        return jsonify({'error': 'Provide a PDF file or JSON with a text field'}), 400
+
+    try:
+        text, title, posture, docket = analysis_params(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    session_id = None
+    if 'sessionId' in data:
+        session_id = data['sessionId'] if SessionStore.valid_id(data['sessionId']) else SessionStore.new_id()
+
+    def run(job):
+        job.update(stage='analyze')
+        key = cache_key(ENGINE_VERSION, text, posture, docket)
+        analysis = get_analysis(text, posture, docket, key)
+        if session_id:
+            SESSIONS.save_analysis(session_id, {'title': title, **analysis}, key)
+        body = {'title': title, **analysis, 'timestamp': datetime.utcnow().isoformat()}
+        if session_id:
+            body['sessionId'] = session_id
+        return body
+
+    return queue_job('analyze', run, len(text))
+
+
+def submit_upload_job():
+    if not PDF_SUPPORT:
+        return jsonify({'error': 'PDF support not available. Install PyPDF2.'}), 400
+
+    file = request.files.get('file')
+    if file is None or file.filename == '':
+        return jsonify({'error': 'No file provided'}), 400
+    if not file.filename.lower().endswith('.pdf'):
+        return jsonify({'error': 'Only PDF files are supported'}), 400
+
+    # The job reads the document from its own temp file, not a copy held in memory
+    fd, path = tempfile.mkstemp(suffix='.pdf', dir=UPLOAD_FOLDER)
+    with os.fdopen(fd, 'wb') as f:
+        file.stream.seek(0)
+        shutil.copyfileobj(file.stream, f)
+        size = f.tell()
+    metrics.UPLOAD_BYTES.observe(size)
+
+    filename = file.filename
+    analyze = request.form.get('analyze', '1').lower() in ('1', 'true')
+    title = request.form.get('title') or filename
+    posture = request.form.get('posture', 'auto')
+    docket = request.form.get('docket', '')
+
+    def run(job):
+        try:
+            total = pdf_extract.page_count(path)
+            pages = min(total, pdf_extract.MAX_PAGES)
+            metrics.PDF_PAGES.observe(pages)
+            metrics.PAGES_PARSED.inc(pages)
+
+            texts = []
+            progress = pdf_extract.DocumentProgress(pages)
+            job.update(stage='extract', **progress.to_dict())
+            reported = time.monotonic()
+            for event in pdf_extract.iter_pdf_events(path, pages, spill_dir=UPLOAD_FOLDER, progress=progress):
+                if 'page' in event:
+                    texts.append(event['text'])
+                # Per-page updates would flood event streams on long documents
+                if time.monotonic() - reported >= PUBLISH_INTERVAL:
+                    job.update(**progress.to_dict())
+                    reported = time.monotonic()
+            job.update(**progress.to_dict())
+        finally:
+            os.remove(path)
+
+        text = '\n'.join(texts).strip()
+        result = {
+            'filename': filename,
+            'text': text,
+            'length': len(text),
+            'truncated': total > pages,
+            'progress': progress.to_dict()
+        }
+        if analyze:
+            job.update(stage='analyze')
+            analysis = get_analysis(text, posture, docket, cache_key(ENGINE_VERSION, text, posture, docket))
+            result['analysis'] = {'title': title, **analysis, 'timestamp': datetime.utcnow().isoformat()}
+        return result
+
+    response = queue_job('upload', run, size)
+    if response.status_code != 202:
+        os.remove(path)
+    return response
+
+
+def queue_job(kind: str, run, size: int) -> Response:
+    try:
+        job = JOBS.submit(kind, run, size)
+    except QueueFull:
+        response = jsonify({'error': 'Job queue is full; retry later'})
+        response.status_code = 429
+        response.headers['Retry-After'] = '5'
+        return response
+
+    response = jsonify({'jobId': job.id, 'status': job.status, 'position': JOBS.position(job)})
+    response.status_code = 202
+    response.headers['Location'] = f'/api/jobs/{job.id}'
+    return response
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    Job status, progress and (once done) result. With ?stream=sse, Server-Sent
+    Events instead: `progress` on every change, then `done` with the
+    result or `error`.
+    """
+    snapshot = JOBS.snapshot(job_id) if SessionStore.valid_id(job_id) else None
+    if snapshot is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+
+    if request.args.get('stream', '').lower() in ('1', 'true', 'sse'):
+        if not JOB_WATCHERS.acquire(blocking=False):
+            response = jsonify({'error': 'Too many job streams open; poll instead or retry later'})
+            response.status_code = 429
+            response.headers['Retry-After'] = '5'
+            return response
+        response = Response(stream_job_events(job_id), mimetype='text/event-stream',
+                            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+        # Released when the server closes the response, even if it is never iterated
+        response.call_on_close(JOB_WATCHERS.release)
+        return response
+    return jsonify(snapshot)
+
+
+def stream_job_events(job_id: str):
+    """
+    Yield SSE events for a job until it finishes. Jobs running in this process
+    are followed as they change; others are polled from the shared store.
+    """
+    job = JOBS.get(job_id)
+    version = None
+    idle = 0.0
+    while True:
+        if job is not None:
+            changed = job.wait(version, JOB_KEEPALIVE) if version is not None else job.version
+            if changed == version:
+                yield ': keepalive\n\n'
+                continue
+            version = changed
+            snapshot = JOBS.snapshot(job_id, include_result=job.done)
+        else:
+            snapshot = JOBS.snapshot(job_id)
+            if snapshot is None:
+                yield sse_event('error', {'jobId': job_id, 'error': 'Unknown or expired job'})
+                return
+            if snapshot == version:
+                time.sleep(PUBLISH_INTERVAL)
+                idle += PUBLISH_INTERVAL
+                if idle >= JOB_KEEPALIVE:
+                    idle = 0.0
+                    yield ': keepalive\n\n'
+                continue
+            version, idle = snapshot, 0.0
+
+        if snapshot['status'] == 'done':
+            yield sse_event('done', snapshot)
+            return
+        if snapshot['status'] == 'error':
+            yield sse_event('error', snapshot)
+            return
+        yield sse_event('progress', snapshot)
+
+
+_analysis_pool = None
+_analysis_pool_lock = threading.Lock()
+
+
+def get_analysis_pool() -> ProcessPoolExecutor:
+    """Lazily start the shared analysis pool"""
+    global _analysis_pool
+    with _analysis_pool_lock:
+        if _analysis_pool is None:
+            _analysis_pool = ProcessPoolExecutor(max_workers=ANALYSIS_WORKERS,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+        return _analysis_pool
+
+
+def analysis_params(data: dict) -> tuple:
+    """
+    (text, title, posture, docket) from a request body, as strings. Null
+    posture means 'auto' and null title/docket their defaults; numeric titles
+    and dockets are stringified. Raises ValueError on any other type.
+    """
+    text = data.get('text', '')
+    title = data.get('title')
+    posture = data.get('posture')
+    docket = data.get('docket')
+    if not isinstance(text, str):
+        raise ValueError('text must be a string')
+    if posture is not None and not isinstance(posture, str):
+        raise ValueError('posture must be a string')
+    fields = {}
+    for name, value, default in (('title', title, 'Untitled Case'), ('docket', docket, '')):
+        if value is None:
+            value = default
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = str(value)
+        elif not isinstance(value, str):
+            raise ValueError(f'{name} must be a string')
+        fields[name] = value
+    return text, fields['title'], posture or 'auto', fields['docket']
+
+
+def request_context(data: dict) -> dict:
+    """
+    Analysis context from the request body, else from the caller's session.
+    Raises ValueError unless it is an object whose issues and keywordHits
+    (when given) are objects and whose posture is a string.
+    """
+    context = data.get('context')
+    if context is None and SessionStore.valid_id(data.get('sessionId')):
+        session = SESSIONS.get(data['sessionId'])
+        context = session['analysis'] if session else None
+    context = context or {}
+    if not isinstance(context, dict):
+        raise ValueError('context must be an object')
+    for name in ('issues', 'keywordHits'):
+        if not isinstance(context.get(name) or {}, dict):
+            raise ValueError(f'context.{name} must be an object')
+    if not isinstance(context.get('posture', ''), str):
+        raise ValueError('context.posture must be a string')
+    return context
+
+
+def get_analysis(text: str, posture: str, docket: str, key: str) -> dict:
+    """Cached analysis for a brief; large briefs are analyzed in the pool"""
+    with metrics.timer('cache'):
+        analysis = ANALYSIS_CACHE.get(key)
+    if analysis is None:
+        if ANALYSIS_WORKERS > 0 and len(text) >= ANALYSIS_OFFLOAD_CHARS:
+            # Per-stage timers run in the worker; time the round trip here
+            with metrics.timer('analysis'):
+                analysis = get_analysis_pool().submit(run_analysis, text, posture, docket).result()
+        else:
+            analysis = run_analysis(text, posture, docket)
+        ANALYSIS_CACHE.put(key, analysis)
+    return analysis
+
+
+def get_incremental_analysis(document_id: str, text: str, posture: str, docket: str, key: str):
+    """
+    Cached analysis, else one built from the document's per-paragraph scan
+    state after rescanning only changed paragraphs. Returns (analysis, stats);
+    stats is None on a cache hit.
+    """
+    with metrics.timer('cache'):
+        analysis = ANALYSIS_CACHE.get(key)
+    if analysis is not None:
+        return analysis, None
+
+    with metrics.timer('scan'):
+        scan, terms, stats = DOCUMENT_SESSIONS.update(document_id, text)
+    analysis = run_analysis(text, posture, docket, scan=scan, terms=terms)
+    ANALYSIS_CACHE.put(key, analysis)
+    return analysis, stats
+
+
+def schema_checked(body: dict, schema_type) -> dict:
+    """Return body; with SCHEMA_STRICT, first raise ValueError if its JSON does not match schema_type"""
+    if SCHEMA_STRICT:
+        serialization.validate(serialization.loads(serialization.encode(body)), schema_type)
+    return body
+
+
+def stream_batch_results(items: list):
+    """
+    Yield NDJSON lines for each batch item as it completes, then a trailer
+    with counts, throughput and a triage ranking of the docket by predicted
+    vote. Item failures are reported inline.
+    """
+    started = time.perf_counter()
+    errors = 0
+    cache_hits = 0
+    pending = {}
+    scored = []  # (index, title, issues, keyword hits) for the triage pass
+
+    def result_line(index, title, analysis=None, error=None):
+        # Titles as analysis_params normalizes them for /api/analyze; unparsable items get the default
+        line = {'index': index, 'title': title}
+        if error is not None:
+            line['error'] = error
+        else:
+            line.update(schema_checked(analysis, Analysis))
+            scored.append((index, line['title'], analysis['issues'], analysis['keywordHits']))
+        return serialization.encode(line) + b'\n'
+
+    pool = get_analysis_pool() if ANALYSIS_WORKERS > 1 else None
+
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors += 1
+            yield result_line(index, 'Untitled Case', error='Item must be an object with a text field')
+            continue
+        try:
+            text, title, posture, docket = analysis_params(item)
+        except ValueError as e:
+            errors += 1
+            yield result_line(index, 'Untitled Case', error=str(e))
+            continue
+
+        key = cache_key(ENGINE_VERSION, text, posture, docket)
+
+        analysis = ANALYSIS_CACHE.get(key)
+        if analysis is not None:
+            cache_hits += 1
+            yield result_line(index, title, analysis)
+        elif pool is None:
+            try:
+                analysis = run_analysis(text, posture, docket)
+            except Exception as e:
+                errors += 1
+                yield result_line(index, title, error=str(e))
+                continue
+            ANALYSIS_CACHE.put(key, analysis)
+            yield result_line(index, title, analysis)
+        else:
+            pending[pool.submit(run_analysis, text, posture, docket)] = (index, title, key)
+
+    try:
+        for future in as_completed(pending):
+            index, title, key = pending[future]
+            try:
+                analysis = future.result()
+            except Exception as e:
+                errors += 1
+                yield result_line(index, title, error=str(e))
+                continue
+            ANALYSIS_CACHE.put(key, analysis)
+            yield result_line(index, title, analysis)
+    finally:
+        for future in pending:
+            future.cancel()
+
+    # Score the whole docket in one vote-lean matrix product
+    with metrics.timer('triage'):
+        predictions = VOTE_MODEL.predict([(issues, hits) for _, _, issues, hits in scored])
+    triage = sorted(({'index': index, 'title': title, 'split': prediction['split'],
+                      'outcome': prediction['outcome'], 'expectedVotes': prediction['expectedVotes']}
+                     for (index, title, _, _), prediction in zip(scored, predictions)),
+                    key=lambda entry: (-entry['expectedVotes'], entry['index']))
+
+    elapsed = time.perf_counter() - started
+    yield serialization.encode({
+        'done': True,
+        'count': len(items),
+        'errors': errors,
+        'cacheHits': cache_hits,
+        'triage': triage,
+        'seconds': round(elapsed, 4),
+        'docsPerSec': round(len(items) / elapsed, 2) if elapsed else None,
+        'timestamp': datetime.utcnow().isoformat()
+    }) + b'\n'
+
+
 @app.route('/api/simulate', methods=['POST'])
 def simulate_justice():
     """
@@ -279,7 +929,10 @@ def simulate_justice():
     """
     data = request.json
     justice_id = data.get('justice', 'thomas')
-    context = data.get('context', {})
+    try:
+        context = request_context(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     if justice_id not in JUSTICES:
         return jsonify({'error': 'Unknown justice'}), 400
@@ -299,337 +952,214 @@ def simulate_justice():
     })
 
 
-@app.route('/api/chat', methods=['POST'])
-def chat():
+@app.route('/api/simulate/bench', methods=['POST'])
+def simulate_bench():
     """
-    Handle interactive chat follow-ups
+    Simulate all nine Justices in one pass, ranked by expected pressure.
+    Scores come from context.issues and context.keywordHits (both returned
+    by /api/analyze), or from a scan of `text` when given.
     """
-    data = request.json
-    message = data.get('message', '')
-    history = data.get('history', [])
-    context = data.get('context', {})
-    
-    response = generate_chat_response(message, history, context)
-    
-    return jsonify({'response': response})
+    data = request.json or {}
+    try:
+        context = request_context(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    issues = context.get('issues') or {}
+    text = data.get('text', '')
+    if not isinstance(text, str):
+        return jsonify({'error': 'text must be a string'}), 400
 
+    if text:
+        scan = SCANNER.scan(text)
+        issues = issues or extract_issues(text, scan)
+        keyword_hits = JUSTICE_REGISTRY.keyword_hits(scan.keyword_counts('justice'))
+    else:
+        keyword_hits = {kw: count for kw, count in (context.get('keywordHits') or {}).items()
+                        if isinstance(count, (int, float))}
 
-# ========================================
-# Analysis Functions
-# ========================================
+    return jsonify({
+        'posture': context.get('posture', 'cert'),
+        'justices': JUSTICE_REGISTRY.ranked_bench(issues, keyword_hits)
+    })
 
-def detect_posture(text: str) -> str:
-    """Detect case posture from text content"""
-    lower_text = text.lower()
-    
-    if 'petition for writ of certiorari' in lower_text or 'cert petition' in lower_text:
-        return 'cert'
-    if 'emergency application' in lower_text or 'stay pending' in lower_text:
-        return 'emergency'
-    if 'merits brief' in lower_text or 'brief for petitioner' in lower_text:
-        return 'merits'
-    if 'oral argument transcript' in lower_text:
-        return 'backtest'
-    
-    return 'cert'
 
+@app.route('/api/simulate/outcomes', methods=['POST'])
+def simulate_outcomes():
+    """
+    Monte Carlo distribution of grant, DIG and merits split outcomes.
+    Scores `text` (via the analysis cache) or an analysis passed as context.
+    """
+    if not outcomes.NUMPY_SUPPORT:
+        return jsonify({'error': 'Outcome simulation not available. Install numpy.'}), 400
+
+    data = request.json or {}
+    try:
+        samples = int(data.get('samples', outcomes.DEFAULT_SAMPLES))
+        seed = int(data.get('seed', outcomes.DEFAULT_SEED))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'samples and seed must be integers'}), 400
+    if not 1 <= samples <= outcomes.MAX_SAMPLES:
+        return jsonify({'error': f'samples must be between 1 and {outcomes.MAX_SAMPLES}'}), 400
+    if seed < 0:
+        return jsonify({'error': 'seed must be non-negative'}), 400
 
-def classify_tier(text: str, docket: str) -> str:
-    """Classify input tier based on available materials"""
-    text_len = len(text)
-    
-    if text_len > 10000:
-        return 'A'
-    elif text_len > 1000 or text:
-        return 'B'
-    elif docket:
-        return 'C'
-    return 'C'
-
-
-def extract_issues(text: str) -> dict:
-    """Extract legal issues from case text"""
-    lower_text = text.lower()
-    
-    issues = {
-        'voting_rights': any(kw in lower_text for kw in ['voting rights', 'vra', 'section 2', 'vote dilution']),
-        'equal_protection': any(kw in lower_text for kw in ['equal protection', '14th amendment', 'fourteenth amendment', 'discrimination']),
-        'first_amendment': any(kw in lower_text for kw in ['first amendment', 'free speech', 'free exercise', 'establishment clause']),
-        'separation_of_powers': any(kw in lower_text for kw in ['separation of powers', 'executive power', 'removal', 'nondelegation']),
-        'standing': any(kw in lower_text for kw in ['standing', 'injury in fact', 'case or controversy', 'mootness']),
-        'due_process': any(kw in lower_text for kw in ['due process', 'procedural', 'substantive due process']),
-        'commerce_clause': any(kw in lower_text for kw in ['commerce clause', 'interstate commerce', 'dormant commerce']),
-        'preemption': any(kw in lower_text for kw in ['preemption', 'supremacy clause', 'federal preemption'])
-    }
-    
-    return issues
+    try:
+        text, _, posture, docket = analysis_params(data)
+        context = None if text else request_context(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if text:
+        context = get_analysis(text, posture, docket, cache_key(ENGINE_VERSION, text, posture, docket))
+    keyword_hits = {kw: count for kw, count in (context.get('keywordHits') or {}).items()
+                    if isinstance(count, (int, float))}
 
+    risk_level = context.get('riskLevel', 'CAUTION')
+    dig_risk = context.get('digRisk', 'Medium')
+    # isinstance first: an unhashable value would raise in the dict lookup
+    if not (isinstance(risk_level, str) and risk_level in outcomes.RISK_SHIFT
+            and isinstance(dig_risk, str) and dig_risk in outcomes.DIG_RATES):
+        return jsonify({'error': f'riskLevel must be one of {list(outcomes.RISK_SHIFT)} '
+                                 f'and digRisk one of {list(outcomes.DIG_RATES)}'}), 400
 
-def find_precedents(issues: dict) -> list:
-    """Find relevant precedents based on identified issues"""
-    relevant = []
-    
-    for issue_name, is_present in issues.items():
-        if is_present and issue_name in PRECEDENTS:
-            for prec in PRECEDENTS[issue_name]:
-                relevant.append({
-                    'case': prec['case'],
-                    'url': prec['url'],
-                    'relevance': prec['holding'],
-                    'risk': 'medium'  # Could be refined based on context
-                })
-    
-    # Default precedents if none found
-    if not relevant:
-        relevant.append({
-            'case': 'Marbury v. Madison, 5 U.S. 137 (1803)',
-            'url': 'https://supreme.justia.com/cases/federal/us/5/137/',
-            'relevance': 'Foundational judicial review authority',
-            'risk': 'low'
-        })
-    
-    return relevant[:6]  # Limit to 6 most relevant
+    logits = VOTE_MODEL.logits([(context.get('issues', {}), keyword_hits)])[:, 0]
+    pool = get_analysis_pool() if ANALYSIS_WORKERS > 1 and samples >= outcomes.PARALLEL_MIN_SAMPLES else None
+    with metrics.timer('outcomes'):
+        result = outcomes.simulate(logits, risk_level, dig_risk, samples, seed, pool)
 
+    return jsonify({
+        'riskLevel': risk_level,
+        'digRisk': dig_risk,
+        **result
+    })
 
-def assess_risk(text: str, issues: dict, tier: str, posture: str) -> dict:
-    """Generate comprehensive risk assessment"""
-    
-    # Determine overall risk level
-    high_risk_issues = ['standing', 'separation_of_powers']
-    has_high_risk = any(issues.get(issue) for issue in high_risk_issues)
+
+@app.route('/api/chat', methods=['POST'])
+def chat():
+    """
+    Handle interactive chat follow-ups. With a sessionId only the new
+    message is needed; the analysis and history come from the session
+    (404 if it expired: resend once with context and history to reseed it).
+    With ?stream=sse the reply is sent as Server-Sent Events, one `section`
+    event per reply section as it is composed, then `done`.
+    """
+    data = request.json
+    message = data.get('message', '')
+    session_id = data.get('sessionId')
+    stream = request.args.get('stream', '').lower() in ('1', 'true', 'sse')
     
-    if tier == 'C':
-        risk_level = 'CAUTION'
-        primary_obstacle = 'Insufficient materials for complete analysis'
-        rewrite = 'Upload full petition and lower court decision for comprehensive evaluation'
-    elif has_high_risk:
-        risk_level = 'CRITICAL'
-        primary_obstacle = 'Potential jurisdictional or structural defect identified'
-        rewrite = 'Address threshold issues before merits arguments'
+    if session_id is None:
+        history, context, session = data.get('history', []), data.get('context', {}), None
     else:
-        risk_level = 'CAUTION'
-        primary_obstacle = 'Standard appellate risks present; vehicle quality uncertain'
-        rewrite = 'Strengthen circuit split documentation and vehicle presentation'
-    
-    # Individual risk categories
-    risks = [
-        {
-            'category': 'Vehicle Integrity',
-            'level': 'low' if tier == 'A' else 'medium',
-            'confidence': 'High' if tier == 'A' else 'Limited data'
-        },
-        {
-            'category': 'Circuit Split Quality',
-            'level': 'medium',
-            'confidence': 'Requires external verification'
-        },
-        {
-            'category': 'Preservation',
-            'level': 'medium' if tier != 'A' else 'low',
-            'confidence': 'Check full record'
-        },
-        {
-            'category': 'Mootness Risk',
-            'level': 'low' if posture != 'emergency' else 'high',
-            'confidence': 'Based on posture'
-        }
-    ]
-    
-    # DIG risk
-    dig_risk = 'Medium'
-    if tier == 'C' or issues.get('standing'):
-        dig_risk = 'High'
-    elif tier == 'A' and not has_high_risk:
-        dig_risk = 'Low'
-    
-    return {
-        'level': risk_level,
-        'dig_risk': dig_risk,
-        'primary_obstacle': primary_obstacle,
-        'rewrite_directive': rewrite,
-        'risks': risks
-    }
-
-
-def generate_traps(issues: dict, posture: str) -> list:
-    """Generate strategic traps and counters"""
-    traps = []
-    
-    if issues.get('standing'):
-        traps.append({
-            'type': 'trap',
-            'text': 'Addressing merits extensively while leaving standing vulnerable to attack'
-        })
-        traps.append({
-            'type': 'counter',
-            'text': 'Lead with concrete, particularized injury demonstration before reaching merits'
-        })
+        if not SessionStore.valid_id(session_id):
+            return jsonify({'error': 'Invalid sessionId'}), 400
+        
+        if 'context' in data:
+            history = data.get('history') or []
+            if not isinstance(data['context'] or {}, dict) or not isinstance(history, list):
+                return jsonify({'error': 'context must be an object and history a list'}), 400
+            # Clients append the new message before sending; it is added below
+            if history and history[-1] == {'role': 'user', 'content': message}:
+                history = history[:-1]
+            SESSIONS.save_context(session_id, data.get('context') or {}, history)
+        
+        session = SESSIONS.get(session_id)
+        if session is None:
+            return jsonify({'error': 'Unknown or expired session'}), 404
+        history = session['history'] + [{'role': 'user', 'content': message}]
+        context = session['analysis']
     
-    if issues.get('voting_rights') and issues.get('equal_protection'):
-        traps.append({
-            'type': 'trap',
-            'text': 'Conceding that race "predominated" while relying solely on VRA compliance as compelling interest'
-        })
-        traps.append({
-            'type': 'counter',
-            'text': 'Contest predomination finding; argue traditional redistricting criteria drove map design'
-        })
+    if stream:
+        return Response(stream_chat_events(message, history, context, session_id, session),
+                        mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
     
-    # Default traps
-    if len(traps) < 2:
-        traps.extend([
-            {
-                'type': 'trap',
-                'text': 'Over-relying on circuit split without demonstrating conflict maturity'
-            },
-            {
-                'type': 'counter',
-                'text': 'Document specific contradictory holdings with parallel fact patterns'
-            }
-        ])
+    response = generate_chat_response(message, history, context)
+    if session_id is None:
+        return jsonify({'response': response})
     
-    return traps[:4]  # Limit to 4
+    save_chat_turn(session_id, session, message, response)
+    return jsonify({'response': response, 'sessionId': session_id})
 
 
-def generate_justice_questions(issues: dict, posture: str) -> list:
-    """Generate simulated questions from selected Justices"""
-    questions = []
-    
-    # Select 4 Justices with distinct analytical approaches
-    selected_justices = ['thomas', 'kagan', 'barrett', 'jackson']
-    
-    for justice_id in selected_justices:
-        justice = JUSTICES[justice_id]
-        q = generate_single_question(justice_id, justice, issues, posture)
-        questions.append(q)
-    
-    return questions
+def save_chat_turn(session_id: str, session: dict, message: str, response: str):
+    SESSIONS.append_history(session_id, session, {'role': 'user', 'content': message},
+                            {'role': 'assistant', 'content': response})
 
 
-def generate_single_question(justice_id: str, justice: dict, issues: dict, posture: str) -> dict:
-    """Generate a single Justice's question based on context"""
-    
-    question_templates = {
-        'thomas': {
-            'voting_rights': 'Where in the constitutional text does Congress derive authority to mandate race-conscious districting? Isn\'t Section 2 of the VRA itself constitutionally suspect under the original public meaning of the Fifteenth Amendment?',
-            'separation_of_powers': 'What is the original understanding of "executive Power" in Article II? Doesn\'t the removal restriction here conflict with the Constitution\'s vesting of that power in the President?',
-            'default': 'What is the original public meaning of the constitutional provision at issue, and how does that constrain our analysis?'
-        },
-        'kagan': {
-            'voting_rights': 'If we rule for you, what exactly should states do when facing a Section 2 violation? Must they wait for contempt before drawing remedial maps?',
-            'standing': 'Walk me through how your proposed standing rule would work in practice. What cases does it let in, and what does it keep out?',
-            'default': 'Give me a workable test. How would lower courts actually apply this standard?'
-        },
-        'barrett': {
-            'voting_rights': 'Does VRA compliance automatically constitute a compelling interest, or must we engage in additional balancing? What\'s the doctrinal framework?',
-            'first_amendment': 'What level of scrutiny applies here, and what\'s the precise test? I want clean doctrine.',
-            'default': 'Help me understand the doctrinal rule you want us to announce and how it fits existing precedent.'
-        },
-        'jackson': {
-            'voting_rights': 'Given the specific history of voter disenfranchisement in this jurisdiction, isn\'t there something dissonant about using Equal Protection to prevent majority-Black districts?',
-            'equal_protection': 'What historical context should inform our interpretation? How does the purpose behind this provision guide us?',
-            'default': 'What historical background are we overlooking that should inform our reading here?'
-        },
-        'roberts': {
-            'default': 'Is there a narrow way to decide this case without reaching the broader constitutional question you\'re pressing?'
-        },
-        'alito': {
-            'default': 'What are the real-world consequences of your proposed rule? Who wins and who loses?'
-        },
-        'sotomayor': {
-            'default': 'How does your position affect ordinary people? Have you considered the on-the-ground impact?'
-        },
-        'gorsuch': {
-            'default': 'Point me to the statutory text. Where are the words that support your reading?'
-        },
-        'kavanaugh': {
-            'default': 'What about stare decisis? What reliance interests would we disrupt by ruling your way?'
-        }
-    }
-    
-    # Find appropriate question
-    templates = question_templates.get(justice_id, {'default': 'How do you respond to the strongest version of your opponent\'s argument?'})
-    
-    question_text = templates.get('default', '')
-    for issue, is_present in issues.items():
-        if is_present and issue in templates:
-            question_text = templates[issue]
-            break
-    
-    # Pressure description
-    pressures = {
-        'thomas': 'Challenges modern interpretations against original constitutional framework',
-        'kagan': 'Forces articulation of workable, real-world legal standard',
-        'barrett': 'Demands clean legal test that harmonizes with existing doctrine',
-        'jackson': 'Invokes purposive/historical analysis to destabilize formalist arguments',
-        'roberts': 'Seeks narrow resolution; tests for minimalist off-ramps',
-        'alito': 'Probes practical consequences and implementation difficulties',
-        'sotomayor': 'Emphasizes human impact and fairness concerns',
-        'gorsuch': 'Insists on textual grounding for every proposition',
-        'kavanaugh': 'Weighs reliance interests and precedential stability'
-    }
-    
-    return {
-        'justice': justice_id,
-        'name': justice['name'],
-        'focus': justice['focus'],
-        'question': question_text,
-        'pressure': pressures.get(justice_id, 'Tests the logical limits of the argument')
-    }
+def sse_event(event: str, data: dict) -> str:
+    return f'event: {event}\ndata: {serialization.dumps(data)}\n\n'
 
 
-def generate_chat_response(message: str, history: list, context: dict) -> str:
-    """Generate contextual chat response"""
-    lower_message = message.lower()
-    
-    if 'what if' in lower_message or 'hypothetical' in lower_message:
-        return '''**Hypothetical Analysis Framework**
+def stream_chat_events(message: str, history: list, context: dict, session_id=None, session=None):
+    """
+    Yield SSE events for a chat reply: one `section` per reply section, then
+    `done`. The turn is saved to the session only once the reply is complete.
+    """
+    sections = []
+    try:
+        for section in chat_response_sections(message, history, context):
+            yield sse_event('section', {'index': len(sections), 'text': section})
+            sections.append(section)
+        
+        if session_id is not None:
+            save_chat_turn(session_id, session, message, CHAT_SECTION_SEPARATOR.join(sections))
+        yield sse_event('done', {'sections': len(sections), 'sessionId': session_id})
+    except Exception as e:
+        yield sse_event('error', {'error': str(e)})
 
-To evaluate alternative scenarios, I assess:
 
-1. **Vehicle Impact** — How do changed facts affect jurisdictional posture?
-2. **Standard Shift** — Does the legal test apply differently?
-3. **Justice Alignment** — Which Justices become more/less sympathetic?
+# ========================================
+# Chat and Upload Functions
+# ========================================
 
-Specify which aspect you'd like to modify for targeted analysis.'''
-    
-    if 'rewrite' in lower_message or 'question presented' in lower_message:
-        return '''**Questions Presented: Strategic Drafting**
+def generate_chat_response(message: str, history: list, context: dict) -> str:
+    """Generate contextual chat response"""
+    return CHAT_SECTION_SEPARATOR.join(chat_response_sections(message, history, context))
 
-Key principles:
 
-1. **Front-load winning facts** — Your best facts should appear in the question itself
-2. **Signal favorable review** — Frame to invoke your preferred precedent
-3. **Avoid over-breadth** — Narrow questions have higher grant rates
-4. **Create asymmetry** — Make "yes" easier than opponent's "no"
+def chat_response_sections(message: str, history: list, context: dict):
+    """
+    Yield a chat reply section by section: framework text for the question,
+    then precedent snippets and notes on the Justices likely to press. Each
+    stage runs only when the previous section has been consumed, so streamed
+    replies show the framework before precedents are looked up.
+    """
+    yield chat_framework(message, context)
+    yield from chat_precedent_notes(context)
+    yield from chat_justice_notes(context)
 
-Want me to draft alternative framings based on current case posture?'''
-    
-    if 'circuit split' in lower_message or 'conflict' in lower_message:
-        return '''**Circuit Split Analysis**
 
-The Court evaluates split quality on:
+def chat_precedent_notes(context: dict):
+    """Precedents from the analysis (or looked up from its issues) to engage with"""
+    precedents = context.get('precedents')
+    if precedents is None and isinstance(context.get('issues'), dict):
+        precedents = find_precedents(context['issues'])
+    lines = [f"• **{precedent.get('case', '')}** — {precedent.get('relevance', '')}"
+             for precedent in (precedents or [])[:CHAT_PRECEDENTS] if isinstance(precedent, Mapping)]
+    if lines:
+        yield '**Precedent to Engage**\n\n' + '\n'.join(lines)
 
-1. **Directness** — Same legal question, opposite holdings
-2. **Maturity** — Sufficient percolation across circuits
-3. **Importance** — Substantial federal interests affected
-4. **Vehicle** — Can this case cleanly resolve the split?
 
-Shallow or manufactured splits dramatically increase DIG risk.'''
-    
-    if 'standing' in lower_message or 'jurisdiction' in lower_message:
-        return '''**Jurisdictional Checklist**
+def chat_justice_notes(context: dict):
+    """The Justices expected to press hardest on the analysis, with their pressure point"""
+    questions = context.get('justiceQuestions')
+    if questions is None and isinstance(context.get('issues'), dict):
+        questions = JUSTICE_REGISTRY.panel(context['issues'], context.get('keywordHits'))
+    lines = [f"• **{question.get('name', '')}** — {question.get('pressure', '')}"
+             for question in (questions or [])[:CHAT_JUSTICES] if isinstance(question, Mapping)]
+    if lines:
+        yield '**Justices to Prepare For**\n\n' + '\n'.join(lines)
 
-Standing/jurisdiction defects are **dispositive**:
 
-• **Article III Standing**: injury-in-fact, causation, redressability  
-• **Statutory Exhaustion**: all administrative steps completed?  
-• **Finality**: lower court judgment truly final?  
-• **Mootness**: can Court grant effective relief?
+def chat_framework(message: str, context: dict) -> str:
+    """Framework text for the intent of the message, drawing on the analysis"""
+    intent = CHAT_ROUTER.resolve(message)
+    if intent is None:
+        return chat_default(context)
+    return CHAT_HANDLERS[intent['handler']](intent, context)
 
-Any weakness here must be addressed before cert, not at merits.'''
-    
-    # Default response
+
+def chat_default(context: dict) -> str:
     tier = context.get('tier', 'B')
     posture = context.get('posture', 'cert')
     
@@ -643,18 +1173,70 @@ For more specific guidance, clarify:
 2. What specific doctrinal or strategic concern to probe?'''
 
 
-def extract_pdf_text(filepath: str) -> str:
-    """Extract text content from PDF file"""
+def chat_justice(intent: dict, context: dict) -> str:
+    """The Justice's likely question on the analyzed issues, and predicted vote"""
+    issues = context.get('issues') if isinstance(context.get('issues'), dict) else {}
+    question = JUSTICE_REGISTRY.question(intent['justice'], issues)
+    response = f'''**{question['name']}: {question['focus']}**
+
+Likely question: "{question['question']}"
+
+Pressure point: {question['pressure']}.'''
+    
+    probability = (context.get('votePrediction') or {}).get('justices', {}).get(intent['justice'])
+    if probability is not None:
+        response += f"\n\nPredicted vote for petitioner: {probability:.0%}."
+    return response
+
+
+def chat_precedent(intent: dict, context: dict) -> str:
+    """A precedent's holding and how the analysis uses it"""
+    precedent = intent['precedent']
+    response = f"**{precedent['case']}**\n\n{precedent['holding']}."
+    
+    cited = next((entry for entry in context.get('precedents') or []
+                  if isinstance(entry, Mapping) and entry.get('case') == precedent['case']), None)
+    if cited is not None:
+        response += f"\n\nThe current analysis cites it ({cited.get('risk', 'unknown')} risk)."
+    elif context.get('issues'):
+        response += "\n\nThe current analysis does not cite it; tie it to a flagged issue before relying on it."
+    return response + f"\n\n{precedent['url']}"
+
+
+def chat_issue(intent: dict, context: dict) -> str:
+    """Controlling precedent and the Justices most focused on one issue"""
+    issue = intent['issue']
+    issues = context.get('issues') if isinstance(context.get('issues'), dict) else {}
+    response = f"**{issue.replace('_', ' ').capitalize()}**\n\n"
+    response += ('The current brief raises this issue.' if issues.get(issue)
+                 else 'The current brief does not flag this issue.')
+    
+    precedents = PRECEDENTS.get(issue, [])[:CHAT_PRECEDENTS]
+    if precedents:
+        response += '\n\nControlling precedent:\n' + '\n'.join(
+            f"• **{precedent['case']}** — {precedent['holding']}" for precedent in precedents)
+    
+    focused = [JUSTICES[justice_id]['name'] for justice_id, affinity in ISSUE_AFFINITY.items()
+               if affinity.get(issue, 0) >= 1.0]
+    if focused:
+        response += f"\n\nPressed hardest by: {', '.join(focused)}."
+    return response
+
+
+CHAT_HANDLERS = {
+    'text': lambda intent, context: intent['response'],
+    'justice': chat_justice,
+    'precedent': chat_precedent,
+    'issue': chat_issue
+}
+
+
+def extract_pdf_text(source) -> str:
+    """Extract text content from a PDF path or in-memory bytes"""
     if not PDF_SUPPORT:
         return ""
     
-    text = ""
-    with open(filepath, 'rb') as f:
-        reader = PyPDF2.PdfReader(f)
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-    
-    return text.strip()
+    return pdf_extract.extract_pdf_text(source, spill_dir=UPLOAD_FOLDER)
 
 
 # ========================================
@@ -666,7 +1248,8 @@ if __name__ == '__main__':
     print("SCOTUS Strategic Engine - Backend Server")
     print("=" * 50)
     print(f"PDF Support: {'Enabled' if PDF_SUPPORT else 'Disabled (install PyPDF2)'}")
-    print("Starting server on http://localhost:5000")
+    print("Starting development server on http://localhost:5000")
+    print("For production, run: python serve.py")
     print("=" * 50)
     
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,662 @@
+"""
+SCOTUS Strategic Engine - Benchmark Suite
+Times every analysis stage and backend route on synthetic corpora
+
+    python benchmark.py                      # full run, JSON to stdout
+    python benchmark.py --quick --out bench.json
+    python benchmark.py --filter route --compare bench.json
+
+Each result reports p50/p95/p99/mean latency, throughput and peak traced
+memory. --compare prints the p50 change against an earlier JSON report.
+Cases with a budget (e.g. the keyword scanner against the substring rule
+chain it replaced) exit with status 1 when they run slower than allowed.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import subprocess
+import statistics
+import tracemalloc
+from datetime import datetime
+
+import backend
+import compression
+import engine
+import serialization
+from analysis_cache import AnalysisCache
+from flask.json.provider import DefaultJSONProvider
+
+# ========================================
+# Synthetic Corpora
+# ========================================
+
+BRIEF_SIZES = {'1KB': 1024, '10KB': 10 * 1024, '1MB': 1024 * 1024, '10MB': 10 * 1024 * 1024}
+QUICK_SIZES = ('1KB', '10KB', '1MB')
+PDF_PAGES = (10, 200, 500)
+QUICK_PDF_PAGES = (10, 200)
+
+FILLER = """the court of appeals held that petitioner failed to establish the elements of
+the claim and the district court erred in its application of the governing standard
+respondent contends that the judgment below should be affirmed on alternative grounds
+the record reflects that the question was pressed and passed upon below and the
+statutory scheme confirms congress intended a uniform federal rule""".split()
+
+LEGAL_PHRASES = [keyword for keywords in engine.ISSUE_KEYWORDS.values() for keyword in keywords] + [
+    'petition for writ of certiorari', 'strict scrutiny', 'stare decisis', 'original meaning',
+    'historical practice', 'circuit split', 'redistricting', 'Humphrey\'s Executor'
+]
+
+
+def make_brief(size: int, seed: int = 0) -> str:
+    """Deterministic brief-like text of roughly `size` characters"""
+    rng = random.Random(seed)
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(LEGAL_PHRASES) if rng.random() < 0.03 else rng.choice(FILLER)
+        words.append(word)
+        length += len(word) + 1
+    return ' '.join(words)[:size]
+
+
+def make_pdf(pages: int, seed: int = 0) -> bytes:
+    """Minimal multi-page PDF with one text block per page"""
+    rng = random.Random(seed)
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        ('<< /Type /Pages /Kids [%s] /Count %d >>'
+         % (' '.join(f'{3 + 2 * i} 0 R' for i in range(pages)), pages)).encode(),
+    ]
+    font = 3 + 2 * pages
+    for i in range(pages):
+        lines = [make_brief(80, seed=rng.randrange(1 << 30)) for _ in range(40)]
+        ops = ' '.join('(%s) Tj 0 -14 Td' % line.replace('\\', '').replace('(', '').replace(')', '')
+                       for line in lines)
+        stream = f'BT /F1 10 Tf 50 760 Td {ops} ET'.encode('latin1', 'replace')
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       f'/Resources << /Font << /F1 {font} 0 R >> >> /Contents {4 + 2 * i} 0 R >>'.encode())
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+    objects.append(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+
+    out = io.BytesIO()
+    out.write(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b'%d 0 obj\n' % number + body + b'\nendobj\n')
+    xref = out.tell()
+    out.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b'%010d 00000 n \n' % offset)
+    out.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+# ========================================
+# Harness
+# ========================================
+
+BENCHMARKS = []
+
+
+def benchmark(name: str, group: str):
+    """Register a benchmark factory: factory(args) yields (label, size_bytes, fn)"""
+    def register(factory):
+        BENCHMARKS.append((name, group, factory))
+        return factory
+    return register
+
+
+# (name, case) -> (baseline case, max p50 ratio); checked after the run
+BUDGETS = {}
+
+
+def budget(name: str, case: str, baseline_case: str, ratio: float):
+    """Fail the run if `case` is more than `ratio` times slower (p50) than `baseline_case`"""
+    BUDGETS[(name, case)] = (baseline_case, ratio)
+
+
+def check_budgets(report: dict) -> list:
+    """Print and return every case over its budget"""
+    p50 = {(r['name'], r['case']): r['p50_ms'] for r in report['results']}
+    failures = []
+    for (name, case), (baseline_case, ratio) in BUDGETS.items():
+        if (name, case) in p50 and (name, baseline_case) in p50 and p50[(name, baseline_case)]:
+            actual = p50[(name, case)] / p50[(name, baseline_case)]
+            if actual > ratio:
+                failures.append((name, case, actual))
+                print(f"REGRESSION {name} {case}: {actual:.1f}x {baseline_case} (budget {ratio}x)", file=sys.stderr)
+    return failures
+
+
+def percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(fn, min_time: float, min_runs: int, max_runs: int) -> dict:
+    """Time fn repeatedly, then once more under tracemalloc for peak memory"""
+    fn()  # warm-up
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < max_runs and (len(samples) < min_runs or time.perf_counter() - started < min_time):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    mean = statistics.fmean(samples)
+    return {
+        'runs': len(samples),
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p95_ms': percentile(samples, 95) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+        'mean_ms': mean * 1000,
+        'ops_per_sec': 1 / mean if mean else None,
+        'peak_kb': peak / 1024
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ''
+
+
+# ========================================
+# Analysis Stage Benchmarks
+# ========================================
+
+def brief_sizes(args):
+    return QUICK_SIZES if args.quick else tuple(BRIEF_SIZES)
+
+
+def stage_cases(args, make_fn):
+    for label in brief_sizes(args):
+        text = make_brief(BRIEF_SIZES[label])
+        yield label, len(text), make_fn(text)
+
+
+def make_plain(size: int, seed: int = 0) -> str:
+    """Text of roughly `size` characters containing no keyword: every keyword search scans it all"""
+    rng = random.Random(seed)
+    words = ('lorem', 'ipsum', 'dolor', 'amet', 'consectetur', 'adipiscing', 'elit', 'tempor')
+    return ' '.join(rng.choice(words) for _ in range(size // 6 + 1))[:size]
+
+
+def baseline_flags(text: str):
+    """The substring rule chain the scanner replaced: extract_issues and detect_posture as `in` checks"""
+    lower_text = text.lower()
+    issues = {issue: any(kw in lower_text for kw in keywords) for issue, keywords in engine.ISSUE_KEYWORDS.items()}
+    lower_text = text.lower()
+    posture = next((label for label, markers in engine.POSTURE_MARKERS.items()
+                    if any(marker in lower_text for marker in markers)), 'cert')
+    return issues, posture
+
+
+@benchmark('keyword scan', 'stage')
+def bench_keyword_scan(args):
+    for label in brief_sizes(args):
+        for kind, text in (('', make_brief(BRIEF_SIZES[label])), (' plain', make_plain(BRIEF_SIZES[label]))):
+            yield f'{label}{kind} baseline', len(text), lambda text=text: baseline_flags(text)
+
+            def flags(text=text):
+                scan = engine.SCANNER.scan(text)
+                return engine.extract_issues(text, scan), engine.detect_posture(text, scan)
+
+            yield f'{label}{kind} flags', len(text), flags
+            budget('keyword scan', f'{label}{kind} flags', f'{label}{kind} baseline', 2.0)
+            yield f'{label}{kind} justice counts', len(text), \
+                lambda text=text: engine.SCANNER.scan(text).keyword_counts('justice')
+
+
+@benchmark('detect_posture', 'stage')
+def bench_detect_posture(args):
+    return stage_cases(args, lambda text: lambda: engine.detect_posture(text))
+
+
+@benchmark('classify_tier', 'stage')
+def bench_classify_tier(args):
+    return stage_cases(args, lambda text: lambda: engine.classify_tier(text, '24-109'))
+
+
+@benchmark('extract_issues', 'stage')
+def bench_extract_issues(args):
+    return stage_cases(args, lambda text: lambda: engine.extract_issues(text))
+
+
+@benchmark('find_precedents', 'stage')
+def bench_find_precedents(args):
+    def make(text):
+        issues = engine.extract_issues(text)
+        return lambda: engine.find_precedents(issues, text)
+    return stage_cases(args, make)
+
+
+@benchmark('assess_risk', 'stage')
+def bench_assess_risk(args):
+    def make(text):
+        issues = engine.extract_issues(text)
+        tier = engine.classify_tier(text, '')
+        return lambda: engine.assess_risk(text, issues, tier, 'cert')
+    return stage_cases(args, make)
+
+
+@benchmark('generate_traps', 'stage')
+def bench_generate_traps(args):
+    def make(text):
+        issues = engine.extract_issues(text)
+        return lambda: engine.generate_traps(issues, 'cert')
+    return stage_cases(args, make)
+
+
+@benchmark('generate_justice_questions', 'stage')
+def bench_generate_justice_questions(args):
+    def make(text):
+        scan = engine.SCANNER.scan(text)
+        issues = engine.extract_issues(text, scan)
+        hits = engine.JUSTICE_REGISTRY.keyword_hits(scan.keyword_counts('justice'))
+        return lambda: engine.generate_justice_questions(issues, 'cert', hits)
+    return stage_cases(args, make)
+
+
+@benchmark('VoteModel.predict', 'stage')
+def bench_vote_predict(args):
+    briefs = []
+    for seed in range(100):
+        scan = engine.SCANNER.scan(make_brief(BRIEF_SIZES['10KB'], seed=seed))
+        briefs.append((engine.extract_issues('', scan), engine.JUSTICE_REGISTRY.keyword_hits(scan.keyword_counts('justice'))))
+    for count in (1, 100) if args.quick else (1, 100, 1000):
+        batch = (briefs * (count // len(briefs) + 1))[:count]
+        yield f'{count} briefs', 0, lambda batch=batch: engine.VOTE_MODEL.predict(batch)
+
+
+def make_corpus(count: int, seed: int = 0) -> dict:
+    """Issue -> precedents table of `count` synthetic precedents over a ~5k-word vocabulary"""
+    rng = random.Random(seed)
+    vocabulary = [f'{rng.choice(FILLER)}{index}' for index in range(5000)] + FILLER
+    issues = list(engine.ISSUE_KEYWORDS)
+    corpus = {issue: [] for issue in issues}
+    for index in range(count):
+        issue = issues[index % len(issues)]
+        corpus[issue].append({
+            'case': f'Party{index} v. Party{index + 1}, {index} U.S. {index % 900} (2001)',
+            'url': f'https://example.test/{index}',
+            'holding': ' '.join(rng.choices(vocabulary, k=30)),
+            'keywords': rng.sample(engine.ISSUE_KEYWORDS[issue], 2) + rng.choices(vocabulary, k=2)
+        })
+    return corpus
+
+
+@benchmark('PrecedentIndex.search', 'stage')
+def bench_precedent_search(args):
+    from precedent_index import PrecedentIndex
+    for count in (len(engine.PRECEDENT_INDEX.docs) if hasattr(engine.PRECEDENT_INDEX, 'docs') else 0, 20_000):
+        if not count:
+            continue
+        index = engine.PRECEDENT_INDEX if count < 20_000 else PrecedentIndex(make_corpus(count))
+        # A brief quoting a few hundred holdings: thousands of distinct index terms
+        holdings = [doc['holding'] for doc in index.docs]
+        text = make_brief(BRIEF_SIZES['10KB']) + ' ' + ' '.join(random.Random(1).choices(holdings, k=300))
+        issues = engine.extract_issues(text)
+        yield f'{count} precedents', len(text), lambda index=index, text=text, issues=issues: index.search(
+            index.query_terms(text), issues)
+        terms = index.query_terms(text)
+        yield f'{count} precedents, terms given', 0, lambda index=index, terms=terms, issues=issues: index.search(
+            terms, issues)
+
+
+def make_intents(count: int, seed: int = 0) -> list:
+    """The chat intent table padded with synthetic intents (two-word phrases from FILLER)"""
+    rng = random.Random(seed)
+    synthetic = [{'intent': f'synthetic:{index}', 'phrases': [f'{rng.choice(FILLER)} {rng.choice(FILLER)}{index}'],
+                  'terms': [' '.join(rng.choices(FILLER, k=4)) + f' term{index}']}
+                 for index in range(max(count - len(backend.CHAT_INTENTS), 0))]
+    return backend.CHAT_INTENTS + synthetic
+
+
+@benchmark('IntentRouter.resolve', 'stage')
+def bench_intent_router(args):
+    from intents import IntentRouter
+    messages = {
+        'match': 'What would Justice Kagan ask about the circuit split over standing in this petition?',
+        'no match': 'Walk me through the record below and what the parties argued at each stage.'
+    }
+    for count in (len(backend.CHAT_INTENTS), 1000) if args.quick else (len(backend.CHAT_INTENTS), 1000, 10_000, 100_000):
+        intents = make_intents(count)
+        router = IntentRouter(intents)
+        for label, message in messages.items():
+            yield f'{count} intents, {label}', len(message), lambda router=router, message=message: router.resolve(message)
+            # The substring if-chain it replaced, for scale
+            yield f'{count} intents, {label}, linear', len(message), lambda intents=intents, message=message: next(
+                (intent for intent in intents if any(phrase.lower() in message.lower() for phrase in intent['phrases'])), None)
+
+
+@benchmark('run_analysis', 'stage')
+def bench_run_analysis(args):
+    return stage_cases(args, lambda text: lambda: engine.run_analysis(text, 'auto', ''))
+
+
+@benchmark('run_analysis batch', 'stage')
+def bench_run_analysis_batch(args):
+    # Results are kept, as the analysis cache and batch triage do; peak_kb is the memory a batch holds
+    count = 1000 if args.quick else 10_000
+    texts = [make_brief(2048, seed=i) for i in range(count)]
+    yield f'{count // 1000}k x 2KB', sum(map(len, texts)), lambda: [engine.run_analysis(text, 'auto', '') for text in texts]
+
+
+@benchmark('analysis entry points', 'stage')
+def bench_entry_points(args):
+    # Both front ends call engine.run_analysis; tests/test_parity.py checks their output matches
+    try:
+        os.environ.setdefault('STREAMLIT_LOGGER_LEVEL', 'error')
+        import streamlit_app
+    except ImportError:
+        return
+    for label in brief_sizes(args):
+        text = make_brief(BRIEF_SIZES[label])
+        yield f'{label} api', len(text), lambda text=text: backend.run_analysis(text, 'auto', '')
+        yield f'{label} streamlit', len(text), lambda text=text: streamlit_app.analyze_case_logic(text, 'Bench', 'auto', '')
+
+
+@benchmark('extract_pdf_text', 'stage')
+def bench_extract_pdf_text(args):
+    for pages in (QUICK_PDF_PAGES if args.quick else PDF_PAGES):
+        pdf = make_pdf(pages)
+        yield f'{pages}p', len(pdf), lambda pdf=pdf: backend.extract_pdf_text(pdf)
+
+
+def serialize_cases(args):
+    """(label, payload) pairs: one analysis and a 100-brief batch payload"""
+    analyses = [engine.run_analysis(make_brief(BRIEF_SIZES['10KB'], seed=i), 'auto', '') for i in range(100)]
+    yield '1 analysis', analyses[0]
+    yield '100 analyses', [{'index': i, 'title': f'Petition {i}', **a} for i, a in enumerate(analyses)]
+
+
+@benchmark('JSON serialize', 'stage')
+def bench_serialize(args):
+    # Flask's stock provider (the previous jsonify path) against each installed backend
+    stock = DefaultJSONProvider(backend.app)
+    for label, payload in serialize_cases(args):
+        size = len(serialization.encode(payload))
+        with backend.app.app_context():
+            yield f'{label} jsonify', size, lambda payload=payload: stock.response(payload).get_data()
+            yield f'{label} fast jsonify ({serialization.BACKEND})', size, \
+                lambda payload=payload: backend.app.json.response(payload).get_data()
+        for name, encode in serialization.ENCODERS.items():
+            yield f'{label} {name}', size, lambda payload=payload, encode=encode: encode(payload)
+
+
+@benchmark('compress', 'stage')
+def bench_compress(args):
+    encodings = ('gzip', 'br') if compression.BROTLI_SUPPORT else ('gzip',)
+    for label, payload in serialize_cases(args):
+        body = serialization.encode(payload)
+        for encoding in encodings:
+            yield f'{label} {encoding}', len(body), lambda body=body, encoding=encoding: compression.compress(body, encoding)
+
+
+# ========================================
+# Route Benchmarks
+# ========================================
+
+def client():
+    return backend.app.test_client()
+
+
+def uncached(fn):
+    """Run fn against an analysis cache that never retains anything"""
+    def run():
+        saved = backend.ANALYSIS_CACHE
+        backend.ANALYSIS_CACHE = AnalysisCache(max_entries=0)
+        try:
+            return fn()
+        finally:
+            backend.ANALYSIS_CACHE = saved
+    return run
+
+
+@benchmark('GET /', 'route')
+def bench_index(args):
+    c = client()
+    yield '-', 0, lambda: c.get('/').close()
+
+
+@benchmark('POST /api/analyze', 'route')
+def bench_analyze(args):
+    c = client()
+    for label in brief_sizes(args):
+        body = {'text': make_brief(BRIEF_SIZES[label]), 'title': 'Bench', 'posture': 'auto'}
+        yield f'{label} uncached', len(body['text']), uncached(lambda body=body: c.post('/api/analyze', json=body).data)
+        yield f'{label} cached', len(body['text']), lambda body=body: c.post('/api/analyze', json=body).data
+
+
+@benchmark('POST /api/analyze incremental', 'route')
+def bench_analyze_incremental(args):
+    c = client()
+    # ~200 pages in 1.5KB paragraphs; each run toggles one sentence in one paragraph
+    paragraphs = [make_brief(1536, seed=seed) for seed in range(400)]
+    original = '\n\n'.join(paragraphs)
+    paragraphs[200] += ' The question presented turns on standing.'
+    edited = '\n\n'.join(paragraphs)
+    versions = [edited, original]
+    c.post('/api/analyze', json={'text': original, 'documentId': 'bench'})
+
+    def edit():
+        versions.reverse()
+        return c.post('/api/analyze', json={'text': versions[0], 'documentId': 'bench'}).data
+
+    yield '200p one-sentence edit', len(original), uncached(edit)
+
+
+@benchmark('POST /api/annotate', 'route')
+def bench_annotate(args):
+    c = client()
+    for label in brief_sizes(args):
+        text = make_brief(BRIEF_SIZES[label])
+        yield label, len(text), lambda text=text: c.post('/api/annotate', json={'text': text, 'units': 'utf16'}).data
+
+
+@benchmark('POST /api/analyze/batch', 'route')
+def bench_analyze_batch(args):
+    c = client()
+    for count in ((10, 50) if args.quick else (10, 50, 200)):
+        items = [{'text': make_brief(BRIEF_SIZES['10KB'], seed=i), 'title': f'Petition {i}'} for i in range(count)]
+        size = sum(len(item['text']) for item in items)
+        yield f'{count}x10KB', size, uncached(lambda items=items: c.post('/api/analyze/batch', json={'items': items}).data)
+        for encoding in (('gzip', 'br') if compression.BROTLI_SUPPORT else ('gzip',)):
+            headers = {'Accept-Encoding': encoding}
+            yield f'{count}x10KB {encoding}', size, uncached(
+                lambda items=items, headers=headers: c.post('/api/analyze/batch', json={'items': items}, headers=headers).data)
+
+
+@benchmark('POST /api/upload', 'route')
+def bench_upload(args):
+    c = client()
+    for pages in (QUICK_PDF_PAGES if args.quick else PDF_PAGES):
+        pdf = make_pdf(pages)
+        yield f'{pages}p', len(pdf), lambda pdf=pdf: c.post(
+            '/api/upload', data={'file': (io.BytesIO(pdf), 'bench.pdf')}).data
+        yield f'{pages}p stream', len(pdf), lambda pdf=pdf: c.post(
+            '/api/upload?stream=1', data={'file': (io.BytesIO(pdf), 'bench.pdf')}).data
+
+
+@benchmark('POST /api/simulate', 'route')
+def bench_simulate(args):
+    c = client()
+    issues = engine.extract_issues(make_brief(BRIEF_SIZES['10KB']))
+    body = {'justice': 'kagan', 'context': {'issues': issues, 'posture': 'cert'}}
+    yield '-', 0, lambda: c.post('/api/simulate', json=body).data
+
+
+@benchmark('POST /api/simulate/bench', 'route')
+def bench_simulate_bench(args):
+    c = client()
+    context = engine.run_analysis(make_brief(BRIEF_SIZES['10KB']), 'auto', '')
+    body = {'context': {'issues': context['issues'], 'keywordHits': context['keywordHits'], 'posture': 'cert'}}
+    yield 'context', 0, lambda: c.post('/api/simulate/bench', json=body).data
+    text = make_brief(BRIEF_SIZES['10KB'])
+    yield '10KB text', len(text), lambda: c.post('/api/simulate/bench', json={'text': text}).data
+
+
+@benchmark('POST /api/simulate/outcomes', 'route')
+def bench_simulate_outcomes(args):
+    c = client()
+    context = engine.run_analysis(make_brief(BRIEF_SIZES['10KB']), 'auto', '')
+    for samples in (10_000, 100_000) if args.quick else (10_000, 100_000, 1_000_000):
+        body = {'context': context, 'samples': samples}
+        yield f'{samples} samples', 0, lambda body=body: c.post('/api/simulate/outcomes', json=body).data
+
+
+@benchmark('POST /api/chat', 'route')
+def bench_chat(args):
+    c = client()
+    context = engine.run_analysis(make_brief(BRIEF_SIZES['10KB']), 'auto', '')
+    for message in ('What about the circuit split?', 'Tell me more'):
+        body = {'message': message, 'history': [], 'context': context}
+        yield message, 0, lambda body=body: c.post('/api/chat', json=body).data
+    # Session chat sends only the message; history is bounded by SESSION_HISTORY
+    session_id = c.post('/api/analyze', json={'text': make_brief(BRIEF_SIZES['10KB']), 'sessionId': None}).get_json()['sessionId']
+    body = {'sessionId': session_id, 'message': 'What about the circuit split?'}
+    yield 'session', 0, lambda: c.post('/api/chat', json=body).data
+
+    def first_section():
+        # Time to first SSE section; the rest of the reply is never composed
+        response = c.post('/api/chat?stream=sse', json=body, buffered=False)
+        chunk = next(iter(response.response))
+        response.close()
+        return chunk
+
+    yield 'session sse first section', 0, first_section
+    yield 'session sse full', 0, lambda: c.post('/api/chat?stream=sse', json=body).data
+
+
+@benchmark('POST /api/jobs', 'route')
+def bench_jobs(args):
+    c = client()
+    for label in brief_sizes(args):
+        body = {'text': make_brief(BRIEF_SIZES[label]), 'title': 'Bench'}
+
+        def poll(body=body):
+            # Submit, then poll the status URL until the job finishes
+            location = c.post('/api/jobs', json=body).headers['Location']
+            while True:
+                snapshot = c.get(location).get_json()
+                if snapshot['status'] == 'done':
+                    return snapshot
+                if snapshot['status'] == 'error':
+                    raise RuntimeError(snapshot['error'])
+                time.sleep(0.001)
+
+        def stream(body=body):
+            # Submit, then follow the job's event stream to its final event
+            location = c.post('/api/jobs', json=body).headers['Location']
+            # Closing the response releases its job stream slot, as a server would
+            with c.get(location + '?stream=sse') as response:
+                events = response.data
+            if b'event: done' not in events:
+                raise RuntimeError(events[-200:].decode())
+            return events
+
+        yield f'{label} submit + poll', len(body['text']), uncached(poll)
+        yield f'{label} submit + sse', len(body['text']), uncached(stream)
+
+
+@benchmark('GET /api/metrics', 'route')
+def bench_metrics(args):
+    c = client()
+    # Populate stage timers and counters so the exposition has every series
+    c.post('/api/analyze', json={'text': make_brief(BRIEF_SIZES['10KB'])})
+    yield '-', 0, lambda: c.get('/api/metrics').data
+
+
+@benchmark('GET /api/cache/stats', 'route')
+def bench_cache_stats(args):
+    c = client()
+    yield '-', 0, lambda: c.get('/api/cache/stats').data
+
+
+# ========================================
+# Runner
+# ========================================
+
+def run(args) -> dict:
+    results = []
+    for name, group, factory in BENCHMARKS:
+        if args.filter and args.filter not in name and args.filter != group:
+            continue
+        for label, size, fn in factory(args):
+            stats = measure(fn, args.min_time, args.min_runs, args.max_runs)
+            if size and stats['ops_per_sec']:
+                stats['mb_per_sec'] = size * stats['ops_per_sec'] / (1024 * 1024)
+            results.append({'name': name, 'group': group, 'case': label, 'bytes': size, **stats})
+            print(f"{name:<32} {label:<16} p50 {stats['p50_ms']:10.3f} ms  "
+                  f"p99 {stats['p99_ms']:10.3f} ms  peak {stats['peak_kb']:10.1f} KB", file=sys.stderr)
+
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'quick': args.quick
+        },
+        'results': results
+    }
+
+
+def compare(report: dict, baseline_path: str):
+    """Print p50 deltas against a previous report"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {(r['name'], r['case']): r for r in json.load(f)['results']}
+    print(f"\n{'benchmark':<32} {'case':<16} {'base p50':>12} {'p50':>12} {'change':>8}", file=sys.stderr)
+    for result in report['results']:
+        old = baseline.get((result['name'], result['case']))
+        if not old:
+            continue
+        change = (result['p50_ms'] - old['p50_ms']) / old['p50_ms'] * 100 if old['p50_ms'] else 0.0
+        print(f"{result['name']:<32} {result['case']:<16} {old['p50_ms']:10.3f}ms "
+              f"{result['p50_ms']:10.3f}ms {change:+7.1f}%", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark analysis stages and backend routes')
+    parser.add_argument('--quick', action='store_true', help='skip the 10MB brief and largest PDFs')
+    parser.add_argument('--filter', help="only run benchmarks whose name contains this, or a group ('stage', 'route')")
+    parser.add_argument('--min-time', type=float, default=0.5, help='minimum seconds per case')
+    parser.add_argument('--min-runs', type=int, default=5)
+    parser.add_argument('--max-runs', type=int, default=1000)
+    parser.add_argument('--out', help='write the JSON report here instead of stdout')
+    parser.add_argument('--compare', help='baseline JSON report to diff against')
+    args = parser.parse_args()
+
+    report = run(args)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        compare(report, args.compare)
+    if check_budgets(report):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
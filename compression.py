@@ -0,0 +1,69 @@
+"""
+SCOTUS Strategic Engine - Response Compression
+gzip or brotli for large JSON bodies and NDJSON streams
+
+Buffered JSON responses are compressed once they reach COMPRESS_MIN_BYTES.
+NDJSON streams (batch analysis, streamed uploads) are compressed as they
+are produced, flushing after every chunk so clients still receive each
+line as soon as it is ready. Brotli needs the `brotli` package and is
+preferred when the client accepts it; gzip is always available.
+"""
+
+import os
+import zlib
+
+try:
+    import brotli
+    BROTLI_SUPPORT = True
+except ImportError:
+    brotli = None
+    BROTLI_SUPPORT = False
+
+COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', str(64 * 1024)))
+
+# Mid-range settings: most of the size reduction at a fraction of the maximum-level CPU cost
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson')
+
+# zlib window bits for a gzip header and trailer
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def negotiate(accept_encodings) -> str:
+    """Best supported encoding for a request's Accept-Encoding (Werkzeug Accept), or None"""
+    if BROTLI_SUPPORT and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, _GZIP_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks, encoding: str):
+    """Compress an iterable of str/bytes chunks, flushing after each so streaming is preserved"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        process, flush, finish = compressor.process, compressor.flush, compressor.finish
+    else:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, _GZIP_WBITS)
+        process, finish = compressor.compress, compressor.flush
+        flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            yield process(chunk) + flush()
+        yield finish()
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
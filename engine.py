@@ -0,0 +1,376 @@
+"""
+SCOTUS Strategic Engine - Analysis Engine
+Rule tables and the analysis pipeline shared by the API and the Streamlit app
+
+Everything is compiled once at import: the keyword scanner, the Justice
+question tables, the vote model and the precedent index. backend.py and
+streamlit_app.py both call run_analysis, and analysis pool workers import
+only this module.
+"""
+
+import os
+from enum import IntFlag
+
+import metrics
+from justices import JUSTICES, JusticeRegistry
+from precedent_index import PrecedentIndex
+from precedent_store import PrecedentStore
+from results import IssueFlags, Precedent, Risk, Trap
+from schema import Analysis
+from scanner import KeywordScanner
+from vote_model import VoteModel
+
+# ========================================
+# Rule Tables
+# ========================================
+
+# Bump whenever rule tables or analysis logic change, to invalidate cached results
+ENGINE_VERSION = '8'
+
+# Precedent database (subset for demonstration)
+PRECEDENTS = {
+    'voting_rights': [
+        {
+            'case': 'Thornburg v. Gingles, 478 U.S. 30 (1986)',
+            'url': 'https://supreme.justia.com/cases/federal/us/478/30/',
+            'holding': 'Established Section 2 VRA preconditions for vote dilution claims',
+            'keywords': ['vra', 'voting rights', 'section 2', 'dilution']
+        },
+        {
+            'case': 'Shaw v. Reno, 509 U.S. 630 (1993)',
+            'url': 'https://supreme.justia.com/cases/federal/us/509/630/',
+            'holding': 'Racial gerrymandering violates Equal Protection',
+            'keywords': ['gerrymandering', 'equal protection', 'race', 'redistricting']
+        },
+        {
+            'case': 'Allen v. Milligan, 599 U.S. 1 (2023)',
+            'url': 'https://supreme.justia.com/cases/federal/us/599/1/',
+            'holding': 'Reaffirmed Gingles framework for Section 2 claims',
+            'keywords': ['vra', 'gingles', 'section 2', 'alabama']
+        }
+    ],
+    'equal_protection': [
+        {
+            'case': 'Miller v. Johnson, 515 U.S. 900 (1995)',
+            'url': 'https://supreme.justia.com/cases/federal/us/515/900/',
+            'holding': 'Race cannot predominate in redistricting without compelling justification',
+            'keywords': ['race', 'predominate', 'strict scrutiny', 'redistricting']
+        },
+        {
+            'case': 'Cooper v. Harris, 581 U.S. 285 (2017)',
+            'url': 'https://supreme.justia.com/cases/federal/us/581/285/',
+            'holding': 'Good-faith VRA compliance cannot save unnecessary racial sorting',
+            'keywords': ['vra', 'racial sorting', 'narrow tailoring']
+        }
+    ],
+    'first_amendment': [
+        {
+            'case': 'Reed v. Town of Gilbert, 576 U.S. 155 (2015)',
+            'url': 'https://supreme.justia.com/cases/federal/us/576/155/',
+            'holding': 'Content-based speech restrictions subject to strict scrutiny',
+            'keywords': ['content', 'speech', 'strict scrutiny', 'signs']
+        },
+        {
+            'case': 'New York Times Co. v. Sullivan, 376 U.S. 254 (1964)',
+            'url': 'https://supreme.justia.com/cases/federal/us/376/254/',
+            'holding': 'Actual malice standard for defamation of public figures',
+            'keywords': ['defamation', 'malice', 'press', 'public figure']
+        }
+    ],
+    'separation_of_powers': [
+        {
+            'case': 'Humphrey\'s Executor v. United States, 295 U.S. 602 (1935)',
+            'url': 'https://supreme.justia.com/cases/federal/us/295/602/',
+            'holding': 'Congress may limit presidential removal of certain officers',
+            'keywords': ['removal', 'executive', 'independent agency']
+        },
+        {
+            'case': 'Seila Law LLC v. CFPB, 591 U.S. ___ (2020)',
+            'url': 'https://supreme.justia.com/cases/federal/us/591/19-7/',
+            'holding': 'Single-director removal restrictions unconstitutional',
+            'keywords': ['cfpb', 'removal', 'single director', 'unconstitutional']
+        }
+    ],
+    'standing': [
+        {
+            'case': 'Lujan v. Defenders of Wildlife, 504 U.S. 555 (1992)',
+            'url': 'https://supreme.justia.com/cases/federal/us/504/555/',
+            'holding': 'Article III standing requires injury, causation, redressability',
+            'keywords': ['standing', 'injury', 'causation', 'redressability']
+        },
+        {
+            'case': 'TransUnion LLC v. Ramirez, 594 U.S. ___ (2021)',
+            'url': 'https://supreme.justia.com/cases/federal/us/594/20-297/',
+            'holding': 'Statutory violations alone insufficient for Article III standing',
+            'keywords': ['standing', 'statutory', 'concrete harm']
+        }
+    ]
+}
+
+
+# Issue keyword table (issue -> keywords, matched case-insensitively)
+ISSUE_KEYWORDS = {
+    'voting_rights': ['voting rights', 'vra', 'section 2', 'vote dilution'],
+    'equal_protection': ['equal protection', '14th amendment', 'fourteenth amendment', 'discrimination'],
+    'first_amendment': ['first amendment', 'free speech', 'free exercise', 'establishment clause'],
+    'separation_of_powers': ['separation of powers', 'executive power', 'removal', 'nondelegation'],
+    'standing': ['standing', 'injury in fact', 'case or controversy', 'mootness'],
+    'due_process': ['due process', 'procedural', 'substantive due process'],
+    'commerce_clause': ['commerce clause', 'interstate commerce', 'dormant commerce'],
+    'preemption': ['preemption', 'supremacy clause', 'federal preemption']
+}
+
+# Posture markers, checked in priority order
+POSTURE_MARKERS = {
+    'cert': ['petition for writ of certiorari', 'cert petition'],
+    'emergency': ['emergency application', 'stay pending'],
+    'merits': ['merits brief', 'brief for petitioner'],
+    'backtest': ['oral argument transcript']
+}
+
+
+# ========================================
+# Compiled Rule Set
+# ========================================
+
+# Built once at import; answers issue, posture, precedent and Justice profile keyword lookups.
+# Profile keywords are plain words ('text', 'original'), so they must not match inside others
+SCANNER = KeywordScanner({
+    'issue': ISSUE_KEYWORDS,
+    'posture': POSTURE_MARKERS,
+    'precedent': {prec['case']: prec['keywords']
+                  for precs in PRECEDENTS.values() for prec in precs},
+    'justice': {justice_id: justice['keywords'] for justice_id, justice in JUSTICES.items()}
+}, whole_words=('justice',))
+
+
+# Precomputed question lookup for every justice and issue combination
+JUSTICE_REGISTRY = JusticeRegistry(ISSUE_KEYWORDS)
+
+# Justice x feature weights for vote prediction (one matrix product per batch)
+VOTE_MODEL = VoteModel(ISSUE_KEYWORDS)
+
+# Precedent lookup: an external corpus built by precedent_store.py when
+# PRECEDENT_DB is set (opened lazily, mmap-shared across workers), otherwise
+# an inverted index over the table above, built once at startup
+PRECEDENT_DB = os.environ.get('PRECEDENT_DB')
+PRECEDENT_INDEX = PrecedentStore(PRECEDENT_DB) if PRECEDENT_DB else PrecedentIndex(PRECEDENTS)
+
+# One bit per issue, in ISSUE_KEYWORDS order (the same bits JusticeRegistry masks use)
+Issue = IntFlag('Issue', list(ISSUE_KEYWORDS))
+
+# Shared issue flag dict for every issue set: ISSUE_FLAGS[issue_set]
+ISSUE_FLAGS = tuple(IssueFlags((issue.name, bool(mask & issue)) for issue in Issue)
+                    for mask in range(1 << len(Issue)))
+
+DEFAULT_PRECEDENT = Precedent(
+    case='Marbury v. Madison, 5 U.S. 137 (1803)',
+    url='https://supreme.justia.com/cases/federal/us/5/137/',
+    relevance='Foundational judicial review authority',
+    risk='low',
+    score=0.0
+)
+
+
+def _build_risks(full_record: bool, emergency: bool) -> tuple:
+    return (
+        Risk('Vehicle Integrity', 'low' if full_record else 'medium', 'High' if full_record else 'Limited data'),
+        Risk('Circuit Split Quality', 'medium', 'Requires external verification'),
+        Risk('Preservation', 'low' if full_record else 'medium', 'Check full record'),
+        Risk('Mootness Risk', 'high' if emergency else 'low', 'Based on posture')
+    )
+
+
+def _build_traps(standing: bool, racial_predominance: bool) -> tuple:
+    traps = []
+    
+    if standing:
+        traps.append(Trap('trap', 'Addressing merits extensively while leaving standing vulnerable to attack'))
+        traps.append(Trap('counter', 'Lead with concrete, particularized injury demonstration before reaching merits'))
+    
+    if racial_predominance:
+        traps.append(Trap('trap', 'Conceding that race "predominated" while relying solely on VRA compliance as compelling interest'))
+        traps.append(Trap('counter', 'Contest predomination finding; argue traditional redistricting criteria drove map design'))
+    
+    # Default traps
+    if len(traps) < 2:
+        traps.append(Trap('trap', 'Over-relying on circuit split without demonstrating conflict maturity'))
+        traps.append(Trap('counter', 'Document specific contradictory holdings with parallel fact patterns'))
+    
+    return tuple(traps[:4])  # Limit to 4
+
+
+# Every overall risk level and DIG risk assess_risk can return (outcomes keys its tables off these)
+RISK_LEVELS = ('CAUTION', 'CRITICAL')
+DIG_RISKS = ('Low', 'Medium', 'High')
+
+# Risk rows depend only on (tier A, emergency posture); traps only on two issue tests
+RISK_TABLES = {(full, emergency): _build_risks(full, emergency) for full in (False, True) for emergency in (False, True)}
+TRAP_TABLES = {(standing, racial): _build_traps(standing, racial) for standing in (False, True) for racial in (False, True)}
+
+
+# ========================================
+# Analysis Pipeline
+# ========================================
+
+def run_analysis(text: str, posture: str, docket: str, scan=None, terms=None) -> Analysis:
+    """
+    Run the full analysis pipeline (everything but title and timestamp).
+    Incremental callers pass the merged keyword scan and precedent query terms.
+    """
+    # Keyword lookups are lazy; each stage searches only the keywords it needs
+    if scan is None:
+        with metrics.timer('scan'):
+            scan = SCANNER.scan(text)
+    
+    # Detect posture if auto
+    if posture == 'auto':
+        with metrics.timer('posture'):
+            posture = detect_posture(text, scan)
+    
+    # Classify input tier
+    with metrics.timer('tier'):
+        tier = classify_tier(text, docket)
+    
+    # Extract legal issues (one shared flag dict per issue set)
+    with metrics.timer('issues'):
+        issues = ISSUE_FLAGS[extract_issue_set(text, scan)]
+    
+    # Find relevant precedents
+    with metrics.timer('precedents'):
+        precedents = find_precedents(issues, text, terms)
+    
+    # Generate risk assessment
+    with metrics.timer('risk'):
+        risk_assessment = assess_risk(text, issues, tier, posture)
+    
+    # Generate strategic traps
+    with metrics.timer('traps'):
+        traps = generate_traps(issues, posture)
+    
+    # Generate justice questions from the highest-pressure Justices
+    with metrics.timer('questions'):
+        keyword_hits = JUSTICE_REGISTRY.keyword_hits(scan.keyword_counts('justice'))
+        justice_questions = generate_justice_questions(issues, posture, keyword_hits)
+
+    # Predict the vote from each Justice's lean on the brief's issues and keywords
+    with metrics.timer('vote'):
+        vote_prediction = VOTE_MODEL.predict_one(issues, keyword_hits)
+    
+    return {
+        'tier': tier,
+        'posture': posture,
+        'riskLevel': risk_assessment['level'],
+        'digRisk': risk_assessment['dig_risk'],
+        'primaryObstacle': risk_assessment['primary_obstacle'],
+        'rewriteDirective': risk_assessment['rewrite_directive'],
+        'precedents': precedents,
+        'traps': traps,
+        'risks': risk_assessment['risks'],
+        'justiceQuestions': justice_questions,
+        'keywordHits': keyword_hits,
+        'votePrediction': vote_prediction,
+        'issues': issues
+    }
+
+
+def detect_posture(text: str, scan=None) -> str:
+    """Detect case posture from text content"""
+    scan = scan or SCANNER.scan(text)
+    return scan.first_label('posture', default='cert')
+
+
+def classify_tier(text: str, docket: str) -> str:
+    """Classify input tier based on available materials"""
+    text_len = len(text)
+    
+    if text_len > 10000:
+        return 'A'
+    elif text_len > 1000 or text:
+        return 'B'
+    elif docket:
+        return 'C'
+    return 'C'
+
+
+def extract_issues(text: str, scan=None) -> IssueFlags:
+    """Extract legal issues from case text (a shared, read-only flag dict)"""
+    return ISSUE_FLAGS[extract_issue_set(text, scan)]
+
+
+def extract_issue_set(text: str, scan=None) -> Issue:
+    """The issues raised by the case text, as Issue bits"""
+    scan = scan or SCANNER.scan(text)
+    mask = 0
+    for issue, present in scan.flags('issue').items():
+        if present:
+            mask |= Issue[issue].value
+    return Issue(mask)
+
+
+def find_precedents(issues: dict, text: str = '', terms=None) -> list:
+    """Rank precedents by relevance to the brief text (or its query terms) and identified issues"""
+    if terms is None:
+        terms = PRECEDENT_INDEX.query_terms(text) if text else {}
+    
+    relevant = [Precedent(prec['case'], prec['url'], prec['holding'], 'medium', round(score, 3))
+                for score, prec in PRECEDENT_INDEX.search(terms, issues, limit=6)]
+    
+    # Default precedent if none found
+    return relevant or [DEFAULT_PRECEDENT]
+
+
+def assess_risk(text: str, issues: dict, tier: str, posture: str) -> dict:
+    """Generate comprehensive risk assessment"""
+    
+    # Determine overall risk level
+    high_risk_issues = ['standing', 'separation_of_powers']
+    has_high_risk = any(issues.get(issue) for issue in high_risk_issues)
+    
+    if tier == 'C':
+        risk_level = 'CAUTION'
+        primary_obstacle = 'Insufficient materials for complete analysis'
+        rewrite = 'Upload full petition and lower court decision for comprehensive evaluation'
+    elif has_high_risk:
+        risk_level = 'CRITICAL'
+        primary_obstacle = 'Potential jurisdictional or structural defect identified'
+        rewrite = 'Address threshold issues before merits arguments'
+    else:
+        risk_level = 'CAUTION'
+        primary_obstacle = 'Standard appellate risks present; vehicle quality uncertain'
+        rewrite = 'Strengthen circuit split documentation and vehicle presentation'
+    
+    # Individual risk categories (shared rows)
+    risks = RISK_TABLES[(tier == 'A', posture == 'emergency')]
+    
+    # DIG risk
+    dig_risk = 'Medium'
+    if tier == 'C' or issues.get('standing'):
+        dig_risk = 'High'
+    elif tier == 'A' and not has_high_risk:
+        dig_risk = 'Low'
+    
+    return {
+        'level': risk_level,
+        'dig_risk': dig_risk,
+        'primary_obstacle': primary_obstacle,
+        'rewrite_directive': rewrite,
+        'risks': risks
+    }
+
+
+def generate_traps(issues: dict, posture: str) -> tuple:
+    """Generate strategic traps and counters (shared rows)"""
+    standing = bool(issues.get('standing'))
+    racial_predominance = bool(issues.get('voting_rights') and issues.get('equal_protection'))
+    return TRAP_TABLES[(standing, racial_predominance)]
+
+
+def generate_justice_questions(issues: dict, posture: str, keyword_hits: dict = None) -> list:
+    """Generate simulated questions from the Justices expected to press hardest"""
+    return JUSTICE_REGISTRY.panel(issues, keyword_hits)
+
+
+def generate_single_question(justice_id: str, justice: dict, issues: dict, posture: str) -> dict:
+    """Generate a single Justice's question based on context"""
+    return JUSTICE_REGISTRY.question(justice_id, issues)
@@ -0,0 +1,120 @@
+"""
+SCOTUS Strategic Engine - Incremental Analysis
+Per-paragraph scan state for briefs that are edited and re-analyzed
+
+A document is split into paragraphs on blank lines, as the brief viewer
+renders it. Keyword and token counts are kept for every distinct paragraph
+and as running totals, so a re-analysis scans only paragraphs whose text is
+new and subtracts those that disappeared. No keyword or token spans a blank
+line, so the totals always equal a scan of the whole text.
+"""
+
+import time
+import threading
+from collections import Counter, OrderedDict
+
+from scanner import ScanResult
+
+PARAGRAPH_SEPARATOR = '\n\n'
+
+
+def _add(totals: dict, counts: dict, times: int):
+    for key, count in counts.items():
+        totals[key] = totals.get(key, 0) + count * times
+
+
+def _subtract(totals: dict, counts: dict, times: int):
+    for key, count in counts.items():
+        remaining = totals[key] - count * times
+        if remaining > 0:
+            totals[key] = remaining
+        else:
+            del totals[key]
+
+
+class DocumentState:
+    """Paragraph multiset, per-paragraph counts and their running totals"""
+
+    def __init__(self):
+        self.paragraphs = Counter()   # paragraph text -> occurrences
+        self.counts = {}              # paragraph text -> (keyword counts, token counts)
+        self.keyword_counts = {}
+        self.token_counts = Counter()
+        self.lock = threading.Lock()
+        self.touched = time.monotonic()
+
+
+class DocumentSessions:
+    """
+    LRU of DocumentState by client-supplied document id, with idle expiry.
+
+    State depends only on the text submitted, so a reused or guessed id can
+    cost a rescan but never changes another document's results.
+    """
+
+    def __init__(self, scanner, tokenize, select_terms, max_documents: int = 32, ttl: float = 1800):
+        self.scanner = scanner
+        self.tokenize = tokenize
+        self.select_terms = select_terms
+        self.max_documents = max_documents
+        self.ttl = ttl
+        self._documents = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _document(self, document_id: str) -> DocumentState:
+        now = time.monotonic()
+        with self._lock:
+            # Entries are in least-recently-used order, so idle ones are at the front
+            while self._documents and now - next(iter(self._documents.values())).touched > self.ttl:
+                self._documents.popitem(last=False)
+
+            state = self._documents.pop(document_id, None) or DocumentState()
+            self._documents[document_id] = state
+            state.touched = now
+            while len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+            return state
+
+    def update(self, document_id: str, text: str):
+        """
+        Bring a document's state up to `text`, scanning only new paragraphs.
+        Returns (merged ScanResult, precedent query terms, stats).
+        """
+        state = self._document(document_id)
+        paragraphs = Counter(text.split(PARAGRAPH_SEPARATOR))
+
+        with state.lock:
+            removed = state.paragraphs - paragraphs
+            added = paragraphs - state.paragraphs
+            rescanned = 0
+
+            for paragraph, times in removed.items():
+                keyword_counts, token_counts = state.counts[paragraph]
+                _subtract(state.keyword_counts, keyword_counts, times)
+                _subtract(state.token_counts, token_counts, times)
+                if paragraph not in paragraphs:
+                    del state.counts[paragraph]
+
+            for paragraph, times in added.items():
+                counts = state.counts.get(paragraph)
+                if counts is None:
+                    counts = state.counts[paragraph] = (self.scanner.scan(paragraph).counts,
+                                                        Counter(self.tokenize(paragraph)))
+                    rescanned += 1
+                _add(state.keyword_counts, counts[0], times)
+                _add(state.token_counts, counts[1], times)
+
+            state.paragraphs = paragraphs
+            scan = ScanResult(self.scanner, counts=dict(state.keyword_counts))
+            terms = self.select_terms(state.token_counts)
+
+        stats = {
+            'paragraphs': sum(paragraphs.values()),
+            'rescanned': rescanned,
+            'removed': sum(removed.values())
+        }
+        return scan, terms, stats
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'documents': len(self._documents), 'maxDocuments': self.max_documents}
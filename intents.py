@@ -0,0 +1,109 @@
+"""
+SCOTUS Strategic Engine - Chat Intent Router
+Resolves a chat message to an intent in one pass over its tokens
+
+Each intent in the table has trigger phrases and descriptive terms. Phrases
+are compiled into a token trie and terms into an inverted index, once. A
+message is tokenized once; at every token the trie is walked for phrases
+starting there and the index adds that token's share of each intent's
+terms. Terms shared by more than MAX_TERM_INTENTS intents say little about
+which one is meant and are left out of the index, so resolving costs at
+most O(tokens x (longest phrase + MAX_TERM_INTENTS)), however many intents
+the table holds.
+
+An intent with a phrase hit wins over overlap alone, and phrase hits are
+ranked by table order (earlier entries take priority). Without a phrase
+hit, the intent sharing the largest fraction of its terms with the
+message wins, if that fraction reaches MIN_OVERLAP.
+"""
+
+from collections import Counter
+
+from precedent_index import STOPWORDS, TOKEN_RE
+
+# Fraction of an intent's terms a message must contain to match without a phrase
+MIN_OVERLAP = 0.5
+
+# Terms shared by more intents than this are not scored (like stopwords)
+MAX_TERM_INTENTS = 8
+
+# Trie node key holding the intents whose phrase ends at that node
+_END = ''
+
+
+def _tokens(text: str) -> list:
+    return TOKEN_RE.findall(text.lower())
+
+
+class IntentRouter:
+    """
+    Intent table compiled for single-pass resolution.
+
+    `intents` is a sequence of dicts with 'phrases' and 'terms' (lists of
+    strings) plus any fields the handlers need; resolve() returns the
+    matching dict itself.
+    """
+
+    def __init__(self, intents):
+        self.intents = tuple(intents)
+        self._trie = {}
+        intent_terms = []
+        term_counts = Counter()
+
+        for index, intent in enumerate(self.intents):
+            for phrase in intent.get('phrases', ()):
+                node = self._trie
+                for token in _tokens(phrase):
+                    node = node.setdefault(token, {})
+                if node is not self._trie:
+                    node.setdefault(_END, []).append(index)
+
+            terms = {token for term in intent.get('terms', ())
+                     for token in _tokens(term) if token not in STOPWORDS}
+            intent_terms.append(terms)
+            term_counts.update(terms)
+
+        term_intents = {}
+        for index, terms in enumerate(intent_terms):
+            terms = [token for token in terms if term_counts[token] <= MAX_TERM_INTENTS]
+            for token in terms:
+                term_intents.setdefault(token, []).append((index, 1.0 / len(terms)))
+        self._term_intents = {token: tuple(entries) for token, entries in term_intents.items()}
+
+    def match(self, message: str) -> tuple:
+        """Return (phrase hit intent indexes, intent index -> term overlap) for a message"""
+        tokens = _tokens(message)
+        phrase_hits = set()
+        overlap = {}
+        seen = set()
+
+        for position, token in enumerate(tokens):
+            node = self._trie.get(token)
+            offset = position + 1
+            while node is not None:
+                phrase_hits.update(node.get(_END, ()))
+                if offset == len(tokens):
+                    break
+                node = node.get(tokens[offset])
+                offset += 1
+
+            if token not in seen:
+                seen.add(token)
+                for index, weight in self._term_intents.get(token, ()):
+                    overlap[index] = overlap.get(index, 0.0) + weight
+
+        return phrase_hits, overlap
+
+    def resolve(self, message: str):
+        """The intent dict for a message, or None if nothing matches"""
+        phrase_hits, overlap = self.match(message)
+        if phrase_hits:
+            return self.intents[min(phrase_hits)]
+
+        best = max(overlap.items(), key=lambda entry: (entry[1], -entry[0]), default=None)
+        if best is None or best[1] < MIN_OVERLAP - 1e-9:
+            return None
+        return self.intents[best[0]]
+
+    def __len__(self) -> int:
+        return len(self.intents)
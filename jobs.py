@@ -0,0 +1,270 @@
+"""
+SCOTUS Strategic Engine - Background Jobs
+Bounded queue for uploads and analyses that outlive a request
+
+submit() returns a Job at once; a few worker threads run queued jobs in
+order (their CPU-bound work goes on to the PDF, OCR and analysis process
+pools), and clients follow a job's status, progress and result by id.
+
+Backpressure: at most `max_queued` jobs wait, and queued plus running jobs
+hold at most `max_bytes` of payload between them. submit() raises QueueFull
+past either limit instead of buffering more. Finished jobs are kept for
+`ttl` seconds, and at most `max_jobs` are retained, so clients can collect
+results. Retained results (measured as serialized JSON) are also held to
+`max_result_bytes`: past it, the oldest finished jobs are evicted first, so
+a burst of large uploads cannot pin their text for the whole TTL.
+
+Jobs run in the process that accepted them. With several server processes,
+pass a shared store (e.g. sessions.RedisSessionBackend) so every process
+can report any job: snapshots are published to it as the job progresses.
+Publishing is best effort; a store outage never fails a submit or a job.
+"""
+
+import time
+import secrets
+import threading
+from collections import OrderedDict, deque
+
+from serialization import encode
+
+# Minimum seconds between progress snapshots published to a shared store
+PUBLISH_INTERVAL = 0.5
+
+FINISHED = ('done', 'error')
+
+
+class QueueFull(Exception):
+    """Raised by JobQueue.submit when the queue is at its depth or byte limit"""
+
+
+class Job:
+    """One queued unit of work and its observable state"""
+
+    def __init__(self, job_id: str, kind: str, run, size: int):
+        self.id = job_id
+        self.kind = kind
+        self.size = size
+        self.status = 'queued'
+        self.progress = {}
+        self.result = None
+        self.result_size = 0
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.version = 0
+        self._run = run
+        self._changed = threading.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINISHED
+
+    def update(self, **progress):
+        """Merge progress fields (called by the job's run function) and wake watchers"""
+        with self._changed:
+            self.progress = {**self.progress, **progress}
+            self.version += 1
+            self._changed.notify_all()
+
+    def _set(self, **fields):
+        with self._changed:
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self.version += 1
+            self._changed.notify_all()
+
+    def wait(self, version: int, timeout: float) -> int:
+        """Block until the job changes from `version` (or timeout); returns the current version"""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+    def to_dict(self, include_result: bool = True) -> dict:
+        with self._changed:
+            snapshot = {
+                'jobId': self.id,
+                'kind': self.kind,
+                'status': self.status,
+                'progress': self.progress,
+                'created': self.created,
+                'started': self.started,
+                'finished': self.finished
+            }
+            if self.error is not None:
+                snapshot['error'] = self.error
+            if include_result and self.status == 'done':
+                snapshot['result'] = self.result
+            return snapshot
+
+
+class JobQueue:
+    """
+    FIFO of jobs run by `workers` threads (started on first submit).
+    `run` callables take the Job, may call job.update(...) to report
+    progress, and return the result (or raise, failing the job).
+    """
+
+    def __init__(self, workers: int = 2, max_queued: int = 32, max_bytes: int = 512 * 1024 * 1024,
+                 max_jobs: int = 1000, ttl: float = 3600, shared=None,
+                 max_result_bytes: int = 256 * 1024 * 1024):
+        self.workers = max(1, workers)
+        self.max_queued = max_queued
+        self.max_bytes = max_bytes
+        self.max_jobs = max_jobs
+        self.max_result_bytes = max_result_bytes
+        self.ttl = ttl
+        self.shared = shared
+        self._jobs = OrderedDict()  # job id -> Job, in submission order
+        self._pending = deque()
+        self._held_bytes = 0
+        self._result_bytes = 0
+        self._running = 0
+        self._threads = []
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self.publish_errors = 0
+
+    def submit(self, kind: str, run, size: int = 0) -> Job:
+        """Queue a job; raises QueueFull when the depth or byte limit would be exceeded"""
+        with self._ready:
+            self._prune(time.time())
+            if len(self._pending) >= self.max_queued or self._held_bytes + size > self.max_bytes:
+                self.rejected += 1
+                raise QueueFull(f'{len(self._pending)} jobs queued, {self._held_bytes} bytes held')
+
+            job = Job(secrets.token_urlsafe(16), kind, run, size)
+            self._jobs[job.id] = job
+            self._pending.append(job)
+            self._held_bytes += size
+            if len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work, name=f'job-worker-{len(self._threads)}', daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._ready.notify()
+        self._publish(job, force=True)
+        return job
+
+    def get(self, job_id: str):
+        """The Job if it runs in this process, else None"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def position(self, job: Job):
+        """Jobs ahead of a queued job (0 = next to run), or None once it has started"""
+        with self._lock:
+            for index, pending in enumerate(self._pending):
+                if pending is job:
+                    return index
+        return None
+
+    def snapshot(self, job_id: str, include_result: bool = True):
+        """Status dict for a job in this process or, via the shared store, any other; None if unknown"""
+        job = self.get(job_id)
+        if job is None:
+            return self.shared.get(job_id) if self.shared is not None else None
+        snapshot = job.to_dict(include_result)
+        if job.status == 'queued':
+            snapshot['position'] = self.position(job)
+        return snapshot
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'queued': len(self._pending),
+                'running': self._running,
+                'workers': self.workers,
+                'maxQueued': self.max_queued,
+                'heldBytes': self._held_bytes,
+                'maxBytes': self.max_bytes,
+                'retained': len(self._jobs),
+                'resultBytes': self._result_bytes,
+                'maxResultBytes': self.max_result_bytes,
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'publishErrors': self.publish_errors
+            }
+
+    def _work(self):
+        while True:
+            with self._ready:
+                while not self._pending:
+                    self._ready.wait()
+                job = self._pending.popleft()
+                self._running += 1
+
+            job._set(status='running', started=time.time())
+            self._publish(job, force=True)
+            watcher = threading.Thread(target=self._publish_progress, args=(job,), daemon=True) \
+                if self.shared is not None else None
+            if watcher:
+                watcher.start()
+
+            size = 0
+            try:
+                result = job._run(job)
+                size = len(encode(result))
+                job._set(status='done', result=result, finished=time.time())
+            except Exception as e:
+                job._set(status='error', error=str(e), finished=time.time())
+            finally:
+                job._run = None  # drop the payload the run function closed over
+                with self._lock:
+                    self._running -= 1
+                    self._held_bytes -= job.size
+                    if job.status == 'done':
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+                    # Counted under the lock: a concurrent prune may already have dropped the job
+                    if job.id in self._jobs:
+                        job.result_size = size
+                        self._result_bytes += size
+                        self._prune(time.time(), keep=job)
+            self._publish(job, force=True)
+
+    def _publish_progress(self, job: Job):
+        """Publish a running job's progress to the shared store, at most every PUBLISH_INTERVAL"""
+        version = job.version
+        while not job.done:
+            version = job.wait(version, timeout=None)
+            if not job.done:
+                self._publish(job)
+                time.sleep(PUBLISH_INTERVAL)
+
+    def _publish(self, job: Job, force: bool = False):
+        if self.shared is None or (job.done and not force):
+            return
+        try:
+            self.shared.set(job.id, job.to_dict())
+        except Exception as e:
+            # The job is queued or running either way; only remote status lags
+            with self._lock:
+                self.publish_errors += 1
+                first = self.publish_errors == 1
+            if first:
+                print(f"Job status publish failed ({e}). Other processes may not see job progress.")
+
+    def _prune(self, now: float, keep: Job = None):
+        """
+        Drop finished jobs past their TTL, then the oldest finished beyond
+        max_jobs or max_result_bytes (lock held). `keep`, a job that just
+        finished, is never evicted for size so its client can collect it.
+        """
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.done and now - job.finished > self.ttl]:
+            self._drop(job_id)
+        if len(self._jobs) >= self.max_jobs:
+            for job_id in [job_id for job_id, job in self._jobs.items() if job.done][:len(self._jobs) - self.max_jobs + 1]:
+                self._drop(job_id)
+        if self._result_bytes > self.max_result_bytes:
+            for job_id in [job_id for job_id, job in self._jobs.items() if job.done and job is not keep]:
+                if self._result_bytes <= self.max_result_bytes:
+                    break
+                self._drop(job_id)
+
+    def _drop(self, job_id: str):
+        self._result_bytes -= self._jobs.pop(job_id).result_size
@@ -0,0 +1,287 @@
+"""
+SCOTUS Strategic Engine - Justice Registry
+Justice profiles, question templates and pressure notes, loaded once
+"""
+
+from math import log1p
+from types import MappingProxyType
+
+from results import JusticeQuestion
+
+# Justice profiles for simulation
+JUSTICES = {
+    'roberts': {
+        'name': 'Chief Justice Roberts',
+        'focus': 'Institutionalism & Narrow Rulings',
+        'style': 'Seeks incremental, consensus-building decisions',
+        'keywords': ['institutional', 'narrow', 'minimalist', 'precedent']
+    },
+    'thomas': {
+        'name': 'Justice Thomas',
+        'focus': 'Originalism & Constitutional Text',
+        'style': 'Questions structural precedents; emphasizes original meaning',
+        'keywords': ['original', 'text', 'constitution', 'stare decisis']
+    },
+    'alito': {
+        'name': 'Justice Alito',
+        'focus': 'Textual Analysis & Practical Consequences',
+        'style': 'Probes real-world impacts and statutory interpretation',
+        'keywords': ['practical', 'consequences', 'statutory', 'text']
+    },
+    'sotomayor': {
+        'name': 'Justice Sotomayor',
+        'focus': 'Civil Rights & Practical Impact',
+        'style': 'Focuses on effects on marginalized communities',
+        'keywords': ['rights', 'impact', 'fairness', 'equality']
+    },
+    'kagan': {
+        'name': 'Justice Kagan',
+        'focus': 'Pragmatic Interpretation & Workability',
+        'style': 'Tests practical implementation of legal rules',
+        'keywords': ['workable', 'practical', 'implementation', 'pragmatic']
+    },
+    'gorsuch': {
+        'name': 'Justice Gorsuch',
+        'focus': 'Textualism & Separation of Powers',
+        'style': 'Strict adherence to statutory text and constitutional structure',
+        'keywords': ['text', 'separation', 'powers', 'structure']
+    },
+    'kavanaugh': {
+        'name': 'Justice Kavanaugh',
+        'focus': 'Precedent & Moderate Application',
+        'style': 'Weighs stare decisis carefully; seeks middle-ground',
+        'keywords': ['precedent', 'stare decisis', 'moderate', 'reliance']
+    },
+    'barrett': {
+        'name': 'Justice Barrett',
+        'focus': 'Originalism & Doctrinal Clarity',
+        'style': 'Precise doctrinal questions; historical analysis',
+        'keywords': ['doctrine', 'original', 'historical', 'clarity']
+    },
+    'jackson': {
+        'name': 'Justice Jackson',
+        'focus': 'Historical Context & Equity',
+        'style': 'Emphasizes historical background and fairness',
+        'keywords': ['history', 'context', 'equity', 'purpose']
+    }
+}
+
+# Issue-specific questions per Justice; 'default' applies when no listed issue is present
+QUESTION_TEMPLATES = {
+    'thomas': {
+        'voting_rights': 'Where in the constitutional text does Congress derive authority to mandate race-conscious districting? Isn\'t Section 2 of the VRA itself constitutionally suspect under the original public meaning of the Fifteenth Amendment?',
+        'separation_of_powers': 'What is the original understanding of "executive Power" in Article II? Doesn\'t the removal restriction here conflict with the Constitution\'s vesting of that power in the President?',
+        'default': 'What is the original public meaning of the constitutional provision at issue, and how does that constrain our analysis?'
+    },
+    'kagan': {
+        'voting_rights': 'If we rule for you, what exactly should states do when facing a Section 2 violation? Must they wait for contempt before drawing remedial maps?',
+        'standing': 'Walk me through how your proposed standing rule would work in practice. What cases does it let in, and what does it keep out?',
+        'default': 'Give me a workable test. How would lower courts actually apply this standard?'
+    },
+    'barrett': {
+        'voting_rights': 'Does VRA compliance automatically constitute a compelling interest, or must we engage in additional balancing? What\'s the doctrinal framework?',
+        'first_amendment': 'What level of scrutiny applies here, and what\'s the precise test? I want clean doctrine.',
+        'default': 'Help me understand the doctrinal rule you want us to announce and how it fits existing precedent.'
+    },
+    'jackson': {
+        'voting_rights': 'Given the specific history of voter disenfranchisement in this jurisdiction, isn\'t there something dissonant about using Equal Protection to prevent majority-Black districts?',
+        'equal_protection': 'What historical context should inform our interpretation? How does the purpose behind this provision guide us?',
+        'default': 'What historical background are we overlooking that should inform our reading here?'
+    },
+    'roberts': {
+        'default': 'Is there a narrow way to decide this case without reaching the broader constitutional question you\'re pressing?'
+    },
+    'alito': {
+        'default': 'What are the real-world consequences of your proposed rule? Who wins and who loses?'
+    },
+    'sotomayor': {
+        'default': 'How does your position affect ordinary people? Have you considered the on-the-ground impact?'
+    },
+    'gorsuch': {
+        'default': 'Point me to the statutory text. Where are the words that support your reading?'
+    },
+    'kavanaugh': {
+        'default': 'What about stare decisis? What reliance interests would we disrupt by ruling your way?'
+    }
+}
+
+# How each Justice's questioning pressures the advocate
+PRESSURES = {
+    'thomas': 'Challenges modern interpretations against original constitutional framework',
+    'kagan': 'Forces articulation of workable, real-world legal standard',
+    'barrett': 'Demands clean legal test that harmonizes with existing doctrine',
+    'jackson': 'Invokes purposive/historical analysis to destabilize formalist arguments',
+    'roberts': 'Seeks narrow resolution; tests for minimalist off-ramps',
+    'alito': 'Probes practical consequences and implementation difficulties',
+    'sotomayor': 'Emphasizes human impact and fairness concerns',
+    'gorsuch': 'Insists on textual grounding for every proposition',
+    'kavanaugh': 'Weighs reliance interests and precedential stability'
+}
+
+DEFAULT_QUESTION = 'How do you respond to the strongest version of your opponent\'s argument?'
+DEFAULT_PRESSURE = 'Tests the logical limits of the argument'
+
+# Issues each Justice is expected to press hardest (issue -> weight); templated issues weigh 1.0
+ISSUE_AFFINITY = {
+    'roberts': {'standing': 1.0, 'separation_of_powers': 0.5, 'voting_rights': 0.5},
+    'thomas': {'voting_rights': 1.0, 'separation_of_powers': 1.0, 'commerce_clause': 0.5},
+    'alito': {'first_amendment': 0.5, 'preemption': 0.5, 'due_process': 0.5},
+    'sotomayor': {'equal_protection': 0.5, 'due_process': 0.5, 'voting_rights': 0.5},
+    'kagan': {'voting_rights': 1.0, 'standing': 1.0, 'separation_of_powers': 0.5},
+    'gorsuch': {'separation_of_powers': 0.5, 'due_process': 0.5, 'preemption': 0.5},
+    'kavanaugh': {'preemption': 0.5, 'commerce_clause': 0.5, 'voting_rights': 0.5},
+    'barrett': {'voting_rights': 1.0, 'first_amendment': 1.0, 'standing': 0.5},
+    'jackson': {'voting_rights': 1.0, 'equal_protection': 1.0, 'due_process': 0.5}
+}
+
+# Weight of each profile keyword hit, applied to log1p(count) so long briefs don't swamp issues
+KEYWORD_WEIGHT = 0.25
+
+# Justices whose questions appear in every analysis, chosen for distinct analytical
+# approaches; the analysis panel is the top-scoring four, with ties going to these
+ANALYSIS_PANEL = ('thomas', 'kagan', 'barrett', 'jackson')
+
+
+def _freeze(value):
+    """Recursively convert dicts to read-only mappings and lists to tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+JUSTICES = _freeze(JUSTICES)
+QUESTION_TEMPLATES = _freeze(QUESTION_TEMPLATES)
+PRESSURES = _freeze(PRESSURES)
+ISSUE_AFFINITY = _freeze(ISSUE_AFFINITY)
+
+
+class JusticeRegistry:
+    """
+    Precomputed question lookup for every (justice, issue set) pair.
+
+    Issue sets are encoded as bitmasks over `issue_order`, which also sets
+    precedence when several templated issues are present, so each lookup is
+    one mask computation and a table index.
+
+    Pressure scores rank the bench: each Justice's issue affinity for the
+    mask (precomputed) plus KEYWORD_WEIGHT * log1p(hits) for every profile
+    keyword found in the brief, accumulated for all nine in one pass over
+    the hits.
+    """
+
+    def __init__(self, issue_order):
+        self.issue_order = tuple(issue_order)
+        self.issue_bits = {issue: 1 << i for i, issue in enumerate(self.issue_order)}
+        self.justice_ids = tuple(JUSTICES)
+
+        # tables[mask][justice_id] -> question entry; bench[mask] -> all nine in order
+        self.tables = []
+        self.bench_tables = []
+        for mask in range(1 << len(self.issue_order)):
+            present = [issue for issue in self.issue_order if mask & self.issue_bits[issue]]
+            row = {justice_id: self._build(justice_id, present) for justice_id in self.justice_ids}
+            self.tables.append(MappingProxyType(row))
+            self.bench_tables.append(tuple(row.values()))
+        self.tables = tuple(self.tables)
+        self.bench_tables = tuple(self.bench_tables)
+
+        # issue_scores[mask] -> affinity of each justice, in seniority order
+        self.issue_scores = tuple(
+            tuple(sum(weight for issue, weight in ISSUE_AFFINITY.get(justice_id, {}).items()
+                      if mask & self.issue_bits.get(issue, 0))
+                  for justice_id in self.justice_ids)
+            for mask in range(1 << len(self.issue_order))
+        )
+
+        # keyword -> indexes of the justices whose profile lists it
+        keyword_justices = {}
+        for index, justice_id in enumerate(self.justice_ids):
+            for keyword in JUSTICES[justice_id]['keywords']:
+                keyword_justices.setdefault(keyword.lower(), []).append(index)
+        self.keyword_justices = MappingProxyType({kw: tuple(indexes) for kw, indexes in keyword_justices.items()})
+
+        # Tie-break order for the analysis panel: panel members first, then seniority
+        self.panel_rank = tuple(ANALYSIS_PANEL.index(justice_id) if justice_id in ANALYSIS_PANEL
+                                else len(ANALYSIS_PANEL) + index
+                                for index, justice_id in enumerate(self.justice_ids))
+
+    def _build(self, justice_id: str, present: list):
+        justice = JUSTICES[justice_id]
+        templates = QUESTION_TEMPLATES.get(justice_id, {'default': DEFAULT_QUESTION})
+        question = templates.get('default', '')
+        for issue in present:
+            if issue in templates:
+                question = templates[issue]
+                break
+        return MappingProxyType({
+            'justice': justice_id,
+            'name': justice['name'],
+            'focus': justice['focus'],
+            'question': question,
+            'pressure': PRESSURES.get(justice_id, DEFAULT_PRESSURE)
+        })
+
+    def mask(self, issues: dict) -> int:
+        """Bitmask of the present issues; unknown issue names are ignored"""
+        bits = self.issue_bits
+        mask = 0
+        for issue, is_present in issues.items():
+            if is_present and issue in bits:
+                mask |= bits[issue]
+        return mask
+
+    def question(self, justice_id: str, issues: dict) -> dict:
+        """One Justice's question for the given issue flags"""
+        return dict(self.tables[self.mask(issues)][justice_id])
+
+    def questions(self, justice_ids, issues: dict) -> list:
+        """Questions from several Justices, computing the issue mask once"""
+        row = self.tables[self.mask(issues)]
+        return [dict(row[justice_id]) for justice_id in justice_ids]
+
+    def bench(self, issues: dict) -> list:
+        """Questions from all nine Justices, in seniority order"""
+        return [dict(entry) for entry in self.bench_tables[self.mask(issues)]]
+
+    def keyword_hits(self, counts: dict) -> dict:
+        """Restrict keyword hit counts (e.g. ScanResult.keyword_counts('justice')) to profile keywords"""
+        return {kw: count for kw, count in counts.items() if kw in self.keyword_justices and count > 0}
+
+    def scores(self, mask: int, keyword_hits: dict) -> list:
+        """Pressure score of every Justice, in seniority order"""
+        scores = list(self.issue_scores[mask])
+        for keyword, count in keyword_hits.items():
+            indexes = self.keyword_justices.get(keyword)
+            if indexes and count > 0:
+                weight = KEYWORD_WEIGHT * log1p(count)
+                for index in indexes:
+                    scores[index] += weight
+        return scores
+
+    def ranked_bench(self, issues: dict, keyword_hits: dict = None) -> list:
+        """All nine Justices' questions, highest expected pressure first"""
+        mask = self.mask(issues)
+        keyword_hits = keyword_hits or {}
+        scores = self.scores(mask, keyword_hits)
+        order = sorted(range(len(self.justice_ids)), key=lambda i: (-round(scores[i], 6), i))
+
+        bench = []
+        for rank, index in enumerate(order, 1):
+            entry = dict(self.bench_tables[mask][index])
+            entry['rank'] = rank
+            entry['pressureScore'] = round(scores[index], 3)
+            entry['matchedKeywords'] = [kw for kw in JUSTICES[entry['justice']]['keywords']
+                                        if keyword_hits.get(kw, 0) > 0]
+            bench.append(entry)
+        return bench
+
+    def panel(self, issues: dict, keyword_hits: dict = None, size: int = len(ANALYSIS_PANEL)) -> list:
+        """Questions from the `size` highest-pressure Justices (ties favour ANALYSIS_PANEL)"""
+        mask = self.mask(issues)
+        scores = self.scores(mask, keyword_hits or {})
+        order = sorted(range(len(self.justice_ids)), key=lambda i: (-round(scores[i], 6), self.panel_rank[i]))
+
+        row = self.bench_tables[mask]
+        return [JusticeQuestion(**row[index], pressureScore=round(scores[index], 3)) for index in order[:size]]
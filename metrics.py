@@ -0,0 +1,170 @@
+"""
+SCOTUS Strategic Engine - Metrics
+Low-overhead stage timers, Server-Timing values and Prometheus exposition
+
+Set METRICS=0 to disable: timers become a shared no-op context manager and
+nothing is recorded. Metrics are per process; scrape each worker separately.
+"""
+
+import os
+import bisect
+import threading
+from time import perf_counter
+from contextlib import nullcontext
+
+ENABLED = os.environ.get('METRICS', '1') != '0'
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1e3, 1e4, 1e5, 1e6, 5e6, 1e7, 2.5e7, 5e7, 1e8)
+PAGE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2000)
+
+_NOOP = nullcontext()
+_local = threading.local()
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for _, value in labels)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + '}'
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        if not ENABLED:
+            return
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list:
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(labels)} {value}')
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+
+    def __init__(self, name: str, help_text: str, buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self._series = {}  # labels -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        if not ENABLED:
+            return
+        key = tuple(sorted(labels.items()))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> list:
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for labels, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + ('+Inf',), series):
+                    cumulative += count
+                    le = bound if bound == '+Inf' else repr(float(bound))
+                    lines.append(f'{self.name}_bucket{_format_labels(labels + (("le", le),))} {cumulative}')
+                lines.append(f'{self.name}_sum{_format_labels(labels)} {series[-1]}')
+                lines.append(f'{self.name}_count{_format_labels(labels)} {cumulative}')
+        return lines
+
+
+# ========================================
+# Registry
+# ========================================
+
+REQUESTS = Counter('scotus_http_requests_total', 'HTTP requests by route, method and status')
+REQUEST_LATENCY = Histogram('scotus_http_request_duration_seconds', 'Time to produce the response (headers) by route')
+STAGE_LATENCY = Histogram('scotus_stage_duration_seconds', 'Time spent in each analysis/upload stage')
+UPLOAD_BYTES = Histogram('scotus_upload_bytes', 'Size of uploaded PDFs', SIZE_BUCKETS)
+PDF_PAGES = Histogram('scotus_pdf_pages', 'Pages parsed per uploaded PDF', PAGE_BUCKETS)
+PAGES_PARSED = Counter('scotus_pdf_pages_parsed_total', 'PDF pages parsed')
+PAGES_OCR = Counter('scotus_pdf_pages_ocr_total', 'Scanned PDF pages sent to OCR, by result')
+
+REGISTRY = [REQUESTS, REQUEST_LATENCY, STAGE_LATENCY, UPLOAD_BYTES, PDF_PAGES, PAGES_PARSED, PAGES_OCR]
+
+
+# ========================================
+# Stage Timers
+# ========================================
+
+class _StageTimer:
+    __slots__ = ('stage', 'start')
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record_stage(self.stage, perf_counter() - self.start)
+        return False
+
+
+def timer(stage: str):
+    """Context manager that times a stage into the current request and histograms"""
+    return _StageTimer(stage) if ENABLED else _NOOP
+
+
+def record_stage(stage: str, seconds: float):
+    if not ENABLED:
+        return
+    STAGE_LATENCY.observe(seconds, stage=stage)
+    stages = getattr(_local, 'stages', None)
+    if stages is not None:
+        stages.append((stage, seconds))
+
+
+def begin_request():
+    """Start collecting stage timings for the request on this thread"""
+    if ENABLED:
+        _local.stages = []
+        _local.started = perf_counter()
+
+
+def end_request(route: str, method: str, status: int) -> str:
+    """Record the request and return its Server-Timing header value ('' if disabled)"""
+    if not ENABLED:
+        return ''
+    stages = getattr(_local, 'stages', None) or []
+    started = getattr(_local, 'started', None)
+    _local.stages = None
+
+    if started is not None:
+        total = perf_counter() - started
+        REQUEST_LATENCY.observe(total, route=route)
+        stages = stages + [('total', total)]
+    REQUESTS.inc(route=route, method=method, status=status)
+    return ', '.join(f'{stage};dur={seconds * 1000:.2f}' for stage, seconds in stages)
+
+
+def render(extra_lines: list = ()) -> str:
+    """Prometheus text exposition of all registered metrics"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    lines.extend(extra_lines)
+    return '\n'.join(lines) + '\n'
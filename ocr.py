@@ -0,0 +1,190 @@
+"""
+SCOTUS Strategic Engine - OCR Fallback
+Text for scanned PDF pages that have no text layer
+
+pdf_extract hands over pages whose text layer is empty but which carry
+images. Each such page is fingerprinted by its image data: known pages are
+answered from OCR_CACHE, the rest are recognized in a bounded process pool
+(OCR_WORKERS) by the configured backend.
+
+OCR_BACKEND selects the backend: 'tesseract' (default; needs pytesseract,
+Pillow and the tesseract binary), 'none' to disable OCR, or 'module:Class'
+for a custom OCRBackend subclass importable in the worker processes.
+"""
+
+import io
+import os
+import shutil
+import hashlib
+import importlib
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from analysis_cache import AnalysisCache
+
+try:
+    import PyPDF2
+except ImportError:
+    PyPDF2 = None
+
+try:
+    import pytesseract
+    from PIL import Image
+    TESSERACT_SUPPORT = True
+except ImportError:
+    pytesseract = None
+    TESSERACT_SUPPORT = False
+
+# ========================================
+# Configuration
+# ========================================
+
+OCR_BACKEND = os.environ.get('OCR_BACKEND', 'tesseract')
+OCR_LANG = os.environ.get('OCR_LANG', 'eng')
+OCR_WORKERS = int(os.environ.get('OCR_WORKERS', str(os.cpu_count() or 1)))
+OCR_PAGE_TIMEOUT = float(os.environ.get('OCR_PAGE_TIMEOUT', '60'))
+
+# Seconds between progress reports while a streamed upload waits on OCR
+PROGRESS_INTERVAL = float(os.environ.get('OCR_PROGRESS_INTERVAL', '2'))
+
+# Recognized text keyed by page fingerprint (set OCR_CACHE_DIR to persist to disk)
+OCR_CACHE = AnalysisCache(
+    max_entries=int(os.environ.get('OCR_CACHE_ENTRIES', '4096')),
+    max_bytes=int(os.environ.get('OCR_CACHE_BYTES', str(64 * 1024 * 1024))),
+    directory=os.environ.get('OCR_CACHE_DIR') or None
+)
+
+_pool = None
+_pool_lock = threading.Lock()
+_backends = {}
+
+
+# ========================================
+# Backends
+# ========================================
+
+class OCRBackend:
+    """Recognizes the text in a page's images; subclass for a custom engine"""
+
+    name = 'base'
+
+    @property
+    def cache_tag(self) -> str:
+        """Part of the cache key: change it when the same images would read differently"""
+        return self.name
+
+    def available(self) -> bool:
+        return True
+
+    def recognize(self, images: list) -> str:
+        """Text of one page, given its encoded images (JPEG, PNG, TIFF bytes) in drawing order"""
+        raise NotImplementedError
+
+
+class TesseractBackend(OCRBackend):
+    """Local Tesseract through pytesseract"""
+
+    name = 'tesseract'
+
+    def __init__(self, lang: str = OCR_LANG, timeout: float = OCR_PAGE_TIMEOUT):
+        self.lang = lang
+        self.timeout = timeout
+
+    @property
+    def cache_tag(self) -> str:
+        return f'{self.name}:{self.lang}'
+
+    def available(self) -> bool:
+        return TESSERACT_SUPPORT and shutil.which(pytesseract.pytesseract.tesseract_cmd) is not None
+
+    def recognize(self, images: list) -> str:
+        texts = []
+        for data in images:
+            with Image.open(io.BytesIO(data)) as image:
+                text = pytesseract.image_to_string(image, lang=self.lang, timeout=self.timeout).strip()
+            if text:
+                texts.append(text)
+        return '\n'.join(texts)
+
+
+BACKENDS = {'tesseract': TesseractBackend}
+
+
+def load_backend(spec: str):
+    """Backend for an OCR_BACKEND value, or None when OCR is disabled"""
+    if spec in ('', 'none'):
+        return None
+    if ':' in spec:
+        module, attr = spec.split(':', 1)
+        return getattr(importlib.import_module(module), attr)()
+    if spec not in BACKENDS:
+        raise ValueError(f'Unknown OCR backend {spec!r}')
+    return BACKENDS[spec]()
+
+
+def get_backend(spec: str = None):
+    """The loaded backend for spec (default OCR_BACKEND), or None if disabled or unavailable"""
+    spec = OCR_BACKEND if spec is None else spec
+    if spec not in _backends:
+        backend = load_backend(spec)
+        if backend is not None and not backend.available():
+            print(f"OCR backend {spec!r} not available. Scanned PDF pages will have no text.")
+            backend = None
+        _backends[spec] = backend
+    return _backends[spec]
+
+
+# ========================================
+# Pages
+# ========================================
+
+def page_fingerprint(page, cache_tag: str):
+    """Content hash of a page's image data, or None for pages without images"""
+    digest = hashlib.sha256(cache_tag.encode('utf-8'))
+    found = False
+    try:
+        xobjects = page['/Resources'].get('/XObject') or {}
+        for name in sorted(xobjects):
+            xobject = xobjects[name].get_object()
+            if xobject.get('/Subtype') == '/Image':
+                data = xobject.get_data()
+                digest.update(len(data).to_bytes(8, 'big'))
+                digest.update(data)
+                found = True
+    except Exception:
+        # Unreadable resources: treat as a page with nothing to recognize
+        return None
+    return digest.hexdigest() if found else None
+
+
+def page_images(page) -> list:
+    try:
+        return [image.data for image in page.images]
+    except Exception:
+        return []
+
+
+def _init_worker():
+    # One Tesseract thread per worker; the pool provides the parallelism
+    os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Lazily start the shared OCR pool"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawn, not fork: the web server that owns us is multi-threaded
+            _pool = ProcessPoolExecutor(max_workers=OCR_WORKERS, initializer=_init_worker,
+                                        mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+
+def recognize_page(path: str, index: int, spec: str) -> str:
+    """Worker entry point: OCR one page of the PDF at path"""
+    backend = get_backend(spec)
+    if backend is None:
+        return ''
+    images = page_images(PyPDF2.PdfReader(path).pages[index])
+    return backend.recognize(images) if images else ''
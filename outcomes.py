@@ -0,0 +1,113 @@
+"""
+SCOTUS Strategic Engine - Outcome Simulator
+Monte Carlo distributions over cert, DIG and merits vote configurations
+
+Each sample draws a shared case-strength shock, then nine cert votes (a
+grant needs four), a DIG draw and nine merits votes, all from the
+Justices' vote log-odds (vote_model) shifted by the risk assessment.
+Samples run in fixed-size NumPy batches, each seeded from one
+SeedSequence, so results depend only on (inputs, samples, seed) whether
+the batches run inline or in a process pool.
+"""
+
+import os
+
+try:
+    import numpy as np
+    NUMPY_SUPPORT = True
+except ImportError:
+    np = None
+    NUMPY_SUPPORT = False
+
+DEFAULT_SAMPLES = 100_000
+MAX_SAMPLES = int(os.environ.get('OUTCOME_MAX_SAMPLES', '2000000'))
+DEFAULT_SEED = 0
+
+# Samples per vectorized batch (bounds memory at roughly 100 bytes per sample)
+BATCH_SAMPLES = 25_000
+
+# Below this many samples, pool dispatch costs more than it saves
+PARALLEL_MIN_SAMPLES = int(os.environ.get('OUTCOME_PARALLEL_MIN_SAMPLES', '500000'))
+
+# Votes needed to grant certiorari
+CERT_VOTES = 4
+
+# Std. dev. of the per-sample shock shared by all nine Justices (votes are correlated)
+CASE_NOISE = 0.75
+
+# Cert-vote log-odds shift by overall risk level, and DIG rate (given grant) by DIG
+# risk; keyed by exactly engine.RISK_LEVELS / DIG_RISKS (checked in tests/test_outcomes.py)
+RISK_SHIFT = {'CAUTION': -0.5, 'CRITICAL': -1.5}
+DIG_RATES = {'Low': 0.02, 'Medium': 0.05, 'High': 0.15}
+
+# Merits splits by votes on the winning side
+SPLITS = ('9-0', '8-1', '7-2', '6-3', '5-4')
+
+# Tally layout returned by each batch
+_SAMPLES, _GRANTED, _DIGGED, _PETITIONER = 0, 1, 2, 3
+_SPLIT_OFFSET = 4
+
+
+def simulate_batch(logits, cert_shift: float, dig_rate: float, seed_seq, size: int):
+    """Run one batch of samples and return its tallies (top-level so pools can pickle it)"""
+    rng = np.random.default_rng(seed_seq)
+    logits = np.asarray(logits, dtype=np.float64)
+
+    shock = rng.normal(0.0, CASE_NOISE, size=(size, 1))
+    merits_logits = logits + shock
+    cert_p = 1.0 / (1.0 + np.exp(-(merits_logits + cert_shift)))
+    merits_p = 1.0 / (1.0 + np.exp(-merits_logits))
+
+    granted = (rng.random((size, len(logits))) < cert_p).sum(axis=1) >= CERT_VOTES
+    digged = granted & (rng.random(size) < dig_rate)
+    decided = granted & ~digged
+
+    votes_for = (rng.random((size, len(logits))) < merits_p).sum(axis=1)[decided]
+    majority = np.maximum(votes_for, len(logits) - votes_for)
+
+    tallies = np.zeros(_SPLIT_OFFSET + len(SPLITS), dtype=np.int64)
+    tallies[_SAMPLES] = size
+    tallies[_GRANTED] = granted.sum()
+    tallies[_DIGGED] = digged.sum()
+    tallies[_PETITIONER] = (votes_for * 2 > len(logits)).sum()
+    # majority is 5..9; SPLITS runs from 9-0 down to 5-4
+    tallies[_SPLIT_OFFSET:] = np.bincount(len(logits) - majority, minlength=len(SPLITS))[:len(SPLITS)]
+    return tallies
+
+
+def simulate(logits, risk_level: str, dig_risk: str, samples: int = DEFAULT_SAMPLES,
+             seed: int = DEFAULT_SEED, pool=None) -> dict:
+    """
+    Outcome distribution for one brief from its nine vote log-odds.
+    Pass a process pool to spread batches across workers. Raises KeyError
+    for a risk level or DIG risk the engine does not emit.
+    """
+    cert_shift = RISK_SHIFT[risk_level]
+    dig_rate = DIG_RATES[dig_risk]
+    logits = [float(logit) for logit in logits]
+
+    sizes = [BATCH_SAMPLES] * (samples // BATCH_SAMPLES)
+    if samples % BATCH_SAMPLES:
+        sizes.append(samples % BATCH_SAMPLES)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if pool is not None and len(sizes) > 1:
+        futures = [pool.submit(simulate_batch, logits, cert_shift, dig_rate, seed_seq, size)
+                   for seed_seq, size in zip(seeds, sizes)]
+        tallies = sum(future.result() for future in futures)
+    else:
+        tallies = sum(simulate_batch(logits, cert_shift, dig_rate, seed_seq, size)
+                      for seed_seq, size in zip(seeds, sizes))
+
+    granted = int(tallies[_GRANTED])
+    decided = granted - int(tallies[_DIGGED])
+    return {
+        'samples': samples,
+        'seed': seed,
+        'grant': round(granted / samples, 4),
+        'dig': round(int(tallies[_DIGGED]) / samples, 4),
+        'digGivenGrant': round(int(tallies[_DIGGED]) / granted, 4) if granted else None,
+        'petitionerWinsGivenDecided': round(int(tallies[_PETITIONER]) / decided, 4) if decided else None,
+        'splits': {split: round(int(count) / decided, 4) if decided else None
+                   for split, count in zip(SPLITS, tallies[_SPLIT_OFFSET:])}
+    }
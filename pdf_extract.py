@@ -0,0 +1,328 @@
+"""
+SCOTUS Strategic Engine - PDF Extraction
+Page-parallel text extraction with page limits and per-page timeouts
+
+Pages with an empty text layer but embedded images (scans) fall back to
+OCR (see ocr.py); they are recognized concurrently while later pages are
+still being parsed.
+"""
+
+import io
+import os
+import signal
+import tempfile
+import threading
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+
+import metrics
+import ocr
+
+# Optional PDF support
+try:
+    import PyPDF2
+    PDF_SUPPORT = True
+except ImportError:
+    PDF_SUPPORT = False
+
+# ========================================
+# Configuration
+# ========================================
+
+MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', '2000'))
+PAGE_TIMEOUT = float(os.environ.get('PDF_PAGE_TIMEOUT', '10'))
+WORKERS = int(os.environ.get('PDF_WORKERS', str(os.cpu_count() or 1)))
+
+# Below this many pages the pool round-trip costs more than it saves
+PARALLEL_MIN_PAGES = 16
+CHUNK_PAGES = 25
+
+# Seconds a pool task may overrun its own timeout before its result is abandoned
+POOL_GRACE = 5
+
+# In-memory documents larger than this are written to one uniquely named temp
+# file for the pool, instead of being pickled to every page-range task
+SPILL_BYTES = 4 * 1024 * 1024
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class PageTimeout(Exception):
+    """Raised inside a worker when a single page exceeds its time budget"""
+
+
+class DocumentProgress:
+    """Page counts for one document, updated as its pages are parsed and recognized"""
+
+    def __init__(self, pages: int):
+        self.pages = pages
+        self.parsed = 0
+        self.ocr_pages = 0   # pages sent to OCR (cached or not)
+        self.ocr_cached = 0
+        self.ocr_done = 0    # recognized by the pool, including failures
+        self.ocr_failed = 0
+
+    def to_dict(self) -> dict:
+        return {
+            'pages': self.pages,
+            'parsed': self.parsed,
+            'ocrPages': self.ocr_pages,
+            'ocrCached': self.ocr_cached,
+            'ocrDone': self.ocr_done,
+            'ocrFailed': self.ocr_failed
+        }
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Lazily start the shared extraction pool"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawn, not fork: the web server that owns us is multi-threaded
+            _pool = ProcessPoolExecutor(max_workers=WORKERS,
+                                        mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+
+# ========================================
+# Page Extraction
+# ========================================
+
+def _open_reader(payload):
+    """Open a PdfReader from a file path or raw bytes"""
+    if isinstance(payload, (bytes, bytearray, memoryview)):
+        return PyPDF2.PdfReader(io.BytesIO(payload))
+    return PyPDF2.PdfReader(payload)
+
+
+def _on_alarm(signum, frame):
+    raise PageTimeout()
+
+
+def _alarm_available() -> bool:
+    """Whether page alarms can fire here: SIGALRM is only delivered to the main thread"""
+    return hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+
+
+def _extract_page(page, page_timeout: float) -> str:
+    """Extract one page, giving up after page_timeout seconds where signals allow"""
+    use_alarm = page_timeout and _alarm_available()
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, page_timeout)
+    try:
+        return page.extract_text() or ''
+    except Exception:
+        # Malformed or timed-out pages contribute no text rather than failing the document
+        return ''
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+
+def _extract_with_fingerprint(page, page_timeout: float, ocr_tag: str) -> tuple:
+    """(text, OCR fingerprint); the fingerprint is only computed for image pages without text"""
+    text = _extract_page(page, page_timeout)
+    if ocr_tag is None or text.strip():
+        return text, None
+    return text, ocr.page_fingerprint(page, ocr_tag)
+
+
+def _extract_range(payload, start: int, stop: int, page_timeout: float, ocr_tag: str = None) -> list:
+    """Worker entry point: extract pages [start, stop) of one document as (text, fingerprint)"""
+    reader = _open_reader(payload)
+    return [_extract_with_fingerprint(reader.pages[i], page_timeout, ocr_tag) for i in range(start, stop)]
+
+
+# ========================================
+# Public API
+# ========================================
+
+def read_source(source):
+    """
+    Normalize a path, bytes or file-like object into a path or bytes payload.
+    Files on disk (including rolled-over spooled uploads) are passed by path,
+    so workers open them directly; only in-memory sources are read.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    name = getattr(source, 'name', None)
+    if isinstance(name, str) and os.path.isfile(name):
+        source.flush()
+        return name
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return source.read()
+
+
+def page_count(payload) -> int:
+    """Number of pages in the document"""
+    return len(_open_reader(payload).pages)
+
+
+def _spill(payload: bytes, spill_dir: str = None) -> str:
+    """Write an in-memory document to a unique temp file and return its path"""
+    fd, path = tempfile.mkstemp(suffix='.pdf', dir=spill_dir)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(payload)
+    return path
+
+
+def _parse_inline(pages: int, page_timeout: float) -> bool:
+    """
+    Small documents (or all, with one worker) are parsed in the calling thread,
+    but only where a page alarm can interrupt them. Request and Streamlit
+    threads send every document to the pool, whose workers parse on their
+    main thread, so a pathological page can never hang them.
+    """
+    return (pages < PARALLEL_MIN_PAGES or WORKERS <= 1) and (not page_timeout or _alarm_available())
+
+
+def _iter_extracted(payload, pages: int, page_timeout: float, ocr_tag: str):
+    """Yield (page_index, text, fingerprint) in page order, page ranges spread over the pool"""
+    if _parse_inline(pages, page_timeout):
+        reader = _open_reader(payload)
+        for i in range(pages):
+            yield (i, *_extract_with_fingerprint(reader.pages[i], page_timeout, ocr_tag))
+        return
+
+    # A small document is one task: the pool is here for its page alarms, not parallelism
+    chunk = pages if pages < PARALLEL_MIN_PAGES else max(1, min(CHUNK_PAGES, -(-pages // WORKERS)))
+    pool = _get_pool()
+    futures = [(start, min(start + chunk, pages),
+                pool.submit(_extract_range, payload, start, min(start + chunk, pages), page_timeout, ocr_tag))
+               for start in range(0, pages, chunk)]
+
+    try:
+        for start, stop, future in futures:
+            try:
+                # Safety net in case a worker can't be interrupted by its page alarm
+                results = future.result(timeout=page_timeout * (stop - start) + POOL_GRACE if page_timeout else None)
+            except FutureTimeout:
+                results = [('', None)] * (stop - start)
+            for offset, (text, fingerprint) in enumerate(results):
+                yield start + offset, text, fingerprint
+    finally:
+        for _, _, future in futures:
+            future.cancel()
+
+
+def iter_pdf_events(payload, pages: int, page_timeout: float = PAGE_TIMEOUT, spill_dir: str = None,
+                    progress: DocumentProgress = None):
+    """
+    Yield {'page', 'text'} events in page order ('ocr': True on recognized
+    pages) and, while waiting on OCR, {'progress'} events every
+    ocr.PROGRESS_INTERVAL seconds so streamed responses stay alive.
+
+    Large documents are split into page ranges across the process pool, so
+    early pages are yielded while later ranges are still being parsed. Scanned
+    pages are submitted to the OCR pool as soon as they are found.
+    """
+    progress = progress or DocumentProgress(pages)
+    backend = ocr.get_backend()
+    ocr_tag = backend.cache_tag if backend is not None else None
+
+    spilled = None
+    if isinstance(payload, bytes) and len(payload) > SPILL_BYTES and not _parse_inline(pages, page_timeout):
+        spilled = payload = _spill(payload, spill_dir)
+
+    ready = {}    # page index -> event, waiting for earlier pages
+    pending = {}  # page index -> OCR future
+    next_index = 0
+
+    def on_recognized(fingerprint):
+        def record(future):
+            if future.cancelled():
+                return
+            progress.ocr_done += 1
+            if future.exception() is None:
+                ocr.OCR_CACHE.put(fingerprint, future.result())
+                metrics.PAGES_OCR.inc(result='recognized')
+            else:
+                progress.ocr_failed += 1
+                metrics.PAGES_OCR.inc(result='failed')
+        return record
+
+    def ocr_event(index: int, text: str) -> dict:
+        return {'page': index + 1, 'text': text, 'ocr': True}
+
+    try:
+        for index, text, fingerprint in _iter_extracted(payload, pages, page_timeout, ocr_tag):
+            progress.parsed += 1
+            if fingerprint is None:
+                ready[index] = {'page': index + 1, 'text': text}
+            else:
+                progress.ocr_pages += 1
+                cached = ocr.OCR_CACHE.get(fingerprint)
+                if cached is not None:
+                    progress.ocr_cached += 1
+                    metrics.PAGES_OCR.inc(result='cached')
+                    ready[index] = ocr_event(index, cached)
+                else:
+                    # OCR workers read the document from disk rather than a pickled copy per page
+                    if isinstance(payload, bytes):
+                        spilled = payload = _spill(payload, spill_dir)
+                    future = ocr.get_pool().submit(ocr.recognize_page, payload, index, ocr.OCR_BACKEND)
+                    future.add_done_callback(on_recognized(fingerprint))
+                    pending[index] = future
+
+            while next_index in ready or (next_index in pending and pending[next_index].done()):
+                if next_index in ready:
+                    yield ready.pop(next_index)
+                else:
+                    future = pending.pop(next_index)
+                    yield ocr_event(next_index, '' if future.exception() else future.result())
+                next_index += 1
+
+        # Remaining pages wait on OCR; report progress while they do
+        while next_index < pages:
+            if next_index in ready:
+                yield ready.pop(next_index)
+            else:
+                future = pending.pop(next_index)
+                deadline = time.monotonic() + ocr.OCR_PAGE_TIMEOUT + POOL_GRACE
+                text = ''
+                while True:
+                    try:
+                        text = future.result(timeout=ocr.PROGRESS_INTERVAL)
+                        break
+                    except FutureTimeout:
+                        if time.monotonic() >= deadline:
+                            # Safety net: the backend's own timeout should have fired
+                            future.cancel()
+                            break
+                        yield {'progress': progress.to_dict()}
+                    except Exception:
+                        break
+                yield ocr_event(next_index, text)
+            next_index += 1
+    finally:
+        for future in pending.values():
+            future.cancel()
+        if spilled:
+            os.remove(spilled)
+
+
+def iter_pdf_pages(payload, pages: int, page_timeout: float = PAGE_TIMEOUT, spill_dir: str = None):
+    """Yield (page_index, text) in page order, OCR text included"""
+    for event in iter_pdf_events(payload, pages, page_timeout, spill_dir):
+        if 'page' in event:
+            yield event['page'] - 1, event['text']
+
+
+def extract_pdf_text(source, max_pages: int = MAX_PAGES, page_timeout: float = PAGE_TIMEOUT,
+                     spill_dir: str = None) -> str:
+    """Extract text content from a PDF path, bytes or file-like object"""
+    if not PDF_SUPPORT:
+        return ""
+
+    payload = read_source(source)
+    pages = min(page_count(payload), max_pages)
+    metrics.PDF_PAGES.observe(pages)
+    metrics.PAGES_PARSED.inc(pages)
+    return "\n".join(text for _, text in iter_pdf_pages(payload, pages, page_timeout, spill_dir)).strip()
@@ -0,0 +1,162 @@
+"""
+SCOTUS Strategic Engine - Precedent Index
+Inverted index with BM25 weights for ranking precedents against brief text
+"""
+
+import re
+import math
+import heapq
+from collections import Counter, defaultdict
+
+try:
+    import numpy as np
+    NUMPY_SUPPORT = True
+except ImportError:
+    np = None
+    NUMPY_SUPPORT = False
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have in is it its may must no not of on or
+that the their this to under v was were which with without
+""".split())
+
+# BM25 parameters: k1/b for precedent-side term saturation and length
+# normalization, k3 for saturation of repeated terms in the (long) brief
+K1 = 1.2
+B = 0.75
+K3 = 8.0
+
+# Keywords are curated, so they count more than incidental holding words
+KEYWORD_WEIGHT = 2
+
+# Added to precedents filed under an issue the scanner flagged; about the
+# score of one keyword the brief repeats a few times
+ISSUE_BOOST = 5.0
+
+# A query is the brief's highest tf-idf terms: a long brief has thousands of
+# distinct tokens, and the rare ones that identify a precedent rank first
+QUERY_TERMS = 32
+
+# Below this many precedents the dict accumulator beats dense NumPy scoring
+DENSE_MIN_DOCS = 1000
+
+
+def tokenize(text: str) -> list:
+    """Lowercase word tokens with stopwords removed"""
+    return [tok for tok in TOKEN_RE.findall(text.lower()) if tok not in STOPWORDS]
+
+
+class PrecedentIndex:
+    """
+    Term -> postings index over precedent holdings, case names and keywords.
+    Postings store precomputed BM25 document weights, so a query is a sum
+    of products over at most QUERY_TERMS terms and a top-k selection. For
+    large corpora (with NumPy) each term's postings are added into a dense
+    score array at once.
+    """
+
+    def __init__(self, precedents: dict):
+        self.docs = []
+        self.issue_docs = defaultdict(list)
+        term_freqs = []
+
+        for issue, precs in precedents.items():
+            for prec in precs:
+                # Case name without the reporter citation, so a brief citing it by name matches
+                name = prec['case'].split(',')[0]
+                tf = Counter(tokenize(name + ' ' + prec['holding']))
+                for keyword in prec.get('keywords', []):
+                    for tok in tokenize(keyword):
+                        tf[tok] += KEYWORD_WEIGHT
+                self.issue_docs[issue].append(len(self.docs))
+                self.docs.append({'issue': issue, **prec})
+                term_freqs.append(tf)
+
+        doc_count = len(self.docs)
+        lengths = [sum(tf.values()) for tf in term_freqs]
+        avg_length = (sum(lengths) / doc_count) if doc_count else 1.0
+        doc_freq = Counter(term for tf in term_freqs for term in tf)
+
+        self.idf = {term: math.log(1 + (doc_count - df + 0.5) / (df + 0.5)) for term, df in doc_freq.items()}
+        self.postings = defaultdict(list)
+        for doc_id, tf in enumerate(term_freqs):
+            norm = K1 * (1 - B + B * lengths[doc_id] / avg_length)
+            for term, freq in tf.items():
+                self.postings[term].append((doc_id, self.idf[term] * freq * (K1 + 1) / (freq + norm)))
+        self.postings = dict(self.postings)
+
+        self.dense = NUMPY_SUPPORT and doc_count >= DENSE_MIN_DOCS
+        if self.dense:
+            self.posting_arrays = {term: (np.array([doc_id for doc_id, _ in plist], dtype=np.intp),
+                                          np.array([weight for _, weight in plist]))
+                                   for term, plist in self.postings.items()}
+            self.issue_order = list(self.issue_docs)
+            self.doc_issues = np.array([self.issue_order.index(doc['issue']) for doc in self.docs], dtype=np.intp)
+
+    def query_terms(self, text: str) -> Counter:
+        """The brief's QUERY_TERMS most distinctive terms in the index vocabulary"""
+        return self.select_terms(Counter(tokenize(text)))
+
+    def select_terms(self, token_counts: Counter) -> Counter:
+        """query_terms() from precomputed token counts (e.g. merged per paragraph)"""
+        idf = self.idf
+        # Break weight ties by term so merged counts select the same terms
+        weighted = heapq.nsmallest(QUERY_TERMS, ((count * idf[term], term, count)
+                                                 for term, count in token_counts.items() if term in idf),
+                                   key=lambda item: (-item[0], item[1]))
+        return Counter({term: count for _, term, count in weighted})
+
+    def search(self, terms: Counter, issues: dict = None, limit: int = 6) -> list:
+        """Return up to `limit` (score, precedent) pairs, best first"""
+        if self.dense:
+            return self._search_dense(terms, issues, limit)
+
+        scores = defaultdict(float)
+        for term, count in terms.items():
+            query_weight = count * (K3 + 1) / (count + K3)
+            for doc_id, weight in self.postings.get(term, ()):
+                scores[doc_id] += query_weight * weight
+
+        flagged = [issue for issue, is_present in (issues or {}).items() if is_present]
+        if flagged:
+            for doc_id in scores:
+                if self.docs[doc_id]['issue'] in flagged:
+                    scores[doc_id] += ISSUE_BOOST
+            # Unmatched precedents under a flagged issue all score ISSUE_BOOST and
+            # tie-break by id, so only the first `limit` of each can reach the top
+            for issue in flagged:
+                added = 0
+                for doc_id in self.issue_docs.get(issue, ()):
+                    if added == limit:
+                        break
+                    if doc_id not in scores:
+                        scores[doc_id] = ISSUE_BOOST
+                        added += 1
+
+        # Ties keep table order, matching the previous insertion-order listing
+        top = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(score, self.docs[doc_id]) for doc_id, score in top]
+
+    def _search_dense(self, terms: Counter, issues: dict, limit: int) -> list:
+        scores = np.zeros(len(self.docs))
+        for term, count in terms.items():
+            arrays = self.posting_arrays.get(term)
+            if arrays is not None:
+                # Doc ids are unique within a postings list, so fancy += adds each once
+                scores[arrays[0]] += (count * (K3 + 1) / (count + K3)) * arrays[1]
+
+        flagged = [issue for issue, is_present in (issues or {}).items() if is_present and issue in self.issue_docs]
+        if flagged:
+            boosted = np.zeros(len(self.issue_order), dtype=bool)
+            boosted[[self.issue_order.index(issue) for issue in flagged]] = True
+            scores[boosted[self.doc_issues]] += ISSUE_BOOST
+
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > limit:
+            kth = np.partition(scores[candidates], -limit)[-limit]
+            candidates = candidates[scores[candidates] >= kth]
+        # Ties keep table order, matching the previous insertion-order listing
+        top = candidates[np.lexsort((candidates, -scores[candidates]))][:limit]
+        return [(float(scores[doc_id]), self.docs[doc_id]) for doc_id in top.tolist()]
@@ -0,0 +1,207 @@
+"""
+SCOTUS Strategic Engine - Precedent Store
+SQLite-backed precedent corpus, opened lazily and read-only via mmap
+
+The store holds the BM25 term weights PrecedentIndex computes for the same
+corpus, and queries score them the way PrecedentIndex does, so both
+backends return the same precedents with the same scores.
+
+Build a store from a JSONL corpus (one {issue, case, url, holding, keywords}
+object per line):
+
+    python precedent_store.py corpus.jsonl precedents.db
+
+Omit the corpus path to export the built-in backend table instead.
+"""
+
+import os
+import sys
+import json
+import heapq
+import sqlite3
+import threading
+from collections import Counter, defaultdict
+
+from precedent_index import ISSUE_BOOST, K3, QUERY_TERMS, PrecedentIndex, tokenize
+
+# Map up to this much of the file; pages are shared through the OS page
+# cache, so every worker process reads the same physical memory
+MMAP_BYTES = 1024 * 1024 * 1024
+
+# Stores built with another schema version must be rebuilt
+STORE_VERSION = 2
+
+# Terms per `IN (...)` lookup, well under SQLite's bound-parameter limit
+LOOKUP_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE precedents (
+    id INTEGER PRIMARY KEY,
+    issue TEXT NOT NULL,
+    case_name TEXT NOT NULL,
+    url TEXT NOT NULL,
+    holding TEXT NOT NULL,
+    keywords TEXT NOT NULL
+);
+CREATE INDEX precedents_issue ON precedents (issue, id);
+CREATE TABLE terms (term TEXT PRIMARY KEY, idf REAL NOT NULL) WITHOUT ROWID;
+CREATE TABLE postings (
+    term TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    weight REAL NOT NULL,
+    PRIMARY KEY (term, doc_id)
+) WITHOUT ROWID;
+"""
+
+
+def build_store(records, path: str) -> int:
+    """Write precedent records to a new store at `path`; returns the record count"""
+    # Grouped by issue in first-seen order, as PrecedentIndex numbers its documents
+    table = {}
+    for record in records:
+        table.setdefault(record['issue'], []).append(
+            {'case': record['case'], 'url': record.get('url', ''), 'holding': record['holding'],
+             'keywords': record.get('keywords', [])})
+    index = PrecedentIndex(table)
+
+    tmp_path = path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+        conn.executemany(
+            'INSERT INTO precedents (id, issue, case_name, url, holding, keywords) VALUES (?, ?, ?, ?, ?, ?)',
+            ((doc_id, doc['issue'], doc['case'], doc['url'], doc['holding'], json.dumps(doc['keywords']))
+             for doc_id, doc in enumerate(index.docs)))
+        conn.executemany('INSERT INTO terms (term, idf) VALUES (?, ?)', index.idf.items())
+        conn.executemany('INSERT INTO postings (term, doc_id, weight) VALUES (?, ?, ?)',
+                         ((term, doc_id, weight) for term, postings in index.postings.items()
+                          for doc_id, weight in postings))
+        conn.execute(f'PRAGMA user_version = {STORE_VERSION}')
+        conn.commit()
+        conn.execute('VACUUM')
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, path)
+    return len(index.docs)
+
+
+def records_from_table(precedents: dict):
+    """Flatten an issue -> [precedent] table into store records"""
+    for issue, precs in precedents.items():
+        for prec in precs:
+            yield {'issue': issue, **prec}
+
+
+class PrecedentStore:
+    """
+    Read-only precedent lookup over a store built by `build_store`.
+    Exposes the same query_terms/search interface as PrecedentIndex. Nothing
+    is read at construction; each thread opens its own connection on first use.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        # Connections must not cross a fork; reopen in the child
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True, check_same_thread=False)
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version != STORE_VERSION:
+                conn.close()
+                raise ValueError(f'{self.path} is a version {version} precedent store; '
+                                 f'rebuild it with python precedent_store.py')
+            conn.execute(f'PRAGMA mmap_size = {MMAP_BYTES}')
+            conn.execute('PRAGMA query_only = 1')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _to_precedent(self, row) -> dict:
+        issue, case_name, url, holding, keywords = row
+        # Interned: the same few precedents recur across analyses held in caches and sessions
+        return {'issue': sys.intern(issue), 'case': sys.intern(case_name), 'url': sys.intern(url),
+                'holding': sys.intern(holding), 'keywords': json.loads(keywords)}
+
+    def _lookup(self, query: str, terms: list):
+        """Rows of `query` (with an IN ({}) slot) for every term, LOOKUP_CHUNK terms at a time"""
+        conn = self._conn()
+        for start in range(0, len(terms), LOOKUP_CHUNK):
+            chunk = terms[start:start + LOOKUP_CHUNK]
+            yield from conn.execute(query.format(','.join('?' * len(chunk))), chunk)
+
+    def query_terms(self, text: str) -> Counter:
+        """The brief's QUERY_TERMS most distinctive terms in the store vocabulary"""
+        return self.select_terms(Counter(tokenize(text)))
+
+    def select_terms(self, token_counts: Counter) -> Counter:
+        """query_terms() from precomputed token counts (e.g. merged per paragraph)"""
+        idf = dict(self._lookup('SELECT term, idf FROM terms WHERE term IN ({})', list(token_counts)))
+        # Break weight ties by term so merged counts select the same terms
+        weighted = heapq.nsmallest(QUERY_TERMS, ((count * idf[term], term, count)
+                                                 for term, count in token_counts.items() if term in idf),
+                                   key=lambda item: (-item[0], item[1]))
+        return Counter({term: count for _, term, count in weighted})
+
+    def search(self, terms: Counter, issues: dict = None, limit: int = 6) -> list:
+        """Return up to `limit` (score, precedent) pairs, best first"""
+        conn = self._conn()
+        flagged = [issue for issue, is_present in (issues or {}).items() if is_present]
+        scores = defaultdict(float)
+        boosted = set()
+
+        postings = defaultdict(list)
+        for term, doc_id, weight, issue in self._lookup(
+                'SELECT p.term, p.doc_id, p.weight, d.issue FROM postings p JOIN precedents d ON d.id = p.doc_id '
+                'WHERE p.term IN ({})', list(terms)):
+            postings[term].append((doc_id, weight))
+            if issue in flagged:
+                boosted.add(doc_id)
+        # Summed term by term in query order, as PrecedentIndex does, so scores agree exactly
+        for term, count in terms.items():
+            query_weight = count * (K3 + 1) / (count + K3)
+            for doc_id, weight in postings.get(term, ()):
+                scores[doc_id] += query_weight * weight
+
+        for doc_id in boosted:
+            scores[doc_id] += ISSUE_BOOST
+        # Unmatched precedents under a flagged issue all score ISSUE_BOOST and
+        # tie-break by id, so only the first `limit` of each can reach the top
+        for issue in flagged:
+            added = 0
+            for (doc_id,) in conn.execute('SELECT id FROM precedents WHERE issue = ? ORDER BY id', (issue,)):
+                if added == limit:
+                    break
+                if doc_id not in scores:
+                    scores[doc_id] = ISSUE_BOOST
+                    added += 1
+
+        top = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        if not top:
+            return []
+        rows = {doc_id: row for doc_id, *row in conn.execute(
+            f'SELECT id, issue, case_name, url, holding, keywords FROM precedents '
+            f'WHERE id IN ({",".join("?" * len(top))})', [doc_id for doc_id, _ in top])}
+        return [(score, self._to_precedent(rows[doc_id])) for doc_id, score in top]
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        with open(sys.argv[1], 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        out_path = sys.argv[2]
+    elif len(sys.argv) == 2:
+        from engine import PRECEDENTS
+        records = list(records_from_table(PRECEDENTS))
+        out_path = sys.argv[1]
+    else:
+        print('Usage: python precedent_store.py [corpus.jsonl] precedents.db')
+        sys.exit(1)
+
+    print(f'Wrote {build_store(records, out_path)} precedents to {out_path}')
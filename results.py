@@ -0,0 +1,85 @@
+"""
+SCOTUS Strategic Engine - Result Records
+Compact, immutable entries for the lists and flags inside an analysis
+
+Precedent, Trap, Risk and JusticeQuestion are frozen, slotted dataclasses:
+a few pointers each instead of a per-request dict. They are read-only
+Mappings, so record['case'] and record.get('case') keep working next to
+plain dicts (e.g. chat context sent back by the client), and every JSON
+backend encodes them as the objects described in schema.py.
+
+Static results (risk and trap lists, issue flag dicts) are built once per
+combination at import and shared by every analysis; IssueFlags is the
+read-only dict used for those.
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+
+class Record(Mapping):
+    """Read-only mapping view of a slotted dataclass's fields"""
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if key in self.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+
+@dataclass(frozen=True, slots=True)
+class Precedent(Record):
+    case: str
+    url: str
+    relevance: str
+    risk: str
+    score: float
+
+
+@dataclass(frozen=True, slots=True)
+class Trap(Record):
+    type: str  # 'trap' or 'counter'
+    text: str
+
+
+@dataclass(frozen=True, slots=True)
+class Risk(Record):
+    category: str
+    level: str
+    confidence: str
+
+
+@dataclass(frozen=True, slots=True)
+class JusticeQuestion(Record):
+    justice: str
+    name: str
+    focus: str
+    question: str
+    pressure: str
+    pressureScore: float
+
+
+class IssueFlags(dict):
+    """
+    Issue name -> present, shared between analyses and therefore read-only.
+    Still a dict, so isinstance checks, JSON encoders and pickling treat it
+    like the per-request dicts it replaces.
+    """
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError('IssueFlags is shared between analyses; copy it with dict() to modify')
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return (IssueFlags, (dict(self),))
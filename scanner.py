@@ -0,0 +1,147 @@
+"""
+SCOTUS Strategic Engine - Keyword Scanner
+Keyword presence, counts and offsets for issues, posture markers and precedents
+
+Python's substring search runs in C at memory speed, so each question is
+answered with the cheapest string method that answers it, only when asked:
+flags are `kw in text` checks that stop at the first keyword found (as the
+original rule chain did), counts are str.count, and offsets are str.find
+loops run only for keywords that are present.
+"""
+
+
+class ScanResult:
+    """
+    Keyword hits for one document, computed lazily from its lowercased text.
+    Results merged from several scans (see incremental.py) carry counts only.
+    """
+
+    def __init__(self, scanner: 'KeywordScanner', lowered: str = None, counts: dict = None):
+        self._scanner = scanner
+        self._lowered = lowered
+        self._present = {}
+        self._counts = counts
+
+    def has(self, keyword: str) -> bool:
+        """Whether the keyword occurs in the document"""
+        if self._counts is not None:
+            return self._counts.get(keyword, 0) > 0
+        present = self._present.get(keyword)
+        if present is None:
+            if keyword in self._scanner.whole_words:
+                present = self._scanner.first_word(self._lowered, keyword) != -1
+            else:
+                present = keyword in self._lowered
+            self._present[keyword] = present
+        return present
+
+    @property
+    def counts(self) -> dict:
+        """Hit count of every keyword present, overlapping hits included"""
+        if self._counts is None:
+            self._counts = {kw: count for kw in self._scanner.keywords
+                            if self.has(kw) and (count := self._scanner.count(self._lowered, kw))}
+        return self._counts
+
+    @property
+    def offsets(self) -> dict:
+        """Start offsets (into the lowercased text) of every keyword present"""
+        return self.positions(self._scanner.keywords)
+
+    def positions(self, keywords) -> dict:
+        """Start offsets of each of `keywords` that is present (text-backed results only)"""
+        find = self._scanner.find
+        return {kw: positions for kw in keywords
+                if self.has(kw) and (positions := find(self._lowered, kw))}
+
+    def keyword_counts(self, category: str) -> dict:
+        """Hit counts of a category's keywords that are present, in table order"""
+        if self._counts is not None:
+            return {kw: self._counts[kw] for kw in self._scanner.category_keywords[category] if kw in self._counts}
+        count = self._scanner.count
+        return {kw: hits for kw in self._scanner.category_keywords[category]
+                if self.has(kw) and (hits := count(self._lowered, kw))}
+
+    def flags(self, category: str) -> dict:
+        """Map each label in a category to whether any of its keywords matched"""
+        return {label: any(self.has(kw) for kw in keywords)
+                for label, keywords in self._scanner.tables[category].items()}
+
+    def label_counts(self, category: str) -> dict:
+        """Map each label in a category to its total keyword hit count"""
+        counts = self.keyword_counts(category)
+        return {label: sum(counts.get(kw, 0) for kw in keywords)
+                for label, keywords in self._scanner.tables[category].items()}
+
+    def first_label(self, category: str, default: str = None):
+        """Return the first label (in table order) with a keyword hit"""
+        for label, keywords in self._scanner.tables[category].items():
+            if any(self.has(kw) for kw in keywords):
+                return label
+        return default
+
+
+class KeywordScanner:
+    """
+    Keyword tables compiled for scanning.
+
+    `tables` maps a category ('issue', 'posture', ...) to an ordered dict
+    of label -> keyword list. Matching is case-insensitive substring
+    matching, equivalent to `kw in text.lower()`, and counts include
+    overlapping hits. Keywords of the `whole_words` categories only match
+    as whole words ('text' not inside 'pretext'), in whichever tables they
+    appear.
+    """
+
+    def __init__(self, tables: dict, whole_words=()):
+        self.tables = {category: {label: [kw.lower() for kw in keywords]
+                                  for label, keywords in labels.items()}
+                       for category, labels in tables.items()}
+
+        self.category_keywords = {category: tuple(dict.fromkeys(kw for keywords in labels.values()
+                                                                for kw in keywords))
+                                  for category, labels in self.tables.items()}
+        self.keywords = sorted({kw for keywords in self.category_keywords.values() for kw in keywords})
+        self.whole_words = frozenset(kw for category in whole_words
+                                     for kw in self.category_keywords.get(category, ()))
+        # str.count skips past each hit, so keywords that can overlap themselves
+        # ('anana' in 'ananana') are counted with find loops
+        self._self_overlapping = frozenset(kw for kw in self.keywords
+                                           if any(kw[i:] == kw[:-i] for i in range(1, len(kw))))
+
+    def scan(self, text: str) -> ScanResult:
+        """Keyword hits for a document; nothing is searched until a result is asked for"""
+        return ScanResult(self, text.lower())
+
+    def count(self, lowered: str, keyword: str) -> int:
+        if keyword in self.whole_words or keyword in self._self_overlapping:
+            return len(self.find(lowered, keyword))
+        return lowered.count(keyword)
+
+    def find(self, lowered: str, keyword: str) -> list:
+        """Every start offset of keyword in lowered, overlapping hits included"""
+        whole_word = keyword in self.whole_words
+        positions = []
+        start = lowered.find(keyword)
+        while start != -1:
+            if not whole_word or _is_word(lowered, start, start + len(keyword)):
+                positions.append(start)
+            start = lowered.find(keyword, start + 1)
+        return positions
+
+    def first_word(self, lowered: str, keyword: str) -> int:
+        """Offset of the first whole-word hit of keyword, or -1"""
+        start = lowered.find(keyword)
+        while start != -1 and not _is_word(lowered, start, start + len(keyword)):
+            start = lowered.find(keyword, start + 1)
+        return start
+
+
+def _is_word(text: str, start: int, end: int) -> bool:
+    """Whether text[start:end] is bounded by non-word characters (or the ends of text)"""
+    return ((start == 0 or not _word_char(text[start - 1]))
+            and (end == len(text) or not _word_char(text[end])))
+
+
+def _word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
@@ -0,0 +1,72 @@
+"""
+SCOTUS Strategic Engine - Response Schema
+Typed shape of an analysis, for type checkers and serializer validation
+
+engine.run_analysis returns an Analysis; /api/analyze adds title and
+timestamp (and sessionId / incremental when requested). In memory the list
+entries are the records in results.py; these types describe the JSON they
+encode to. With msgspec installed and SCHEMA_STRICT set, backend checks
+every /api/analyze and batch result against them (serialization.validate)
+before sending it.
+"""
+
+from typing import Dict, List, TypedDict
+
+
+class Precedent(TypedDict):
+    case: str
+    url: str
+    relevance: str
+    risk: str
+    score: float
+
+
+class Trap(TypedDict):
+    type: str  # 'trap' or 'counter'
+    text: str
+
+
+class Risk(TypedDict):
+    category: str
+    level: str
+    confidence: str
+
+
+class JusticeQuestion(TypedDict):
+    justice: str
+    name: str
+    focus: str
+    question: str
+    pressure: str
+    pressureScore: float
+
+
+class VotePrediction(TypedDict):
+    outcome: str
+    split: str
+    votesForPetitioner: int
+    expectedVotes: float
+    justices: Dict[str, float]
+
+
+class Analysis(TypedDict):
+    tier: str
+    posture: str
+    riskLevel: str
+    digRisk: str
+    primaryObstacle: str
+    rewriteDirective: str
+    precedents: List[Precedent]
+    traps: List[Trap]
+    risks: List[Risk]
+    justiceQuestions: List[JusticeQuestion]
+    keywordHits: Dict[str, int]
+    votePrediction: VotePrediction
+    issues: Dict[str, bool]
+
+
+class AnalysisResponse(Analysis, total=False):
+    title: str
+    timestamp: str
+    sessionId: str
+    incremental: Dict[str, int]
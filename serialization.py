@@ -0,0 +1,118 @@
+"""
+SCOTUS Strategic Engine - JSON Serialization
+Pluggable JSON encoder for API responses and NDJSON/SSE streams
+
+Uses msgspec when installed, else orjson, else the standard library; set
+JSON_BACKEND ('auto', 'msgspec', 'orjson', 'json') to pick one. Every
+backend emits compact UTF-8 JSON and handles NumPy values, so responses
+decode identically whichever is used. FastJSONProvider plugs the backend
+into Flask, so jsonify and request.json use it too (Flask itself is only
+needed for that class; the cache and session store encode through here).
+"""
+
+import os
+import json
+from collections.abc import Mapping
+
+try:
+    from flask.json.provider import DefaultJSONProvider
+    FLASK_SUPPORT = True
+except ImportError:
+    DefaultJSONProvider = None
+    FLASK_SUPPORT = False
+
+try:
+    import orjson
+    ORJSON_SUPPORT = True
+except ImportError:
+    orjson = None
+    ORJSON_SUPPORT = False
+
+try:
+    import msgspec
+    MSGSPEC_SUPPORT = True
+except ImportError:
+    msgspec = None
+    MSGSPEC_SUPPORT = False
+
+
+def _default(obj):
+    """Values the encoders do not handle natively (NumPy values, read-only mappings)"""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def _json_encode(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=_default).encode('utf-8')
+
+
+ENCODERS = {'json': _json_encode}
+DECODERS = {'json': json.loads}
+
+if MSGSPEC_SUPPORT:
+    _msgspec_encoder = msgspec.json.Encoder(enc_hook=_default)
+    _msgspec_decoder = msgspec.json.Decoder()
+
+    def _msgspec_decode(data):
+        # Flask and callers expect ValueError for malformed JSON
+        try:
+            return _msgspec_decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    ENCODERS['msgspec'] = _msgspec_encoder.encode
+    DECODERS['msgspec'] = _msgspec_decode
+
+if ORJSON_SUPPORT:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    ENCODERS['orjson'] = lambda obj: orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+    DECODERS['orjson'] = orjson.loads
+
+
+def select_backend(name: str) -> str:
+    """Resolve a JSON_BACKEND value to an installed backend"""
+    # Fastest first; timings in benchmark.py ('JSON serialize')
+    fastest = 'msgspec' if MSGSPEC_SUPPORT else 'orjson' if ORJSON_SUPPORT else 'json'
+    if name in ('', 'auto'):
+        return fastest
+    if name not in ENCODERS:
+        print(f"JSON backend {name!r} not available. Using {fastest}.")
+        return fastest
+    return name
+
+
+BACKEND = select_backend(os.environ.get('JSON_BACKEND', 'auto'))
+encode = ENCODERS[BACKEND]
+loads = DECODERS[BACKEND]
+
+
+def dumps(obj) -> str:
+    return encode(obj).decode('utf-8')
+
+
+def validate(obj, schema_type):
+    """Check obj against a schema.py type (needs msgspec); raises ValueError on mismatch"""
+    if not MSGSPEC_SUPPORT:
+        return obj
+    try:
+        return msgspec.convert(obj, schema_type)
+    except msgspec.ValidationError as e:
+        raise ValueError(str(e)) from e
+
+
+if FLASK_SUPPORT:
+    class FastJSONProvider(DefaultJSONProvider):
+        """Flask JSON provider (jsonify, request.json) on the selected backend"""
+
+        def dumps(self, obj, **kwargs) -> str:
+            return dumps(obj)
+
+        def loads(self, s, **kwargs):
+            return loads(s)
+
+        def response(self, *args, **kwargs):
+            obj = self._prepare_response_obj(args, kwargs)
+            return self._app.response_class(encode(obj), mimetype=self.mimetype)
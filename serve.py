@@ -0,0 +1,37 @@
+"""
+SCOTUS Strategic Engine - Production Server
+Runs the ASGI app under Uvicorn with multiple worker processes
+
+    WEB_WORKERS=4 PORT=5000 python serve.py
+
+or, under Gunicorn:
+
+    gunicorn -k uvicorn.workers.UvicornWorker -w 4 -b 0.0.0.0:5000 asgi:application
+"""
+
+import os
+
+try:
+    import uvicorn
+except ImportError:
+    uvicorn = None
+
+HOST = os.environ.get('HOST', '0.0.0.0')
+PORT = int(os.environ.get('PORT', '5000'))
+WEB_WORKERS = int(os.environ.get('WEB_WORKERS', str(min(4, os.cpu_count() or 1))))
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'info')
+
+
+if __name__ == '__main__':
+    if uvicorn is None:
+        raise SystemExit("uvicorn not installed. Install it with: pip install uvicorn")
+
+    print("=" * 50)
+    print("SCOTUS Strategic Engine - Production Server")
+    print("=" * 50)
+    print(f"Workers: {WEB_WORKERS}")
+    print(f"Listening on http://{HOST}:{PORT}")
+    print("=" * 50)
+
+    uvicorn.run('asgi:application', host=HOST, port=PORT, workers=WEB_WORKERS,
+                log_level=LOG_LEVEL, timeout_keep_alive=30)
@@ -0,0 +1,220 @@
+"""
+SCOTUS Strategic Engine - Session Store
+Latest analysis, extracted issues and chat history per client session
+
+Chat and simulate requests carry a session id instead of resending the
+analysis and the whole conversation. Sessions live in an in-process LRU
+with idle expiry by default, bounded by session count and total serialized
+size. Set SESSION_REDIS_URL to share them across workers through Redis or
+any server speaking its protocol (Valkey, KeyDB, a local stand-in); that
+backend needs the `redis` package.
+
+Each session is capped at `max_session_bytes`: the oldest chat turns are
+dropped to fit, and state that cannot fit raises SessionTooLarge. Updates
+(history appends, new analyses) are atomic read-modify-writes, so
+concurrent messages in one session are all kept.
+"""
+
+import re
+import time
+import secrets
+import threading
+from collections import OrderedDict
+
+import serialization
+
+try:
+    import redis
+    REDIS_SUPPORT = True
+except ImportError:
+    redis = None
+    REDIS_SUPPORT = False
+
+SESSION_ID_RE = re.compile(r'[A-Za-z0-9_-]{16,64}')
+
+# Striped per-session locks for read-modify-write updates in memory
+LOCK_STRIPES = 64
+
+
+class SessionTooLarge(Exception):
+    """Raised when a session's state exceeds max_session_bytes even with its history dropped"""
+
+
+class MemorySessionBackend:
+    """Bounded LRU of session dicts with idle expiry, for a single process"""
+
+    def __init__(self, max_sessions: int = 1000, ttl: float = 3600, max_bytes: int = 128 * 1024 * 1024):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._sessions = OrderedDict()  # id -> (last used, state, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._update_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        self.evictions = 0
+
+    def get(self, session_id: str):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            if now - entry[0] > self.ttl:
+                del self._sessions[session_id]
+                self._bytes -= entry[2]
+                return None
+            self._sessions[session_id] = (now, entry[1], entry[2])
+            self._sessions.move_to_end(session_id)
+            return entry[1]
+
+    def set(self, session_id: str, state: dict, encoded: bytes = None):
+        """Store a state; `encoded` (its serialized form, if already made) sizes it"""
+        size = len(encoded if encoded is not None else serialization.encode(state))
+        now = time.monotonic()
+        with self._lock:
+            previous = self._sessions.get(session_id)
+            if previous is not None:
+                self._bytes -= previous[2]
+            self._sessions[session_id] = (now, state, size)
+            self._sessions.move_to_end(session_id)
+            self._bytes += size
+            # Entries are in least-recently-used order: drop idle ones, then any over the caps
+            while self._sessions:
+                oldest_used, _, oldest_size = next(iter(self._sessions.values()))
+                if (now - oldest_used <= self.ttl and len(self._sessions) <= self.max_sessions
+                        and self._bytes <= self.max_bytes):
+                    break
+                self._sessions.popitem(last=False)
+                self._bytes -= oldest_size
+                self.evictions += 1
+
+    def update(self, session_id: str, apply):
+        """Atomically replace a session's state with apply(state or None) -> (state, encoded)"""
+        with self._update_locks[hash(session_id) % LOCK_STRIPES]:
+            state, encoded = apply(self.get(session_id))
+            self.set(session_id, state, encoded)
+            return state
+
+    def delete(self, session_id: str):
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry is not None:
+                self._bytes -= entry[2]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'backend': 'memory', 'sessions': len(self._sessions),
+                    'maxSessions': self.max_sessions, 'bytes': self._bytes,
+                    'maxBytes': self.max_bytes, 'evictions': self.evictions}
+
+
+class RedisSessionBackend:
+    """Sessions as JSON strings with a sliding TTL; eviction is left to the server's maxmemory policy"""
+
+    def __init__(self, url: str = None, ttl: float = 3600, prefix: str = 'scotus:session:', client=None):
+        self.client = client if client is not None else redis.Redis.from_url(url)
+        self.ttl = int(ttl)
+        self.prefix = prefix
+
+    def get(self, session_id: str):
+        key = self.prefix + session_id
+        pipe = self.client.pipeline()
+        pipe.get(key)
+        pipe.expire(key, self.ttl)
+        raw, _ = pipe.execute()
+        return serialization.loads(raw) if raw is not None else None
+
+    def set(self, session_id: str, state: dict, encoded: bytes = None):
+        self.client.set(self.prefix + session_id,
+                        encoded if encoded is not None else serialization.encode(state), ex=self.ttl)
+
+    def update(self, session_id: str, apply):
+        """Atomic read-modify-write: WATCH the key and retry if another writer got in first"""
+        key = self.prefix + session_id
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(key)
+                    raw = pipe.get(key)
+                    state, encoded = apply(serialization.loads(raw) if raw is not None else None)
+                    pipe.multi()
+                    pipe.set(key, encoded, ex=self.ttl)
+                    pipe.execute()
+                    return state
+                except redis.WatchError:
+                    continue
+
+    def delete(self, session_id: str):
+        self.client.delete(self.prefix + session_id)
+
+    def stats(self) -> dict:
+        return {'backend': 'redis'}
+
+
+class SessionStore:
+    """
+    Session state on top of a backend with get/set/update/delete(session_id):
+    {'analysis': dict, 'issues': dict, 'history': [{'role', 'content'}]}
+    """
+
+    def __init__(self, backend, max_history: int = 50, max_session_bytes: int = 1024 * 1024):
+        self.backend = backend
+        self.max_history = max_history
+        self.max_session_bytes = max_session_bytes
+
+    @staticmethod
+    def new_id() -> str:
+        return secrets.token_urlsafe(18)
+
+    @staticmethod
+    def valid_id(session_id) -> bool:
+        return isinstance(session_id, str) and bool(SESSION_ID_RE.fullmatch(session_id))
+
+    def get(self, session_id: str):
+        return self.backend.get(session_id)
+
+    def _fit(self, state: dict) -> tuple:
+        """(state, encoded) within max_session_bytes, dropping the oldest turns as needed"""
+        encoded = serialization.encode(state)
+        while len(encoded) > self.max_session_bytes and state['history']:
+            state = {**state, 'history': state['history'][1:]}
+            encoded = serialization.encode(state)
+        if len(encoded) > self.max_session_bytes:
+            raise SessionTooLarge(f'Session state exceeds {self.max_session_bytes} bytes')
+        return state, encoded
+
+    def save_analysis(self, session_id: str, analysis: dict, key: str):
+        """Store the latest analysis; a different document `key` starts a fresh conversation"""
+        def apply(state):
+            state = state or {}
+            history = state.get('history', []) if state.get('key') == key else []
+            return self._fit({
+                'key': key,
+                'analysis': analysis,
+                'issues': analysis.get('issues', {}),
+                'history': history
+            })
+        self.backend.update(session_id, apply)
+
+    def save_context(self, session_id: str, context: dict, history: list):
+        """Seed a session from a client that sent its full context (e.g. after expiry)"""
+        self.backend.update(session_id, lambda state: self._fit({
+            'key': None,
+            'analysis': context,
+            'issues': context.get('issues', {}),
+            'history': list(history)[-self.max_history:]
+        }))
+
+    def append_history(self, session_id: str, state: dict, *messages) -> dict:
+        """
+        Append messages to the session's current history, keeping the newest
+        max_history. `state` (as fetched with get()) reseeds a session that
+        expired meanwhile. Returns the stored state.
+        """
+        def apply(current):
+            current = current or state
+            return self._fit({**current, 'history': (current.get('history', []) + list(messages))[-self.max_history:]})
+        return self.backend.update(session_id, apply)
+
+    def stats(self) -> dict:
+        return {**self.backend.stats(), 'maxHistory': self.max_history, 'maxSessionBytes': self.max_session_bytes}
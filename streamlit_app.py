@@ -2,10 +2,14 @@ import streamlit as st
 import os
 import json
 import re
+import hashlib
 from datetime import datetime
-import PyPDF2
 from streamlit_extras.add_vertical_space import add_vertical_space
 
+import pdf_extract
+from analysis_cache import cache_key
+from engine import ENGINE_VERSION, JUSTICE_REGISTRY, run_analysis
+
 # ========================================
 # Page Configuration
 # ========================================
@@ -337,7 +341,7 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ========================================
-# Data Definitions (Ported from app.js / backend.py)
+# Data Definitions (display only; rule tables live in engine.py)
 # ========================================
 
 JUSTICES = {
@@ -352,30 +356,6 @@ JUSTICES = {
     'jackson': {'name': 'Justice Jackson', 'role': 'Associate', 'focus': 'Historical Context & Equity', 'style': 'Emphasizes historical background and fairness', 'id': 'jackson'}
 }
 
-PRECEDENTS = {
-    'voting_rights': [
-        {'case': 'Thornburg v. Gingles, 478 U.S. 30 (1986)', 'url': 'https://supreme.justia.com/cases/federal/us/478/30/', 'holding': 'Established Section 2 VRA preconditions for vote dilution claims'},
-        {'case': 'Shaw v. Reno, 509 U.S. 630 (1993)', 'url': 'https://supreme.justia.com/cases/federal/us/509/630/', 'holding': 'Racial gerrymandering violates Equal Protection'},
-        {'case': 'Allen v. Milligan, 599 U.S. 1 (2023)', 'url': 'https://supreme.justia.com/cases/federal/us/599/1/', 'holding': 'Reaffirmed Gingles framework for Section 2 claims'}
-    ],
-    'equal_protection': [
-        {'case': 'Miller v. Johnson, 515 U.S. 900 (1995)', 'url': 'https://supreme.justia.com/cases/federal/us/515/900/', 'holding': 'Race cannot predominate in redistricting without compelling justification'},
-        {'case': 'Cooper v. Harris, 581 U.S. 285 (2017)', 'url': 'https://supreme.justia.com/cases/federal/us/581/285/', 'holding': 'Good-faith VRA compliance cannot save unnecessary racial sorting'}
-    ],
-    'first_amendment': [
-        {'case': 'Reed v. Town of Gilbert, 576 U.S. 155 (2015)', 'url': 'https://supreme.justia.com/cases/federal/us/576/155/', 'holding': 'Content-based speech restrictions subject to strict scrutiny'},
-        {'case': 'New York Times Co. v. Sullivan, 376 U.S. 254 (1964)', 'url': 'https://supreme.justia.com/cases/federal/us/376/254/', 'holding': 'Actual malice standard for defamation of public figures'}
-    ],
-    'separation_of_powers': [
-        {'case': "Humphrey's Executor v. United States, 295 U.S. 602 (1935)", 'url': 'https://supreme.justia.com/cases/federal/us/295/602/', 'holding': 'Congress may limit presidential removal of certain officers'},
-        {'case': 'Seila Law LLC v. CFPB, 591 U.S. ___ (2020)', 'url': 'https://supreme.justia.com/cases/federal/us/591/19-7/', 'holding': 'Single-director removal restrictions unconstitutional'}
-    ],
-    'standing': [
-        {'case': 'Lujan v. Defenders of Wildlife, 504 U.S. 555 (1992)', 'url': 'https://supreme.justia.com/cases/federal/us/504/555/', 'holding': 'Article III standing requires injury, causation, redressability'},
-        {'case': 'TransUnion LLC v. Ramirez, 594 U.S. ___ (2021)', 'url': 'https://supreme.justia.com/cases/federal/us/594/20-297/', 'holding': 'Statutory violations alone insufficient for Article III standing'}
-    ]
-}
-
 SAMPLE_CASES = {
     'Louisiana v. Callais': {
         'docket': '24-109', 'posture': 'merits', 'issue': 'VRA Section 2 · Racial Gerrymandering',
@@ -396,102 +376,62 @@ SAMPLE_CASES = {
 }
 
 # ========================================
-# Helper Functions
+# Caching
 # ========================================
+# Streamlit reruns this script on every interaction (sidebar buttons, chat
+# messages), so expensive work is cached across reruns and sessions: parsed
+# PDFs by content hash, analyses and the rendered brief by text hash. The
+# rule set is compiled once when engine is first imported.
 
-def detect_posture(text):
-    lower_text = text.lower()
-    if 'petition for writ' in lower_text or 'cert petition' in lower_text: return 'cert'
-    if 'emergency application' in lower_text or 'stay pending' in lower_text: return 'emergency'
-    if 'merits brief' in lower_text or 'brief for petitioner' in lower_text: return 'merits'
-    if 'oral argument transcript' in lower_text: return 'backtest'
-    return 'cert'
-
-def extract_issues(text):
-    lower_text = text.lower()
-    return {
-        'voting_rights': any(kw in lower_text for kw in ['voting rights', 'vra', 'section 2', 'dilution']),
-        'equal_protection': any(kw in lower_text for kw in ['equal protection', '14th amendment', 'discrimination']),
-        'first_amendment': any(kw in lower_text for kw in ['first amendment', 'free speech', 'free exercise', 'establishment clause']),
-        'separation_of_powers': any(kw in lower_text for kw in ['separation of powers', 'removal', 'nondelegation', 'executive power']),
-        'standing': any(kw in lower_text for kw in ['standing', 'injury in fact', 'mootness', 'case or controversy']),
-        'due_process': any(kw in lower_text for kw in ['due process', 'procedural', 'substantive due process']),
-        'commerce_clause': any(kw in lower_text for kw in ['commerce clause', 'interstate commerce', 'dormant commerce']),
-        'preemption': any(kw in lower_text for kw in ['preemption', 'supremacy clause', 'federal preemption'])
-    }
+CACHE_TTL = int(os.environ.get('STREAMLIT_CACHE_TTL', '3600'))
+PDF_CACHE_ENTRIES = int(os.environ.get('STREAMLIT_PDF_CACHE_ENTRIES', '8'))
+ANALYSIS_CACHE_ENTRIES = int(os.environ.get('STREAMLIT_ANALYSIS_CACHE_ENTRIES', '64'))
+
+def text_key(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+# Arguments starting with an underscore are not hashed; the key stands in for them
+@st.cache_data(max_entries=PDF_CACHE_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def _extract_pdf_text_cached(pdf_key, _payload):
+    return pdf_extract.extract_pdf_text(_payload)
+
+@st.cache_data(max_entries=ANALYSIS_CACHE_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def _analyze_case_cached(key, title, _text, posture, docket):
+    return analyze_case_logic(_text, title, posture, docket)
+
+@st.cache_data(max_entries=ANALYSIS_CACHE_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def _brief_html_cached(case_key, _text):
+    return _text.replace('\n', '<br>')
+
+# ========================================
+# Helper Functions
+# ========================================
 
 def analyze_case_logic(text, title, posture, docket):
-    issues = extract_issues(text)
-    
-    # Tier Classification
-    text_len = len(text)
-    if text_len > 10000: tier = "A"
-    elif text_len > 1000: tier = "B"
-    else: tier = "C"
-
-    # Risk Assessment
-    high_risk_issues = ['standing', 'separation_of_powers']
-    has_high_risk = any(issues.get(issue) for issue in high_risk_issues)
-    
-    if tier == "C":
-        risk_level = "CAUTION"
-        primary_obstacle = "Insufficient materials for complete analysis"
-        rewrite = "Upload full petition and lower court decision for comprehensive evaluation"
-        dig_risk = "High"
-    elif has_high_risk:
-        risk_level = "CRITICAL"
-        primary_obstacle = "Potential jurisdictional or structural defect identified"
-        rewrite = "Address threshold issues before merits arguments"
-        dig_risk = "Medium"
-    else:
-        risk_level = "CAUTION"
-        primary_obstacle = "Standard appellate risks present; vehicle quality uncertain"
-        rewrite = "Strengthen circuit split documentation and vehicle presentation"
-        dig_risk = "Low"
-
-    # Risks detailed
-    risks = [
-        {'category': 'Vehicle Integrity', 'level': 'low' if tier == 'A' else 'medium', 'confidence': 'High' if tier == 'A' else 'Limited data'},
-        {'category': 'Circuit Split', 'level': 'medium', 'confidence': 'Requires verification'},
-        {'category': 'Preservation', 'level': 'medium' if tier != 'A' else 'low', 'confidence': 'Check full record'},
-        {'category': 'Mootness Risk', 'level': 'low' if posture != 'emergency' else 'high', 'confidence': 'Based on posture'}
-    ]
-
-    # Precedents
-    relevant_prec = []
-    for issue, present in issues.items():
-        if present and issue in PRECEDENTS:
-            relevant_prec.extend(PRECEDENTS[issue])
-    if not relevant_prec:
-        relevant_prec.append({'case': 'Marbury v. Madison, 5 U.S. 137 (1803)', 'holding': 'Foundational judicial review authority'})
-
-    # Traps & Counters
-    traps = []
-    if issues.get('standing'):
-        traps.append({'trap': 'Addressing merits extensively while leaving standing vulnerable', 'counter': 'Lead with concrete injury demonstration'})
-    if issues.get('voting_rights') and issues.get('equal_protection'):
-        traps.append({'trap': 'Conceding race predominated while relying on VRA compliance', 'counter': 'Contest predomination; argue traditional criteria'})
-    
-    if not traps:
-        traps.append({'trap': 'Over-relying on circuit split maturity', 'counter': 'Document specific contradictory holdings'})
+    """The shared engine pipeline plus the fields the dashboard shows alongside it"""
+    return {'title': title, 'docket': docket, **run_analysis(text, posture, docket)}
 
-    return {
-        'title': title, 'tier': tier, 'posture': posture, 'docket': docket,
-        'riskLevel': risk_level, 'primaryObstacle': primary_obstacle, 
-        'rewriteDirective': rewrite, 'digRisk': dig_risk,
-        'precedents': relevant_prec[:6], 'issues': issues, 'traps': traps[:4],
-        'risks': risks
-    }
+def analyze_case(text, title, posture, docket):
+    """analyze_case_logic memoized on the text hash (each call gets its own copy)"""
+    return _analyze_case_cached(cache_key(ENGINE_VERSION, text, posture, docket), title, text, posture, docket)
+
+def start_analysis(text, title, posture, docket):
+    st.session_state.analysis = analyze_case(text, title, posture, docket)
+    st.session_state.case_text = text
+    st.session_state.case_key = text_key(text)
+
+def brief_html(text):
+    return _brief_html_cached(st.session_state.get('case_key') or text_key(text), text)
 
 def extract_pdf_text(uploaded_file):
+    """PDF text memoized on the file's content hash, so re-uploads skip parsing"""
     text = ""
     try:
-        reader = PyPDF2.PdfReader(uploaded_file)
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
+        payload = uploaded_file.getvalue()
+        text = _extract_pdf_text_cached(hashlib.sha256(payload).hexdigest(), payload)
     except Exception as e:
         st.error(f"Error extracting PDF: {e}")
-    return text.strip()
+    return text
 
 # ========================================
 # Streamlit UI Components
@@ -644,9 +584,7 @@ def render_welcome_screen():
                 if st.button("Begin Analysis", key="up_btn", use_container_width=True, type="primary"):
                     with st.spinner("Analyzing..."):
                         text = extract_pdf_text(u_file)
-                        posture = detect_posture(text)
-                        st.session_state.analysis = analyze_case_logic(text, u_file.name, posture, "")
-                        st.session_state.case_text = text
+                        start_analysis(text, u_file.name, "auto", "")
                         st.rerun()
             st.markdown('</div>', unsafe_allow_html=True)
             
@@ -658,9 +596,7 @@ def render_welcome_screen():
             c_text = st.text_area("Case Materials", height=300, placeholder="Paste text here...")
             if st.button("Begin Analysis", key="paste_btn", use_container_width=True, type="primary"):
                 if c_text:
-                    posture = detect_posture(c_text)
-                    st.session_state.analysis = analyze_case_logic(c_text, c_title or "Untitled", posture, "")
-                    st.session_state.case_text = c_text
+                    start_analysis(c_text, c_title or "Untitled", "auto", "")
                     st.rerun()
             st.markdown('</div>', unsafe_allow_html=True)
 
@@ -710,8 +646,7 @@ def render_welcome_screen():
             </div>
             """, unsafe_allow_html=True)
             if st.button("Begin Analysis", key=f"btn_samp_{i}", use_container_width=True):
-                st.session_state.analysis = analyze_case_logic(data['text'], name, data['posture'], data['docket'])
-                st.session_state.case_text = data['text']
+                start_analysis(data['text'], name, data['posture'], data['docket'])
                 st.rerun()
 
 def render_analysis_dashboard():
@@ -726,6 +661,9 @@ def render_analysis_dashboard():
     """, unsafe_allow_html=True)
     
     col_left, col_right = st.columns([3, 2])
+    case_html = brief_html(st.session_state.get('case_text', ''))
+    primary_trap = next((item['text'] for item in ans['traps'] if item['type'] == 'trap'), 'N/A')
+    counter = next((item['text'] for item in ans['traps'] if item['type'] == 'counter'), 'N/A')
     
     with col_left:
         # 1. Brief Viewer
@@ -738,7 +676,7 @@ def render_analysis_dashboard():
                 Case Materials / Brief Viewer
             </div>
             <div style="font-size: 0.95rem; line-height: 1.6; color: var(--text-secondary); max-height: 500px; overflow-y: auto; background: var(--bg-secondary); padding: 1.5rem; border-radius: 8px;">
-                {st.session_state.get('case_text', '').replace('\n', '<br>')}
+                {case_html}
             </div>
         </div>
         """, unsafe_allow_html=True)
@@ -755,11 +693,11 @@ def render_analysis_dashboard():
             <div style="display: flex; flex-direction: column; gap: 1rem;">
                 <div style="padding: 1rem; background: rgba(239, 68, 68, 0.05); border-left: 3px solid #ef4444; border-radius: 4px;">
                     <span style="font-size: 0.7rem; font-weight: 700; color: #ef4444; text-transform: uppercase;">Primary Trap</span>
-                    <p style="font-size: 0.9rem; color: var(--text-primary); margin: 0.25rem 0;">{ans['traps'][0] if ans['traps'] else 'N/A'}</p>
+                    <p style="font-size: 0.9rem; color: var(--text-primary); margin: 0.25rem 0;">{primary_trap}</p>
                 </div>
                 <div style="padding: 1rem; background: rgba(34, 197, 94, 0.05); border-left: 3px solid #22c55e; border-radius: 4px;">
                     <span style="font-size: 0.7rem; font-weight: 700; color: #22c55e; text-transform: uppercase;">Counter-Strategy</span>
-                    <p style="font-size: 0.9rem; color: var(--text-primary); margin: 0.25rem 0;">{ans['traps'][1] if len(ans['traps']) > 1 else 'N/A'}</p>
+                    <p style="font-size: 0.9rem; color: var(--text-primary); margin: 0.25rem 0;">{counter}</p>
                 </div>
             </div>
         </div>
@@ -779,7 +717,7 @@ def render_analysis_dashboard():
         for p in ans['precedents']:
             st.markdown(f"""
             <div style="padding: 0.75rem; background: var(--bg-secondary); border-radius: 6px; border-left: 3px solid var(--gold-primary); margin-bottom: 0.5rem;">
-                <div style="font-size: 0.85rem; font-weight: 600; color: var(--gold-light);">{p}</div>
+                <div style="font-size: 0.85rem; font-weight: 600; color: var(--gold-light);">{p['case']}</div>
                 <div style="font-size: 0.75rem; color: var(--text-tertiary);">Relevance: Direct · Reliability: High</div>
             </div>
             """, unsafe_allow_html=True)
@@ -796,8 +734,9 @@ def render_analysis_dashboard():
             </div>
             <div style="display: flex; flex-direction: column; gap: 0.5rem;">
         """, unsafe_allow_html=True)
-        for cat, risk in ans['risks'].items():
-            color = "#ef4444" if risk == "High" else "#f59e0b" if risk == "Medium" else "#22c55e"
+        for item in ans['risks']:
+            cat, risk = item['category'], item['level']
+            color = "#ef4444" if risk == "high" else "#f59e0b" if risk == "medium" else "#22c55e"
             st.markdown(f"""
             <div style="display: flex; justify-content: space-between; align-items: center; padding: 0.75rem; background: var(--bg-secondary); border-radius: 6px;">
                 <span style="font-size: 0.85rem; color: var(--text-primary);">{cat}</span>
@@ -822,6 +761,7 @@ def render_analysis_dashboard():
     
     j_sel = st.session_state.get('selected_justice', 'roberts')
     j_data = JUSTICES[j_sel]
+    j_question = JUSTICE_REGISTRY.question(j_sel, ans['issues'])
     
     j_col1, j_col2 = st.columns([1, 2])
     with j_col1:
@@ -838,10 +778,10 @@ def render_analysis_dashboard():
         <div style="padding: 1.5rem; background: var(--navy-primary); border-radius: 8px; border-left: 4px solid var(--gold-primary);">
             <div style="font-size: 0.7rem; font-weight: 700; color: var(--gold-primary); text-transform: uppercase; margin-bottom: 0.5rem;">Predictive Oral Argument Question</div>
             <p style="font-size: 1rem; color: var(--text-primary); font-style: italic; font-family: var(--font-serif); margin-bottom: 1rem;">
-                "{ans['questions'].get(j_sel, "How does the proposed rule reconcile with the principles of constitutional structure and historical practice in this domain?")}"
+                "{j_question['question']}"
             </p>
             <div style="font-size: 0.8rem; color: var(--text-tertiary);">
-                <strong style="color: #f59e0b;">Strategic Pressure:</strong> This line of questioning tests the doctrinal limits of your argument's proposed framework.
+                <strong style="color: #f59e0b;">Strategic Pressure:</strong> {j_question['pressure']}.
             </div>
         </div>
         """, unsafe_allow_html=True)
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from analysis_cache import AnalysisCache, cache_key, make_etag
+
+
+def test_cache_key_separates_fields():
+    assert cache_key('1', 'ab', 'auto', 'c') != cache_key('1', 'a', 'auto', 'bc')
+    assert cache_key('1', 'text', 'auto', '') == cache_key('1', 'text', 'auto', '')
+    assert cache_key('1', 'text', 'auto', '') != cache_key('2', 'text', 'auto', '')
+    assert make_etag(cache_key('1', 't', 'auto', ''), 'A') != make_etag(cache_key('1', 't', 'auto', ''), 'B')
+
+
+def test_lru_bounds_entries_and_bytes(tmp_path):
+    cache = AnalysisCache(max_entries=3, max_bytes=10_000)
+    for index in range(5):
+        cache.put(str(index), {'value': index})
+    assert cache.get('0') is None
+    assert cache.get('4') == {'value': 4}
+    assert cache.stats()['entries'] == 3
+
+    cache = AnalysisCache(max_entries=100, max_bytes=100)
+    cache.put('big', {'blob': 'x' * 200})
+    assert cache.get('big') is None
+
+    disk = AnalysisCache(max_entries=1, directory=str(tmp_path))
+    disk.put('a', {'value': 'a'})
+    disk.put('b', {'value': 'b'})
+    assert disk.get('a') == {'value': 'a'}
+    assert disk.stats()['diskHits'] == 1
+
+
+@pytest.fixture(scope='module')
+def client():
+    backend = pytest.importorskip('backend')
+    return backend.app.test_client()
+
+
+@pytest.mark.parametrize('body, status', [
+    ({'text': 'x', 'posture': None}, 200),
+    ({'text': 'x', 'docket': 24109}, 200),
+    ({'text': 'x', 'title': 7, 'docket': None}, 200),
+    ({'text': 'x', 'posture': 3}, 400),
+    ({'text': 5}, 400),
+    ({'text': 'x', 'docket': [1]}, 400),
+])
+def test_analyze_input_types(client, body, status):
+    assert client.post('/api/analyze', json=body).status_code == status
+
+
+def test_batch_reports_bad_items_inline(client):
+    lines = client.post('/api/analyze/batch', json={'items': [{'text': 'x', 'posture': None},
+                                                              {'text': 'x', 'posture': 1}]}).get_data(as_text=True)
+    assert '"posture must be a string"' in lines
+    assert '"errors":1' in lines
+
+
+def test_not_modified_returns_the_new_session_id(client):
+    body = {'text': 'The petitioner lacks standing.', 'title': 'Doe'}
+    etag = client.post('/api/analyze', json=body).headers['ETag']
+    response = client.post('/api/analyze', json={**body, 'sessionId': None}, headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    session = pytest.importorskip('backend').SESSIONS.get(response.headers['X-Session-Id'])
+    assert session['analysis']['title'] == 'Doe'
+    assert client.post('/api/analyze', json=body, headers={'If-None-Match': etag}).headers.get('X-Session-Id') is None
+
+
+def test_batch_titles_match_analyze(client):
+    items = [{'text': 'x', 'title': 7}, {'text': 'y', 'title': None}, {'text': 'z'}]
+    lines = [json.loads(line) for line in client.post('/api/analyze/batch', json={'items': items}).get_data().splitlines()]
+    expected = [client.post('/api/analyze', json=item).get_json()['title'] for item in items]
+    assert expected == ['7', 'Untitled Case', 'Untitled Case']
+    assert [line['title'] for line in lines[:-1]] == expected
+    assert sorted(entry['title'] for entry in lines[-1]['triage']) == sorted(expected)
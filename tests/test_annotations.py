@@ -0,0 +1,51 @@
+from annotations import BriefAnnotator, split_sentences
+from engine import SCANNER
+from justices import ISSUE_AFFINITY
+
+ANNOTATOR = BriefAnnotator(SCANNER)
+
+
+def sentences(text):
+    _, starts = split_sentences(text)
+    return [text[start:end].strip() for start, end in zip(starts, starts[1:] + [len(text)])]
+
+
+def test_sentences_skip_abbreviations_and_initials():
+    text = 'See Shaw v. Reno, 509 U.S. 630 (1993). J. Smith agreed. Is it moot? Yes.\n\nNew section.'
+    assert sentences(text) == ['See Shaw v. Reno, 509 U.S. 630 (1993).', 'J. Smith agreed.',
+                               'Is it moot?', 'Yes.', 'New section.']
+
+
+def test_spans_cover_the_triggering_sentence():
+    text = 'We begin with the facts. The plaintiffs lack standing to sue. The end.'
+    spans = ANNOTATOR.annotate(text)['spans']
+    pressing = {justice_id for justice_id, affinity in ISSUE_AFFINITY.items() if affinity.get('standing')}
+    assert {span['justice'] for span in spans} == pressing
+    for span in spans:
+        assert text[span['start']:span['end']] == 'The plaintiffs lack standing to sue.'
+        assert span['issues'] == ['standing']
+        assert span['type'] == ('concern' if ISSUE_AFFINITY[span['justice']]['standing'] >= 1.0 else 'caution')
+
+
+def test_sections_and_span_order():
+    text = 'Intro.\n\nThe Voting Rights Act applies. Free speech too.'
+    result = ANNOTATOR.annotate(text)
+    assert [text[s['start']:s['end']] for s in result['sections']] == ['Intro.', text.split('\n\n')[1]]
+    starts = [span['start'] for span in result['spans']]
+    assert starts == sorted(starts)
+    assert all(span['section'] == 1 for span in result['spans'])
+
+
+def test_utf16_offsets_count_astral_characters_twice():
+    text = '\U0001F4DC Preamble. The plaintiffs lack standing.'
+    plain = ANNOTATOR.annotate(text)['spans'][0]
+    utf16 = ANNOTATOR.annotate(text, utf16=True)['spans'][0]
+    assert (utf16['start'], utf16['end']) == (plain['start'] + 1, plain['end'] + 1)
+    encoded = text.encode('utf-16-le')
+    assert encoded[utf16['start'] * 2:utf16['end'] * 2].decode('utf-16-le') == 'The plaintiffs lack standing.'
+
+
+def test_lowercasing_that_changes_length_keeps_offsets():
+    text = 'İİ The plaintiffs lack standing.'
+    span = ANNOTATOR.annotate(text)['spans'][0]
+    assert text[span['start']:span['end']] == text
@@ -0,0 +1,40 @@
+import asyncio
+import json
+
+import asgi
+
+
+def call(path, chunks, headers=(), max_body=asgi.MAX_UPLOAD_BYTES):
+    """Run one request through the adapter, its body sent as the given chunks"""
+    adapter = asgi.ASGIAdapter(asgi.app, max_body=max_body)
+    scope = {'type': 'http', 'method': 'POST', 'path': path, 'query_string': b'', 'http_version': '1.1',
+             'headers': [(b'content-type', b'application/json'), *headers]}
+    messages = [{'type': 'http.request', 'body': chunk, 'more_body': index < len(chunks) - 1}
+                for index, chunk in enumerate(chunks)]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(adapter(scope, receive, send))
+    return sent[0]['status'], b''.join(message.get('body', b'') for message in sent[1:])
+
+
+def test_body_chunks_stream_to_the_app():
+    body = json.dumps({'text': 'The petitioner lacks standing under Article III. ' * 50}).encode()
+    chunks = [body[start:start + 500] for start in range(0, len(body), 500)]
+    whole = call('/api/analyze', [body], [(b'content-length', str(len(body)).encode())])
+    # Chunked transfer: no Content-Length, the body ends with the last chunk
+    streamed = call('/api/analyze', chunks)
+    assert whole[0] == streamed[0] == 200
+    assert json.loads(whole[1])['issues'] == json.loads(streamed[1])['issues']
+
+
+def test_body_size_cap_applies_while_streaming():
+    assert call('/api/analyze', [b'x' * 5000], max_body=3000)[0] == 413
+    assert call('/api/analyze', [b'x' * 1000] * 5, max_body=3000)[0] == 413
+    declared = [(b'content-length', b'5000')]
+    assert call('/api/analyze', [b'x' * 1000], declared, max_body=3000)[0] == 413
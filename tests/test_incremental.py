@@ -0,0 +1,63 @@
+import random
+
+from engine import PRECEDENT_INDEX, SCANNER, run_analysis
+from incremental import DocumentSessions
+from precedent_index import tokenize
+
+SENTENCES = [
+    'The petitioner lacks standing because the injury is speculative.',
+    'Section 2 of the Voting Rights Act forbids vote dilution.',
+    'The First Amendment protects free speech in a public forum.',
+    'Congress exceeded its power under the Commerce Clause.',
+    'The agency violated the separation of powers and the nondelegation doctrine.',
+    'Federal law preempts the state statute under the Supremacy Clause.',
+    'The original public meaning of the text controls; pretext does not.',
+    'Due process requires notice and a hearing before deprivation.',
+    'The court of appeals created a circuit split with the Fifth Circuit.',
+    'Equal protection forbids racial gerrymandering, as in Shaw v. Reno.',
+]
+
+
+def paragraph(rng):
+    return ' '.join(rng.choices(SENTENCES, k=rng.randint(1, 4)))
+
+
+def sessions():
+    return DocumentSessions(SCANNER, tokenize, PRECEDENT_INDEX.select_terms)
+
+
+def incremental_analysis(documents, text):
+    scan, terms, stats = documents.update('doc', text)
+    return run_analysis(text, 'auto', '', scan=scan, terms=terms), stats
+
+
+def test_edits_match_full_analysis():
+    rng = random.Random(0)
+    documents = sessions()
+    paragraphs = [paragraph(rng) for _ in range(12)]
+    for _ in range(40):
+        action = rng.choice(('edit', 'insert', 'delete', 'duplicate', 'move'))
+        index = rng.randrange(len(paragraphs))
+        if action == 'edit':
+            paragraphs[index] = paragraph(rng)
+        elif action == 'insert':
+            paragraphs.insert(index, paragraph(rng))
+        elif action == 'delete' and len(paragraphs) > 1:
+            del paragraphs[index]
+        elif action == 'duplicate':
+            paragraphs.append(paragraphs[index])
+        else:
+            paragraphs.append(paragraphs.pop(index))
+        text = '\n\n'.join(paragraphs)
+        analysis, _ = incremental_analysis(documents, text)
+        assert analysis == run_analysis(text, 'auto', ''), action
+
+
+def test_only_changed_paragraphs_are_rescanned():
+    documents = sessions()
+    paragraphs = SENTENCES[:6]
+    _, stats = incremental_analysis(documents, '\n\n'.join(paragraphs))
+    assert stats == {'paragraphs': 6, 'rescanned': 6, 'removed': 0}
+    paragraphs = paragraphs[:5] + [SENTENCES[7]]
+    _, stats = incremental_analysis(documents, '\n\n'.join(paragraphs))
+    assert stats == {'paragraphs': 6, 'rescanned': 1, 'removed': 1}
@@ -0,0 +1,47 @@
+import pytest
+
+import backend
+import intents
+from intents import IntentRouter
+
+ROUTER = backend.CHAT_ROUTER
+
+
+def resolve(message):
+    intent = ROUTER.resolve(message)
+    return intent and intent['intent']
+
+
+@pytest.mark.parametrize('message, expected', [
+    ('What if the respondent concedes the facts?', 'hypothetical'),
+    ('Can you rewrite the question presented?', 'rewrite'),
+    ('Is there a circuit split here, and what would Kagan think?', 'circuit_split'),
+    ('Does standing hold up, and how would Shaw v. Reno bear on it?', 'jurisdiction'),
+    ('What would Justice Gorsuch ask?', 'justice:gorsuch'),
+    ('What if Gorsuch reads the statute narrowly?', 'hypothetical'),
+    ('Summarize the free speech problems', 'issue:first_amendment'),
+])
+def test_phrase_priority_follows_table_order(message, expected):
+    assert resolve(message) == expected
+
+
+def test_framework_intents_come_first():
+    assert [intent['intent'] for intent in backend.CHAT_INTENTS[:4]] == \
+        ['hypothetical', 'rewrite', 'circuit_split', 'jurisdiction']
+
+
+def test_phrases_match_whole_words_only():
+    assert resolve('Notwithstanding the text, proceed') is None
+
+
+def test_term_overlap_without_phrase():
+    assert resolve('Help me reframe the wording') == 'rewrite'
+    assert resolve('Walk me through the record below.') is None
+
+
+def test_terms_shared_by_many_intents_are_not_scored():
+    table = [{'intent': str(index), 'phrases': [], 'terms': ['common', f'unique{index}']}
+             for index in range(intents.MAX_TERM_INTENTS + 1)]
+    router = IntentRouter(table)
+    assert router.resolve('common') is None
+    assert router.resolve('unique3')['intent'] == '3'
@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+
+from jobs import JobQueue, QueueFull
+
+
+class FailingStore:
+    def set(self, key, value):
+        raise ConnectionError('store down')
+
+    def get(self, key):
+        return None
+
+
+def wait_done(job, timeout=5):
+    version = job.version
+    while not job.done:
+        version = job.wait(version, timeout)
+    return job
+
+
+def test_queue_depth_and_bytes_are_bounded():
+    release = threading.Event()
+    queue = JobQueue(workers=1, max_queued=2, max_bytes=100)
+    running = queue.submit('block', lambda job: release.wait(5), size=10)
+    while running.status != 'running':
+        running.wait(running.version, 1)
+
+    queue.submit('a', lambda job: 'a', size=40)
+    with pytest.raises(QueueFull):
+        queue.submit('big', lambda job: 'big', size=60)
+    queue.submit('b', lambda job: 'b', size=10)
+    with pytest.raises(QueueFull):
+        queue.submit('c', lambda job: 'c')
+    stats = queue.stats()
+    assert (stats['queued'], stats['heldBytes'], stats['rejected']) == (2, 60, 2)
+    release.set()
+
+
+def test_results_errors_and_progress():
+    queue = JobQueue(workers=2)
+
+    def run(job):
+        job.update(pages=1)
+        job.update(total=2)
+        return {'ok': True}
+
+    def fail(job):
+        raise ValueError('bad brief')
+
+    done = wait_done(queue.submit('ok', run))
+    failed = wait_done(queue.submit('fail', fail))
+    assert done.to_dict()['result'] == {'ok': True}
+    assert done.progress == {'pages': 1, 'total': 2}
+    assert failed.to_dict()['error'] == 'bad brief'
+    assert 'result' not in failed.to_dict()
+
+
+def test_store_outage_does_not_fail_submit_or_job():
+    queue = JobQueue(workers=1, shared=FailingStore())
+    job = queue.submit('ok', lambda job: 42)
+    assert wait_done(job).result == 42
+    assert job.status == 'done'
+    assert queue.stats()['publishErrors'] >= 1
+
+
+def test_retained_results_are_bounded_by_bytes():
+    queue = JobQueue(workers=1, max_result_bytes=250)
+    jobs = [wait_done(queue.submit('upload', lambda job: {'text': 'x' * 100})) for _ in range(4)]
+    assert [queue.get(job.id) is not None for job in jobs] == [False, False, True, True]
+    assert queue.stats()['resultBytes'] == 2 * jobs[-1].result_size <= 250
+
+    # A result larger than the whole budget is still kept until the next one finishes
+    big = wait_done(queue.submit('upload', lambda job: {'text': 'x' * 1000}))
+    assert queue.get(big.id) is big
+    assert queue.stats()['resultBytes'] == big.result_size
@@ -0,0 +1,28 @@
+import pytest
+
+import backend
+
+
+@pytest.fixture
+def client():
+    return backend.app.test_client()
+
+
+def test_bench_ranks_all_nine_from_context(client):
+    context = {'issues': {'vra': True}, 'keywordHits': {'history': 2, 'bogus': 'x'}}
+    body = client.post('/api/simulate/bench', json={'context': context}).get_json()
+    assert len(body['justices']) == 9
+    assert body['posture'] == 'cert'
+
+
+@pytest.mark.parametrize('context, error', [
+    ('abc', 'context must be an object'),
+    ({'issues': 'abc'}, 'context.issues must be an object'),
+    ({'keywordHits': ['history']}, 'context.keywordHits must be an object'),
+    ({'posture': 3}, 'context.posture must be a string'),
+])
+def test_malformed_context_is_a_bad_request(client, context, error):
+    for path in ('/api/simulate/bench', '/api/simulate'):
+        response = client.post(path, json={'context': context})
+        assert response.status_code == 400
+        assert response.get_json()['error'] == error
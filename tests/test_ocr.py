@@ -0,0 +1,107 @@
+import hashlib
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip('PyPDF2')
+Image = pytest.importorskip('PIL.Image')
+ImageDraw = pytest.importorskip('PIL.ImageDraw')
+
+import ocr
+import pdf_extract
+from analysis_cache import AnalysisCache
+
+
+class StubBackend(ocr.OCRBackend):
+    """Reads a page as a digest of its first image; blocks until `release` is set, if given"""
+
+    name = 'stub'
+
+    def __init__(self, release: threading.Event = None, available: bool = True):
+        self.release = release
+        self.is_available = available
+        self.calls = 0
+
+    def available(self) -> bool:
+        return self.is_available
+
+    def recognize(self, images: list) -> str:
+        self.calls += 1
+        if self.release is not None:
+            self.release.wait(5)
+        return 'scanned ' + hashlib.sha1(images[0]).hexdigest()[:8]
+
+
+def scanned_pdf(pages: int) -> bytes:
+    """A PDF of image-only pages (no text layer), each image distinct"""
+    images = []
+    for index in range(pages):
+        image = Image.new('L', (200, 100), 255)
+        ImageDraw.Draw(image).text((10, 10 + index * 5), f'page {index}', fill=0)
+        images.append(image)
+    buffer = io.BytesIO()
+    images[0].save(buffer, format='PDF', save_all=True, append_images=images[1:])
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def use_backend(monkeypatch):
+    """Install a backend as OCR_BACKEND, with a fresh cache and an in-process pool"""
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(ocr, '_backends', {})
+    monkeypatch.setattr(ocr, 'OCR_CACHE', AnalysisCache(max_entries=64, max_bytes=1024 * 1024))
+    monkeypatch.setattr(ocr, 'get_pool', lambda: pool)
+
+    def install(backend, spec='stub'):
+        monkeypatch.setattr(ocr, 'OCR_BACKEND', spec)
+        if backend is not None:
+            monkeypatch.setitem(ocr.BACKENDS, spec, lambda: backend)
+        return backend
+
+    yield install
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def events(payload: bytes, pages: int) -> list:
+    return list(pdf_extract.iter_pdf_events(payload, pages, page_timeout=0))
+
+
+def test_pages_without_text_are_recognized_in_order(use_backend):
+    backend = use_backend(StubBackend())
+    payload = scanned_pdf(3)
+    pages = [event for event in events(payload, 3) if 'page' in event]
+    assert [event['page'] for event in pages] == [1, 2, 3]
+    assert all(event['ocr'] and event['text'].startswith('scanned ') for event in pages)
+    assert len({event['text'] for event in pages}) == 3
+
+    # A second pass is answered from the OCR cache
+    progress = pdf_extract.DocumentProgress(3)
+    again = [event for event in pdf_extract.iter_pdf_events(payload, 3, page_timeout=0, progress=progress)
+             if 'page' in event]
+    assert again == pages
+    assert backend.calls == 3
+    assert (progress.ocr_pages, progress.ocr_cached) == (3, 3)
+
+
+def test_pool_timeout_yields_an_empty_page(use_backend, monkeypatch):
+    release = threading.Event()
+    use_backend(StubBackend(release))
+    monkeypatch.setattr(ocr, 'OCR_PAGE_TIMEOUT', 0.1)
+    monkeypatch.setattr(ocr, 'PROGRESS_INTERVAL', 0.05)
+    monkeypatch.setattr(pdf_extract, 'POOL_GRACE', 0.1)
+    try:
+        result = events(scanned_pdf(1), 1)
+    finally:
+        release.set()
+    # Progress keeps the stream alive while waiting; the page is given up, not the document
+    assert any('progress' in event for event in result)
+    assert result[-1] == {'page': 1, 'text': '', 'ocr': True}
+
+
+@pytest.mark.parametrize('spec, backend', [('none', None), ('stub', StubBackend(available=False))])
+def test_disabled_or_unavailable_backend_skips_ocr(use_backend, spec, backend):
+    use_backend(backend, spec)
+    assert events(scanned_pdf(2), 2) == [{'page': 1, 'text': ''}, {'page': 2, 'text': ''}]
+    assert backend is None or backend.calls == 0
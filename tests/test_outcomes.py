@@ -0,0 +1,46 @@
+from itertools import product
+
+import pytest
+
+import backend
+import outcomes
+from engine import DIG_RISKS, ISSUE_KEYWORDS, RISK_LEVELS, assess_risk
+
+pytest.importorskip('numpy')
+
+
+def test_risk_tables_cover_every_level_the_engine_emits():
+    assert set(outcomes.RISK_SHIFT) == set(RISK_LEVELS)
+    assert set(outcomes.DIG_RATES) == set(DIG_RISKS)
+    for tier, posture, flagged in product('ABC', ('merits', 'emergency'), [(), ('standing',), ('separation_of_powers',)]):
+        risk = assess_risk('', {issue: issue in flagged for issue in ISSUE_KEYWORDS}, tier, posture)
+        assert risk['level'] in RISK_LEVELS
+        assert risk['dig_risk'] in DIG_RISKS
+
+
+def test_unknown_levels_fail_loudly():
+    with pytest.raises(KeyError):
+        outcomes.simulate([0.0] * 9, 'STRONG', 'Medium', samples=100)
+    with pytest.raises(KeyError):
+        outcomes.simulate([0.0] * 9, 'CAUTION', 'Unknown', samples=100)
+
+
+def test_simulation_is_reproducible():
+    first = outcomes.simulate([0.5] * 9, 'CAUTION', 'Low', samples=30_000, seed=7)
+    assert first == outcomes.simulate([0.5] * 9, 'CAUTION', 'Low', samples=30_000, seed=7)
+    assert outcomes.simulate([0.5] * 9, 'CRITICAL', 'Low', samples=30_000, seed=7)['grant'] < first['grant']
+
+
+def test_route_rejects_unknown_context_levels():
+    client = backend.app.test_client()
+    response = client.post('/api/simulate/outcomes', json={'context': {'riskLevel': 'STRONG'}, 'samples': 100})
+    assert response.status_code == 400
+    response = client.post('/api/simulate/outcomes', json={'context': {'riskLevel': 'CRITICAL'}, 'samples': 100})
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('context', ['abc', {'issues': 'abc'}, {'keywordHits': 3}, {'riskLevel': ['CAUTION']},
+                                     {'digRisk': {'Low': 1}}])
+def test_route_rejects_malformed_context(context):
+    response = backend.app.test_client().post('/api/simulate/outcomes', json={'context': context, 'samples': 100})
+    assert response.status_code == 400
@@ -0,0 +1,76 @@
+"""
+The API and the Streamlit app must produce identical analyses.
+
+The API side goes through POST /api/analyze, the Streamlit side through
+analyze_case_logic; both call engine.run_analysis. Fields only one front
+end adds (title, docket, timestamp) are left out of the comparison.
+Timings are in benchmark.py ('analysis entry points').
+"""
+
+import os
+
+import pytest
+
+# Importing the Streamlit script outside `streamlit run` logs a warning per call
+os.environ.setdefault('STREAMLIT_LOGGER_LEVEL', 'error')
+
+streamlit_app = pytest.importorskip('streamlit_app')
+
+import backend
+import engine
+import serialization
+from benchmark import make_brief
+
+API_ONLY = ('title', 'timestamp')
+STREAMLIT_ONLY = ('title', 'docket')
+
+# Input tier thresholds in engine.classify_tier
+TIER_BOUNDARIES = (0, 1, 1000, 1001, 10000, 10001)
+
+
+def corpus():
+    """Yield (label, text, posture, docket) covering tiers, postures, issues and sample cases"""
+    for name, case in streamlit_app.SAMPLE_CASES.items():
+        yield f'sample {name}', case['text'], case['posture'], case['docket']
+
+    for length in TIER_BOUNDARIES:
+        text = (make_brief(length + 1024, seed=length) * 2)[:length]
+        yield f'{length} chars', text, 'auto', ''
+
+    for seed, size in enumerate((200, 1500, 12000, 100_000)):
+        for posture in ('auto', 'cert', 'merits', 'emergency', 'backtest'):
+            yield f'{size}B {posture}', make_brief(size, seed=seed), posture, '24-109' if seed % 2 else ''
+
+    for issue, keywords in engine.ISSUE_KEYWORDS.items():
+        yield f'issue {issue}', ' and '.join(keywords).upper(), 'auto', ''
+
+    for posture, markers in engine.POSTURE_MARKERS.items():
+        yield f'posture {posture}', f'{markers[0].title()}. Standing and removal are disputed.', 'auto', ''
+
+    yield 'non-ascii', 'İSTANBUL v. ÇELİK — Fourteenth Amendment “equal protection”; § 1983 standing. ' * 40, 'auto', ''
+
+
+CASES = list(corpus())
+
+
+@pytest.fixture(scope='module')
+def client():
+    return backend.app.test_client()
+
+
+def api_analysis(client, text: str, posture: str, docket: str) -> dict:
+    response = client.post('/api/analyze', json={'text': text, 'posture': posture, 'docket': docket})
+    body = response.get_json()
+    return {key: value for key, value in body.items() if key not in API_ONLY}
+
+
+def streamlit_analysis(text: str, posture: str, docket: str) -> dict:
+    analysis = streamlit_app.analyze_case_logic(text, 'Parity', posture, docket)
+    # Compare what the API would serialize
+    return {key: value for key, value in serialization.loads(serialization.encode(analysis)).items()
+            if key not in STREAMLIT_ONLY}
+
+
+@pytest.mark.parametrize('text, posture, docket', [case[1:] for case in CASES], ids=[case[0] for case in CASES])
+def test_api_and_streamlit_agree(client, text, posture, docket):
+    assert api_analysis(client, text, posture, docket) == streamlit_analysis(text, posture, docket)
@@ -0,0 +1,76 @@
+import io
+import signal
+import time
+from types import SimpleNamespace
+
+import pytest
+
+PyPDF2 = pytest.importorskip('PyPDF2')
+
+import ocr
+import pdf_extract
+from benchmark import make_pdf
+
+
+def pdf_with_bad_page(pages: int, bad: int) -> bytes:
+    """A generated PDF whose page `bad` raises on extraction (unsupported stream filter)"""
+    writer = PyPDF2.PdfWriter()
+    for page in PyPDF2.PdfReader(io.BytesIO(make_pdf(pages))).pages:
+        writer.add_page(page)
+    contents = writer.pages[bad]['/Contents'].get_object()
+    contents[PyPDF2.generic.NameObject('/Filter')] = PyPDF2.generic.NameObject('/BogusDecode')
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+class SlowPage:
+    def __init__(self, text: str, seconds: float = 0):
+        self.text = text
+        self.seconds = seconds
+
+    def extract_text(self) -> str:
+        time.sleep(self.seconds)
+        return self.text
+
+
+@pytest.fixture(autouse=True)
+def no_ocr(monkeypatch):
+    monkeypatch.setattr(ocr, '_backends', {})
+    monkeypatch.setattr(ocr, 'OCR_BACKEND', 'none')
+
+
+def test_failing_page_is_empty_and_order_is_kept():
+    pages = list(pdf_extract.iter_pdf_pages(pdf_with_bad_page(4, bad=1), 4))
+    assert [index for index, _ in pages] == [0, 1, 2, 3]
+    assert [bool(text) for _, text in pages] == [True, False, True, True]
+
+
+def test_page_alarm_interrupts_a_slow_page(monkeypatch):
+    reader = SimpleNamespace(pages=[SlowPage('first'), SlowPage('stuck', seconds=5), SlowPage('third')])
+    monkeypatch.setattr(pdf_extract, '_open_reader', lambda payload: reader)
+    handler = signal.getsignal(signal.SIGALRM)
+    started = time.monotonic()
+    pages = list(pdf_extract.iter_pdf_pages(b'', 3, page_timeout=0.2))
+    assert time.monotonic() - started < 2
+    assert pages == [(0, 'first'), (1, ''), (2, 'third')]
+    assert signal.getsignal(signal.SIGALRM) is handler
+
+
+def test_parallel_extraction_matches_inline(monkeypatch, tmp_path):
+    payload = pdf_with_bad_page(20, bad=7)
+    inline = list(pdf_extract.iter_pdf_pages(payload, 20))
+
+    # Several page ranges over two workers; the document goes to them as a spilled file
+    monkeypatch.setattr(pdf_extract, 'WORKERS', 2)
+    monkeypatch.setattr(pdf_extract, 'CHUNK_PAGES', 3)
+    monkeypatch.setattr(pdf_extract, 'SPILL_BYTES', 0)
+    monkeypatch.setattr(pdf_extract, '_pool', None)
+    assert not pdf_extract._parse_inline(20, pdf_extract.PAGE_TIMEOUT)
+    try:
+        parallel = list(pdf_extract.iter_pdf_pages(payload, 20, spill_dir=str(tmp_path)))
+    finally:
+        pdf_extract._get_pool().shutdown()
+    assert parallel == inline
+    assert parallel[7] == (7, '')
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,42 @@
+import random
+import sqlite3
+
+import pytest
+
+import engine
+from benchmark import make_corpus
+from precedent_index import PrecedentIndex
+from precedent_store import PrecedentStore, build_store, records_from_table
+
+
+def queries(index: PrecedentIndex, seed: int = 0):
+    """Briefs quoting a few holdings, each with a different set of flagged issues"""
+    rng = random.Random(seed)
+    issues = list(engine.ISSUE_KEYWORDS)
+    for _ in range(12):
+        text = ' '.join(doc['holding'] for doc in rng.sample(index.docs, min(3, len(index.docs))))
+        chosen = rng.sample(issues, rng.randrange(3))
+        yield text, {issue: issue in chosen for issue in issues}
+
+
+@pytest.mark.parametrize('table', [engine.PRECEDENTS, make_corpus(1500)], ids=['builtin', 'synthetic'])
+def test_store_matches_index(tmp_path, table):
+    index = PrecedentIndex(table)
+    path = str(tmp_path / 'precedents.db')
+    assert build_store(records_from_table(table), path) == len(index.docs)
+    store = PrecedentStore(path)
+
+    for text, flagged in queries(index):
+        terms = index.query_terms(text)
+        assert store.query_terms(text) == terms
+        for limit in (1, 6, 20):
+            # Same precedents, same order, same scores to the last bit
+            assert store.search(terms, flagged, limit) == index.search(terms, flagged, limit)
+    assert store.search({}, {}) == index.search({}, {}) == []
+
+
+def test_old_store_must_be_rebuilt(tmp_path):
+    path = str(tmp_path / 'old.db')
+    sqlite3.connect(path).close()
+    with pytest.raises(ValueError, match='rebuild'):
+        PrecedentStore(path).query_terms('standing')
@@ -0,0 +1,55 @@
+import copy
+import json
+import pickle
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+import serialization
+from engine import run_analysis
+from results import IssueFlags, JusticeQuestion, Precedent, Risk, Trap
+
+PRECEDENT = Precedent('Shaw v. Reno, 509 U.S. 630 (1993)', 'https://example.test', 'High', 'Medium', 4.5)
+
+
+def test_records_read_like_dicts():
+    assert PRECEDENT['case'].startswith('Shaw')
+    assert PRECEDENT.get('score') == 4.5
+    assert PRECEDENT.get('missing') is None
+    assert dict(PRECEDENT) == {'case': PRECEDENT.case, 'url': 'https://example.test', 'relevance': 'High',
+                               'risk': 'Medium', 'score': 4.5}
+    assert list(Trap('trap', 'x')) == ['type', 'text']
+    with pytest.raises(KeyError):
+        Risk('a', 'b', 'c')['missing']
+
+
+def test_records_are_immutable():
+    with pytest.raises(FrozenInstanceError):
+        PRECEDENT.score = 0.0
+    with pytest.raises(TypeError):
+        PRECEDENT['score'] = 0.0
+
+
+@pytest.mark.parametrize('backend', sorted(serialization.ENCODERS))
+def test_every_json_backend_encodes_records_as_objects(backend):
+    record = JusticeQuestion('kagan', 'Justice Kagan', 'focus', 'Why?', 'pressure', 1.25)
+    payload = {'precedents': [PRECEDENT], 'question': record, 'issues': IssueFlags({'standing': True})}
+    expected = {'precedents': [dict(PRECEDENT)], 'question': dict(record), 'issues': {'standing': True}}
+    assert json.loads(serialization.ENCODERS[backend](payload)) == expected
+
+
+def test_issue_flags_are_read_only_and_picklable():
+    flags = IssueFlags({'standing': True, 'preemption': False})
+    for mutate in (lambda: flags.__setitem__('standing', False), lambda: flags.update(x=1),
+                   lambda: flags.pop('standing'), flags.clear):
+        with pytest.raises(TypeError):
+            mutate()
+    restored = pickle.loads(pickle.dumps(flags))
+    assert type(restored) is IssueFlags and restored == flags
+    assert copy.deepcopy(flags) == flags
+    assert isinstance(flags, dict)
+
+
+def test_analysis_round_trips_through_pickle():
+    analysis = run_analysis('The petitioner lacks standing under Article III. Free speech.', 'auto', '')
+    assert pickle.loads(pickle.dumps(analysis)) == analysis
@@ -0,0 +1,70 @@
+import random
+
+from engine import JUSTICE_REGISTRY, SCANNER, VOTE_MODEL, extract_issues, run_analysis
+from annotations import BriefAnnotator
+from scanner import KeywordScanner, ScanResult, _is_word
+
+
+def naive_offsets(scanner, text):
+    """Every keyword's overlapping occurrences by str.find, the behaviour the scanner replaces"""
+    lowered = text.lower()
+    offsets = {}
+    for kw in scanner.keywords:
+        start = lowered.find(kw)
+        while start != -1:
+            if kw not in scanner.whole_words or _is_word(lowered, start, start + len(kw)):
+                offsets.setdefault(kw, []).append(start)
+            start = lowered.find(kw, start + 1)
+    return offsets
+
+
+def test_scan_matches_naive_search_on_engine_tables():
+    rng = random.Random(0)
+    vocabulary = SCANNER.keywords + ['the', 'pre', 'con', 'ally', 'Court', '.', ',', '-', '\n']
+    for _ in range(200):
+        # Keywords glued to fragments and each other, to exercise prefixes and overlaps
+        text = ''.join(rng.choice(vocabulary) + rng.choice(('', ' ', ''))
+                       for _ in range(rng.randint(1, 40)))
+        text = ''.join(char.upper() if rng.random() < 0.2 else char for char in text)
+        assert SCANNER.scan(text).offsets == naive_offsets(SCANNER, text), text
+
+
+def test_overlapping_and_prefix_keywords():
+    scanner = KeywordScanner({'issue': {'a': ['vote', 'voter', 'voters'], 'b': ['ana', 'anana']}})
+    text = 'Voters banana'
+    assert scanner.scan(text).offsets == naive_offsets(scanner, text)
+    assert scanner.scan(text).counts == {'vote': 1, 'voter': 1, 'voters': 1, 'ana': 2, 'anana': 1}
+
+
+def test_whole_word_keywords_skip_matches_inside_words():
+    scanner = KeywordScanner({'issue': {'a': ['text']}, 'justice': {'b': ['text', 'original']}},
+                             whole_words=('justice',))
+    assert scanner.scan('The pretext was obvious; it was originally so.').counts == {}
+    assert scanner.scan('Text, read in context: the original text.').offsets == {'text': [0, 36], 'original': [27]}
+
+
+def test_profile_keywords_ignore_pretext_and_context():
+    scan = SCANNER.scan('The pretext was obvious. Originally, the contextual reading won.')
+    assert 'text' not in scan.counts
+    assert 'original' not in scan.counts
+    assert run_analysis('The pretext was obvious.', 'auto', '')['keywordHits'] == {}
+    assert BriefAnnotator(SCANNER).annotate('The pretext was obvious.')['spans'] == []
+
+
+def test_pretext_does_not_move_votes_or_bench_pressure():
+    plain = 'The agency acted arbitrarily.'
+    pretext = 'The agency acted arbitrarily; the stated reason was pretext, originally.'
+    hits = JUSTICE_REGISTRY.keyword_hits(SCANNER.scan(pretext).counts)
+    assert hits == JUSTICE_REGISTRY.keyword_hits(SCANNER.scan(plain).counts)
+    issues = extract_issues(pretext)
+    assert VOTE_MODEL.predict_one(issues, hits) == VOTE_MODEL.predict_one(extract_issues(plain), {})
+
+
+def test_merged_counts_answer_like_a_text_scan():
+    text = 'Standing and removal. The original text governs; the text controls.'
+    scan = SCANNER.scan(text)
+    merged = ScanResult(SCANNER, counts=dict(scan.counts))
+    for category in SCANNER.tables:
+        assert merged.flags(category) == scan.flags(category)
+        assert merged.keyword_counts(category) == scan.keyword_counts(category)
+    assert scan.keyword_counts('justice') == {'original': 1, 'text': 2}
@@ -0,0 +1,38 @@
+import pytest
+
+import backend
+import serialization
+from schema import AnalysisResponse
+
+pytest.importorskip('msgspec')
+
+BRIEF = ('The petitioner challenges the statute under the First Amendment and the Equal Protection '
+         'Clause. Standing is contested; the respondent says the injury is speculative. ') * 5
+
+
+@pytest.fixture
+def strict(monkeypatch):
+    monkeypatch.setattr(backend, 'SCHEMA_STRICT', True)
+    return backend.app.test_client()
+
+
+def test_analyze_response_matches_schema(strict):
+    response = strict.post('/api/analyze', json={'text': BRIEF, 'title': 'Doe v. Roe', 'sessionId': 'a' * 22})
+    assert response.status_code == 200
+    serialization.validate(response.get_json(), AnalysisResponse)
+
+
+def test_batch_results_match_schema(strict):
+    response = strict.post('/api/analyze/batch', json={'items': [{'text': BRIEF}, {'text': BRIEF + ' Preemption.'}]})
+    lines = [serialization.loads(line) for line in response.data.splitlines()]
+    assert len(lines) == 3 and all('error' not in line for line in lines)
+
+
+def test_schema_mismatch_is_rejected():
+    body = backend.app.test_client().post('/api/analyze', json={'text': BRIEF}).get_json()
+    body['votePrediction']['expectedVotes'] = 'many'
+    with pytest.raises(ValueError):
+        serialization.validate(body, AnalysisResponse)
+    del body['votePrediction']
+    with pytest.raises(ValueError):
+        serialization.validate(body, AnalysisResponse)
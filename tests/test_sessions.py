@@ -0,0 +1,59 @@
+import threading
+
+import pytest
+
+import serialization
+from sessions import MemorySessionBackend, RedisSessionBackend, SessionStore, SessionTooLarge
+
+SESSION_ID = 'a' * 22
+
+
+def redis_backend():
+    fakeredis = pytest.importorskip('fakeredis')
+    return RedisSessionBackend(client=fakeredis.FakeRedis())
+
+
+def test_memory_backend_evicts_to_byte_budget():
+    backend = MemorySessionBackend(max_sessions=100, max_bytes=10_000)
+    for index in range(20):
+        backend.set(f'session{index:016d}', {'blob': 'x' * 1000})
+    stats = backend.stats()
+    assert stats['bytes'] <= 10_000
+    assert stats['sessions'] < 20
+    assert backend.get(f'session{19:016d}') is not None
+    assert backend.get(f'session{0:016d}') is None
+
+
+def test_history_is_trimmed_to_session_cap():
+    store = SessionStore(MemorySessionBackend(), max_session_bytes=4096)
+    store.save_analysis(SESSION_ID, {'issues': {}}, 'key')
+    session = store.get(SESSION_ID)
+    for turn in range(20):
+        session = store.append_history(SESSION_ID, session, {'role': 'user', 'content': f'{turn} ' + 'y' * 500})
+    assert len(serialization.encode(store.get(SESSION_ID))) <= 4096
+    assert store.get(SESSION_ID)['history'][-1]['content'].startswith('19 ')
+
+
+def test_oversized_context_is_rejected():
+    store = SessionStore(MemorySessionBackend(), max_session_bytes=4096)
+    with pytest.raises(SessionTooLarge):
+        store.save_context(SESSION_ID, {'summary': 'z' * 10_000}, [])
+    assert store.get(SESSION_ID) is None
+
+
+@pytest.mark.parametrize('make_backend', [MemorySessionBackend, redis_backend])
+def test_concurrent_appends_are_all_kept(make_backend):
+    store = SessionStore(make_backend(), max_history=1000)
+    store.save_analysis(SESSION_ID, {'issues': {}}, 'key')
+    session = store.get(SESSION_ID)
+
+    def send(worker):
+        for turn in range(25):
+            store.append_history(SESSION_ID, session, {'role': 'user', 'content': f'{worker}:{turn}'})
+
+    threads = [threading.Thread(target=send, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(store.get(SESSION_ID)['history']) == 100
@@ -0,0 +1,65 @@
+import gzip
+import io
+import json
+
+import pytest
+
+pytest.importorskip('PyPDF2')
+
+import backend
+import pdf_extract
+from benchmark import make_pdf
+
+SPOOL_BYTES = 32 * 1024
+
+
+@pytest.fixture
+def upload(monkeypatch, tmp_path):
+    """Post a PDF with a small spool threshold; records what the parser was given"""
+    monkeypatch.setattr(backend, 'UPLOAD_SPOOL_BYTES', SPOOL_BYTES)
+    monkeypatch.setattr(backend, 'UPLOAD_FOLDER', str(tmp_path))
+    payloads = []
+    read_source = pdf_extract.read_source
+    monkeypatch.setattr(pdf_extract, 'read_source', lambda source: payloads.append(read_source(source)) or payloads[-1])
+    client = backend.app.test_client()
+
+    def post(pdf: bytes, query: str = '', headers=None):
+        with client.post('/api/upload' + query, data={'file': (io.BytesIO(pdf), 'brief.pdf')},
+                         headers=headers) as response:
+            return response, response.get_data(), payloads[-1]
+    return post
+
+
+@pytest.mark.parametrize('pages, spilled', [(3, False), (20, True)])
+def test_upload_spools_to_disk_only_past_the_threshold(upload, tmp_path, pages, spilled):
+    pdf = make_pdf(pages)
+    assert (len(pdf) > SPOOL_BYTES) == spilled
+    text = pdf_extract.extract_pdf_text(pdf)
+
+    response, body, payload = upload(pdf)
+    assert response.status_code == 200
+    assert json.loads(body)['text'] == text
+    # Small uploads are parsed from memory; large ones by the spool file's path
+    assert isinstance(payload, str) == spilled
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize('pages', [3, 20])
+def test_streamed_upload_plain_and_gzip(upload, tmp_path, pages):
+    pdf = make_pdf(pages)
+    response, plain, _ = upload(pdf, '?stream=1')
+    assert response.mimetype == 'application/x-ndjson'
+    assert 'Content-Encoding' not in response.headers
+    lines = [json.loads(line) for line in plain.splitlines()]
+    assert lines[0]['pages'] == pages
+    pages_out = [line for line in lines if 'page' in line]
+    assert [line['page'] for line in pages_out] == list(range(1, pages + 1))
+    text = '\n'.join(line['text'] for line in pages_out)
+    assert text.strip() == pdf_extract.extract_pdf_text(pdf)
+    assert lines[-1]['done'] and lines[-1]['length'] == len(text)
+
+    response, compressed, _ = upload(pdf, '?stream=1', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(compressed) == plain
+    # The stream closes (and so deletes) a spilled upload once it ends
+    assert list(tmp_path.iterdir()) == []
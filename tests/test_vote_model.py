@@ -0,0 +1,51 @@
+from itertools import combinations
+
+import pytest
+
+import vote_model
+from engine import ISSUE_KEYWORDS, VOTE_MODEL
+from justices import JUSTICES
+
+
+def predict(*issues, **hits):
+    return VOTE_MODEL.predict_one({issue: True for issue in issues}, hits)
+
+
+def test_lean_table_covers_known_justices_and_issues():
+    assert set(vote_model.VOTE_LEAN) == set(JUSTICES)
+    for leans in vote_model.VOTE_LEAN.values():
+        assert set(leans) <= set(ISSUE_KEYWORDS)
+
+
+@pytest.mark.parametrize('issues, split, outcome', [
+    ((), '6-3', 'petitioner'),
+    (('first_amendment',), '8-1', 'petitioner'),
+    (('separation_of_powers',), '6-3', 'petitioner'),
+    (('voting_rights',), '5-4', 'petitioner'),
+    (('voting_rights', 'standing'), '5-4', 'respondent'),
+])
+def test_known_outcomes(issues, split, outcome):
+    prediction = predict(*issues)
+    assert (prediction['split'], prediction['outcome']) == (split, outcome)
+
+
+def test_separation_of_powers_splits_on_lean_sign():
+    justices = predict('separation_of_powers')['justices']
+    against = {justice_id for justice_id, p in justices.items() if p < 0.5}
+    assert against == {'sotomayor', 'kagan', 'jackson'}
+
+
+def test_split_and_outcome_agree_with_expected_votes():
+    issue_sets = [combo for size in range(3) for combo in combinations(ISSUE_KEYWORDS, size)]
+    for prediction in VOTE_MODEL.predict([({issue: True for issue in combo}, {}) for combo in issue_sets]):
+        votes = prediction['votesForPetitioner']
+        assert abs(votes - prediction['expectedVotes']) <= 0.5
+        assert prediction['split'] == vote_model.SPLITS[votes]
+        assert (prediction['outcome'] == 'petitioner') == (votes >= vote_model.MAJORITY)
+
+
+def test_profile_keywords_lean_toward_petitioner():
+    keyword = next(iter(JUSTICES['gorsuch']['keywords'])).lower()
+    before = predict('due_process')['justices']['gorsuch']
+    after = predict('due_process', **{keyword: 3})['justices']['gorsuch']
+    assert after > before
@@ -0,0 +1,152 @@
+"""
+SCOTUS Strategic Engine - Vote Model
+Predicted vote splits from per-Justice vote leans over brief feature matrices
+
+Each brief is a feature vector: one 0/1 column per issue plus log1p(hits)
+for every Justice profile keyword. Each Justice is a weight vector over
+the same columns (VOTE_LEAN per issue, KEYWORD_LEAN per profile keyword),
+so one matrix product gives the 9 x N log-odds shift of every Justice for
+every brief. The shift is added to BASE_LOGIT and mapped to a probability
+of voting for the petitioner through a logistic link.
+
+The leans are separate from justices.ISSUE_AFFINITY on purpose: affinity
+says how hard a Justice will press an issue at argument, not which way
+they will vote on it.
+"""
+
+from math import exp, log1p
+
+try:
+    import numpy as np
+    NUMPY_SUPPORT = True
+except ImportError:
+    np = None
+    NUMPY_SUPPORT = False
+
+from justices import JUSTICES, KEYWORD_WEIGHT
+
+# Log-odds of a Justice siding with the petitioner before any issue is weighed:
+# petitioners win roughly 70% of argued cases (log(0.7 / 0.3))
+BASE_LOGIT = 0.85
+
+# Log-odds shift toward the petitioner when a brief presses an issue (a
+# petitioner challenging a map, an agency's authority, a federal statute's
+# reach, ...). Positive leans favour the petitioner, negative the respondent.
+# Hand-set from each Justice's voting record by issue area; not fitted.
+VOTE_LEAN = {
+    'roberts': {'voting_rights': -1.0, 'first_amendment': 1.0, 'separation_of_powers': 1.0,
+                'standing': -1.5, 'commerce_clause': 0.5, 'preemption': 0.5},
+    'thomas': {'voting_rights': -2.0, 'equal_protection': -0.5, 'first_amendment': 1.0,
+               'separation_of_powers': 2.0, 'standing': -1.0, 'due_process': -1.0,
+               'commerce_clause': 2.0, 'preemption': -1.0},
+    'alito': {'voting_rights': -2.0, 'equal_protection': -1.0, 'first_amendment': 1.5,
+              'separation_of_powers': 1.0, 'standing': -0.5, 'due_process': -1.0,
+              'commerce_clause': 1.0, 'preemption': 0.5},
+    'sotomayor': {'voting_rights': 2.0, 'equal_protection': 1.5, 'first_amendment': 0.5,
+                  'separation_of_powers': -1.5, 'standing': 0.5, 'due_process': 1.5,
+                  'commerce_clause': -1.0, 'preemption': -0.5},
+    'kagan': {'voting_rights': 2.0, 'equal_protection': 1.0, 'first_amendment': 0.5,
+              'separation_of_powers': -1.5, 'due_process': 0.5, 'commerce_clause': -1.0,
+              'preemption': 0.5},
+    'gorsuch': {'voting_rights': -1.0, 'first_amendment': 1.5, 'separation_of_powers': 2.0,
+                'standing': -1.0, 'due_process': 1.0, 'commerce_clause': 1.0, 'preemption': -0.5},
+    'kavanaugh': {'voting_rights': -0.5, 'first_amendment': 1.0, 'separation_of_powers': 1.0,
+                  'standing': -0.5, 'preemption': 1.0},
+    'barrett': {'voting_rights': -1.0, 'first_amendment': 1.0, 'separation_of_powers': 0.5,
+                'standing': -1.0, 'commerce_clause': 0.5},
+    'jackson': {'voting_rights': 2.0, 'equal_protection': 1.5, 'separation_of_powers': -1.5,
+                'standing': 0.5, 'due_process': 1.5, 'commerce_clause': -1.0, 'preemption': -0.5}
+}
+
+# Log-odds shift per log1p(hits) of a Justice's profile keyword: a brief argued
+# on a Justice's own terms is slightly more persuasive to them
+KEYWORD_LEAN = KEYWORD_WEIGHT
+
+MAJORITY = len(JUSTICES) // 2 + 1
+
+# Split label for each number of votes for the petitioner, built once and shared
+SPLITS = tuple(f'{max(votes, len(JUSTICES) - votes)}-{min(votes, len(JUSTICES) - votes)}'
+               for votes in range(len(JUSTICES) + 1))
+
+
+class VoteModel:
+    """Justice x feature weight matrix, built once, applied to any number of briefs"""
+
+    def __init__(self, issue_order):
+        self.justice_ids = tuple(JUSTICES)
+        self.issue_order = tuple(issue_order)
+        self.keywords = tuple(sorted({kw.lower() for justice in JUSTICES.values()
+                                      for kw in justice['keywords']}))
+        self.columns = self.issue_order + self.keywords
+        self.keyword_columns = {kw: len(self.issue_order) + i for i, kw in enumerate(self.keywords)}
+
+        weights = []
+        for justice_id in self.justice_ids:
+            lean = VOTE_LEAN.get(justice_id, {})
+            profile = {kw.lower() for kw in JUSTICES[justice_id]['keywords']}
+            weights.append([lean.get(issue, 0.0) for issue in self.issue_order] +
+                           [KEYWORD_LEAN if kw in profile else 0.0 for kw in self.keywords])
+        self.weights = np.array(weights) if NUMPY_SUPPORT else weights
+
+    def feature_row(self, issues: dict, keyword_hits: dict) -> list:
+        """Feature vector for one brief from its issue flags and profile keyword hits"""
+        row = [1.0 if issues.get(issue) else 0.0 for issue in self.issue_order]
+        row.extend([0.0] * len(self.keywords))
+        for keyword, count in keyword_hits.items():
+            column = self.keyword_columns.get(keyword)
+            if column is not None and count > 0:
+                row[column] = log1p(count)
+        return row
+
+    def lean(self, briefs: list):
+        """
+        Log-odds shift of every Justice toward the petitioner for every brief:
+        a 9 x N matrix (nested lists without NumPy). `briefs` is a list of
+        (issues, keyword_hits).
+        """
+        rows = [self.feature_row(issues, hits) for issues, hits in briefs]
+        if NUMPY_SUPPORT:
+            features = np.array(rows).reshape(len(rows), len(self.columns))
+            return self.weights @ features.T
+        return [[sum(w * x for w, x in zip(weights, row)) for row in rows]
+                for weights in self.weights]
+
+    def logits(self, briefs: list):
+        """Log-odds of each Justice voting for the petitioner, 9 x N"""
+        lean = self.lean(briefs)
+        if NUMPY_SUPPORT:
+            return BASE_LOGIT + lean
+        return [[BASE_LOGIT + shift for shift in row] for row in lean]
+
+    def probabilities(self, briefs: list):
+        """Probability of each Justice voting for the petitioner, 9 x N"""
+        logits = self.logits(briefs)
+        if NUMPY_SUPPORT:
+            return 1.0 / (1.0 + np.exp(-logits))
+        return [[1.0 / (1.0 + exp(-logit)) for logit in row] for row in logits]
+
+    def predict(self, briefs: list) -> list:
+        """Predicted vote for each brief, scoring the whole batch in one pass"""
+        probs = self.probabilities(briefs)
+        if NUMPY_SUPPORT:
+            probs = probs.T.tolist()
+        else:
+            probs = [list(column) for column in zip(*probs)] if probs else []
+
+        predictions = []
+        for column in probs:
+            expected = sum(column)
+            # The split is the nearest whole vote count to the expected votes, so
+            # split, outcome and expectedVotes never disagree
+            votes_for = min(len(column), int(expected + 0.5))
+            predictions.append({
+                'outcome': 'petitioner' if votes_for >= MAJORITY else 'respondent',
+                'split': SPLITS[votes_for],
+                'votesForPetitioner': votes_for,
+                'expectedVotes': round(expected, 2),
+                'justices': {justice_id: round(p, 3) for justice_id, p in zip(self.justice_ids, column)}
+            })
+        return predictions
+
+    def predict_one(self, issues: dict, keyword_hits: dict) -> dict:
+        return self.predict([(issues, keyword_hits)])[0]